@@ -0,0 +1,84 @@
+"""Click engine behind Ultra Autoclicker Pro, importable without Tkinter"""
+from .backends import (
+    BACKENDS, InputBackend, NullBackend, PynputBackend, RecordingBackend,
+    UInputBackend, XTestBackend, get_key_from_string, make_backend,
+)
+from .engine import ClickEngine, RunPlan
+from .history import HistoryStore
+from .jitter import JitterSchedule
+from .jobs import Job, JobScheduler, load_jobs
+from .keyseq import KeySequence, KeyTyper
+from .macro import EventLog, MacroPlayer, MacroRecorder
+from .macrofile import MacroFile, MacroWriter, convert_macro, load_macro, save_macro
+from .metrics import Histogram, MetricsServer, RunMetrics
+from .profiler import StackSampler
+from .scheduler import BurstController, DeadlineScheduler
+from .settings import DEFAULT_SETTINGS, ProfileStore, load_settings, save_settings
+from .targets import TargetCursor, TargetSequence, parse_targets
+from .watch import ChangeTrigger, ColorTrigger, ScreenWatcher, SyntheticSource, XShmSource, make_source
+
+def __getattr__(name):
+    # asyncio, multiprocessing and socket take longer to import than the rest
+    # of the package, so the front ends built on them are only loaded when asked for
+    if name == "AsyncClickEngine":
+        from .aio import AsyncClickEngine
+        return AsyncClickEngine
+    if name in ("ControlClient", "ControlServer"):
+        from . import control
+        return getattr(control, name)
+    if name == "ProcessClickEngine":
+        from .isolated import ProcessClickEngine
+        return ProcessClickEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = [
+    "AsyncClickEngine",
+    "BACKENDS",
+    "BurstController",
+    "ChangeTrigger",
+    "ClickEngine",
+    "ColorTrigger",
+    "ControlClient",
+    "ControlServer",
+    "DEFAULT_SETTINGS",
+    "DeadlineScheduler",
+    "EventLog",
+    "Histogram",
+    "HistoryStore",
+    "InputBackend",
+    "JitterSchedule",
+    "Job",
+    "JobScheduler",
+    "KeySequence",
+    "KeyTyper",
+    "MacroFile",
+    "MacroPlayer",
+    "MacroRecorder",
+    "MacroWriter",
+    "MetricsServer",
+    "NullBackend",
+    "ProcessClickEngine",
+    "ProfileStore",
+    "PynputBackend",
+    "RecordingBackend",
+    "RunMetrics",
+    "RunPlan",
+    "ScreenWatcher",
+    "StackSampler",
+    "SyntheticSource",
+    "TargetCursor",
+    "TargetSequence",
+    "UInputBackend",
+    "XShmSource",
+    "XTestBackend",
+    "convert_macro",
+    "get_key_from_string",
+    "load_jobs",
+    "load_macro",
+    "load_settings",
+    "make_backend",
+    "make_source",
+    "parse_targets",
+    "save_macro",
+    "save_settings",
+]
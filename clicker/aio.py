@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .engine import ClickEngine
+
+class AsyncClickEngine:
+    """asyncio front end for ClickEngine
+
+    Pacing and input injection stay on the engine's worker thread. Blocking
+    control calls (connecting a backend, joining the previous run) go through
+    a dedicated single-thread executor, and the worker reports the end of a
+    run back to the event loop, so the loop never waits on input APIs.
+
+        async with AsyncClickEngine() as clicker:
+            stats = await clicker.run(plan, duration=5)
+
+    Cancelling a task awaiting run() or wait() stops the run; the worker
+    notices within one interval and the cancellation propagates once it has.
+    """
+    def __init__(self, backend="auto", executor=None):
+        self.engine = ClickEngine(backend)
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="clicker")
+        self.owns_executor = executor is None
+        self.done = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    @property
+    def running(self):
+        return self.engine.running
+
+    async def start(self, plan):
+        """Start a run without waiting for it to finish"""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def finished(engine):
+            try:
+                loop.call_soon_threadsafe(resolve, done)
+            except RuntimeError:
+                # The loop was closed before the worker finished
+                pass
+
+        await loop.run_in_executor(self.executor, self.engine.start, plan, finished)
+        self.done = done
+
+    def stop(self):
+        """Ask the current run to stop; await wait() to know when it has"""
+        self.engine.stop()
+
+    def apply(self, plan):
+        """Swap the running plan between actions (see ClickEngine.apply)"""
+        self.engine.apply(plan)
+
+    def stats(self):
+        return dict(self.engine.stats(), running=self.engine.running)
+
+    async def wait(self, duration=None):
+        """Wait for the run to end, stopping it after duration seconds if given
+
+        Returns the final stats and re-raises an error from the worker.
+        """
+        done = self.done
+        if done is None:
+            return self.engine.stats()
+        try:
+            if duration is None:
+                await asyncio.shield(done)
+            else:
+                try:
+                    await asyncio.wait_for(asyncio.shield(done), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.engine.stop()
+            if not done.done():
+                await asyncio.shield(done)
+        if self.engine.error is not None:
+            raise self.engine.error
+        return self.engine.stats()
+
+    async def run(self, plan, duration=None):
+        """Run plan for duration seconds (or until cancelled) and return the stats"""
+        await self.start(plan)
+        return await self.wait(duration)
+
+    async def progress(self, interval=0.1):
+        """Async iterator of stats snapshots every interval seconds
+
+        Ends after one last snapshot once the run has finished.
+        """
+        done = self.done
+        while done is not None and not done.done():
+            yield self.stats()
+            try:
+                await asyncio.wait_for(asyncio.shield(done), interval)
+            except asyncio.TimeoutError:
+                pass
+        yield self.stats()
+
+    async def aclose(self):
+        """Stop any run and release the executor if this engine created it"""
+        if self.done is not None:
+            self.engine.stop()
+            await asyncio.shield(self.done)
+        if self.owns_executor:
+            self.executor.shutdown(wait=False)
+
+def resolve(future):
+    if not future.done():
+        future.set_result(None)
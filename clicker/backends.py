@@ -0,0 +1,588 @@
+import atexit
+import os
+import sys
+import time
+from array import array
+
+# python-xlib and python-evdev take tens of milliseconds to import, so they
+# are only loaded when a backend that needs them is created
+X = XK = xdisplay = xtest = None
+evdev = None
+
+# Bit of each modifier in the masks type_keys() takes, in the order they are pressed
+MODIFIER_BITS = {"ctrl": 1, "shift": 2, "alt": 4, "cmd": 8}
+SHIFT = MODIFIER_BITS["shift"]
+
+def import_xlib():
+    """Load python-xlib into this module; returns False if it is not installed"""
+    global X, XK, xdisplay, xtest
+    if xdisplay is None:
+        try:
+            from Xlib import X, XK
+            from Xlib import display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError:
+            return False
+    return True
+
+def import_evdev():
+    """Load python-evdev into this module; returns False if it is not installed"""
+    global evdev
+    if evdev is None:
+        try:
+            import evdev
+        except ImportError:
+            return False
+    return True
+
+def get_key_from_string(key_str):
+    """Convert string to pynput Key (any member name, e.g. "f6") or KeyCode"""
+    from pynput.keyboard import Key, KeyCode
+
+    name = key_str.lower()
+    if name in Key.__members__:
+        return Key[name]
+    return KeyCode.from_char(name)
+
+def key_from_name(name):
+    """pynput key for a recorded key name: a Key member, a character or vk:N"""
+    from pynput.keyboard import Key, KeyCode
+
+    if name.startswith("vk:"):
+        return KeyCode.from_vk(int(name[3:]))
+    if name in Key.__members__:
+        return Key[name]
+    return KeyCode.from_char(name)
+
+class InputBackend:
+    """Interface the engine injects input through
+
+    open() configures the backend for a RunPlan (and is called again when a
+    new plan is applied), fire() injects count actions at the current pointer
+    position, close() releases any OS resources. Backends are reusable across
+    runs. Positioning is left to the engine, which calls move() only when the
+    pointer actually has to go somewhere.
+
+    move(), button(), scroll() and key() inject single raw events for macro
+    replay; backends that cannot do so leave them unimplemented.
+
+    Typing goes through type_keys(), which taps (code, modifier mask) pairs
+    that key_table() resolved from key names and characters beforehand.
+    Backends that can type implement resolve_key() and key_event().
+    """
+    name = None
+    held_modifiers = 0
+
+    def open(self, plan):
+        raise NotImplementedError
+
+    def fire(self, count=1):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def move(self, x, y):
+        raise NotImplementedError(f"The {self.name} backend cannot move the pointer")
+
+    def button(self, name, down):
+        raise NotImplementedError(f"The {self.name} backend cannot replay mouse buttons")
+
+    def scroll(self, dx, dy):
+        raise NotImplementedError(f"The {self.name} backend cannot scroll")
+
+    def key(self, name, down):
+        raise NotImplementedError(f"The {self.name} backend cannot replay keys")
+
+    def resolve_key(self, name):
+        """(code, modifier mask) that types a key name or a single character"""
+        raise NotImplementedError(f"The {self.name} backend cannot type text")
+
+    def key_event(self, code, down):
+        raise NotImplementedError(f"The {self.name} backend cannot type text")
+
+    def flush_keys(self):
+        pass
+
+    def key_table(self, names):
+        """Codes and implied modifier masks for names, each resolved once per backend"""
+        cache = self.key_cache
+        for name in names:
+            if name not in cache:
+                cache[name] = self.resolve_key(name)
+        return [cache[name][0] for name in names], [cache[name][1] for name in names]
+
+    def set_modifiers(self, mask):
+        held = self.held_modifiers
+        for name, bit in MODIFIER_BITS.items():
+            if (held ^ mask) & bit:
+                self.key_event(self.key_table((name,))[0][0], bool(mask & bit))
+        self.held_modifiers = mask
+
+    def type_keys(self, taps):
+        """Tap each (code, modifier mask); modifiers change only between taps that differ"""
+        event = self.key_event
+        for code, mask in taps:
+            if mask != self.held_modifiers:
+                self.set_modifiers(mask)
+            event(code, True)
+            event(code, False)
+        self.flush_keys()
+
+    def release_modifiers(self):
+        if self.held_modifiers:
+            self.set_modifiers(0)
+            self.flush_keys()
+
+class PynputBackend(InputBackend):
+    """Fires actions one pynput call at a time (portable fallback)"""
+    name = "pynput"
+
+    def __init__(self):
+        self.controller = None
+        self.mouse_controller = None
+        self.keyboard_controller = None
+        self.button_obj = None
+        self.key_obj = None
+        self.key_cache = {}
+        self.key_objects = []
+
+    def open(self, plan):
+        # pynput needs a display at import time, so only load it when used
+        from pynput import mouse, keyboard
+
+        self.action = plan.action
+        if plan.action == "mouse":
+            button_map = {
+                "left": mouse.Button.left,
+                "right": mouse.Button.right,
+                "middle": mouse.Button.middle
+            }
+            self.controller = mouse.Controller()
+            self.button_obj = button_map[plan.button]
+        else:
+            self.controller = keyboard.Controller()
+            self.key_obj = get_key_from_string(plan.key)
+
+    def fire(self, count=1):
+        controller = self.controller
+        if self.action == "mouse":
+            button = self.button_obj
+            for _ in range(count):
+                controller.click(button)
+        else:
+            key = self.key_obj
+            for _ in range(count):
+                controller.press(key)
+                controller.release(key)
+
+    def raw_mouse(self):
+        if self.mouse_controller is None:
+            from pynput import mouse
+            self.mouse_controller = mouse.Controller()
+        return self.mouse_controller
+
+    def raw_keyboard(self):
+        if self.keyboard_controller is None:
+            from pynput import keyboard
+            self.keyboard_controller = keyboard.Controller()
+        return self.keyboard_controller
+
+    def move(self, x, y):
+        self.raw_mouse().position = (x, y)
+
+    def button(self, name, down):
+        from pynput.mouse import Button
+
+        controller = self.raw_mouse()
+        if down:
+            controller.press(Button[name])
+        else:
+            controller.release(Button[name])
+
+    def scroll(self, dx, dy):
+        self.raw_mouse().scroll(dx, dy)
+
+    def key(self, name, down):
+        controller = self.raw_keyboard()
+        if down:
+            controller.press(key_from_name(name))
+        else:
+            controller.release(key_from_name(name))
+
+    def resolve_key(self, name):
+        # pynput picks shift levels and maps characters missing from the layout itself
+        from pynput.keyboard import Key, KeyCode
+
+        if len(name) == 1:
+            key = KeyCode.from_char(name)
+        elif name in Key.__members__:
+            key = Key[name]
+        else:
+            raise ValueError(f"Unknown key: {name}")
+        self.key_objects.append(key)
+        return len(self.key_objects) - 1, 0
+
+    def key_event(self, code, down):
+        if down:
+            self.raw_keyboard().press(self.key_objects[code])
+        else:
+            self.raw_keyboard().release(self.key_objects[code])
+
+class XTestBackend(InputBackend):
+    """Fires bursts through the X11 XTest extension with a single flush per burst"""
+    name = "xtest"
+    BUTTON_CODES = {"left": 1, "middle": 2, "right": 3, "x1": 8, "x2": 9}
+    KEYSYM_NAMES = {
+        "enter": "Return", "space": "space", "tab": "Tab",
+        "backspace": "BackSpace", "delete": "Delete",
+        "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+        "esc": "Escape", "home": "Home", "end": "End", "insert": "Insert",
+        "page_up": "Prior", "page_down": "Next", "caps_lock": "Caps_Lock",
+        "shift": "Shift_L", "shift_l": "Shift_L", "shift_r": "Shift_R",
+        "ctrl": "Control_L", "ctrl_l": "Control_L", "ctrl_r": "Control_R",
+        "alt": "Alt_L", "alt_l": "Alt_L", "alt_r": "Alt_R", "alt_gr": "ISO_Level3_Shift",
+        "cmd": "Super_L", "cmd_l": "Super_L", "cmd_r": "Super_R", "menu": "Menu",
+        "num_lock": "Num_Lock", "print_screen": "Print", "scroll_lock": "Scroll_Lock",
+        "pause": "Pause",
+    }
+
+    def __init__(self):
+        if not import_xlib():
+            raise RuntimeError("The xtest backend requires python-xlib")
+        try:
+            self.display = xdisplay.Display()
+        except Exception as e:
+            raise RuntimeError(f"Cannot connect to the X server: {e}")
+        self.key_cache = {}
+        self.spare_codes = None
+        self.bound = []
+
+    def open(self, plan):
+        if plan.action == "type":
+            return  # Typing resolves its own keys through key_table()
+        if plan.action == "mouse":
+            self.press, self.release = X.ButtonPress, X.ButtonRelease
+            self.code = self.BUTTON_CODES[plan.button]
+        else:
+            self.press, self.release = X.KeyPress, X.KeyRelease
+            self.code = self.keycode_for(plan.key.lower())
+
+    def fire(self, count=1):
+        display, code = self.display, self.code
+        for _ in range(count):
+            xtest.fake_input(display, self.press, code)
+            xtest.fake_input(display, self.release, code)
+        display.flush()
+
+    def close(self):
+        self.display.flush()
+
+    def keysym_for(self, name):
+        if len(name) == 1:
+            codepoint = ord(name)
+            # Latin-1 keysyms equal the code point; the rest live in the Unicode range
+            return codepoint if codepoint < 0x100 else 0x01000000 | codepoint
+        return XK.string_to_keysym(self.KEYSYM_NAMES.get(name, name[:1].upper() + name[1:]))
+
+    def resolve_key(self, name):
+        keysym = self.keysym_for(name)
+        if not keysym:
+            raise ValueError(f"No X11 keysym for key: {name}")
+        code = self.display.keysym_to_keycode(keysym)
+        if code:
+            # The first two columns of a keycode's mapping are its plain and shifted symbols
+            for level, mask in ((0, 0), (1, SHIFT)):
+                if self.display.keycode_to_keysym(code, level) == keysym:
+                    return code, mask
+        return self.bind_spare(name, keysym), 0
+
+    def bind_spare(self, name, keysym):
+        """Map a keysym the layout lacks onto an unused keycode
+
+        Bindings stay, cached, for the life of the backend and are undone
+        when the process exits.
+        """
+        display = self.display
+        if self.spare_codes is None:
+            first = display.display.info.min_keycode
+            count = display.display.info.max_keycode - first + 1
+            mapping = display.get_keyboard_mapping(first, count)
+            self.spare_codes = [first + i for i, keysyms in enumerate(mapping) if not any(keysyms)]
+            atexit.register(self.unbind_spares)
+        if not self.spare_codes:
+            raise ValueError(f"No unused X11 keycode left to map {name!r} onto")
+        code = self.spare_codes.pop()
+        display.change_keyboard_mapping(code, [(keysym, keysym)])
+        display.sync()
+        self.bound.append(code)
+        return code
+
+    def unbind_spares(self):
+        try:
+            for code in self.bound:
+                self.display.change_keyboard_mapping(code, [(X.NoSymbol, X.NoSymbol)])
+            self.display.sync()
+        except Exception:
+            pass  # The X connection is already gone
+        self.bound.clear()
+
+    def key_event(self, code, down):
+        xtest.fake_input(self.display, X.KeyPress if down else X.KeyRelease, code)
+
+    def flush_keys(self):
+        self.display.flush()
+
+    def keycode_for(self, name):
+        """X keycode for a key name, a single character or vk:KEYSYM"""
+        keysym = int(name[3:]) if name.startswith("vk:") else self.keysym_for(name)
+        code = self.display.keysym_to_keycode(keysym) if keysym else 0
+        if not code:
+            raise ValueError(f"No X11 keycode for key: {name}")
+        return code
+
+    def move(self, x, y):
+        xtest.fake_input(self.display, X.MotionNotify, x=int(x), y=int(y))
+        self.display.flush()
+
+    def button(self, name, down):
+        xtest.fake_input(self.display, X.ButtonPress if down else X.ButtonRelease,
+                         self.BUTTON_CODES[name])
+        self.display.flush()
+
+    def scroll(self, dx, dy):
+        # X11 reports wheel steps as buttons 4/5 (vertical) and 6/7 (horizontal)
+        display = self.display
+        for code, steps in ((4 if dy > 0 else 5, abs(dy)), (7 if dx > 0 else 6, abs(dx))):
+            for _ in range(int(steps)):
+                xtest.fake_input(display, X.ButtonPress, code)
+                xtest.fake_input(display, X.ButtonRelease, code)
+        display.flush()
+
+    def key(self, name, down):
+        xtest.fake_input(self.display, X.KeyPress if down else X.KeyRelease, self.keycode_for(name))
+        self.display.flush()
+
+class UInputBackend(InputBackend):
+    """Injects through a virtual Linux uinput device (works without X11)
+
+    Needs python-evdev and write access to /dev/uinput. The device is
+    relative-only, so fixed and multi-target clicking are not supported. It stays
+    registered for the lifetime of the backend so runs start instantly.
+    """
+    name = "uinput"
+    BUTTON_CODES = {"left": "BTN_LEFT", "middle": "BTN_MIDDLE", "right": "BTN_RIGHT"}
+    KEY_NAMES = {
+        "enter": "KEY_ENTER", "space": "KEY_SPACE", "tab": "KEY_TAB",
+        "backspace": "KEY_BACKSPACE", "delete": "KEY_DELETE",
+        "up": "KEY_UP", "down": "KEY_DOWN", "left": "KEY_LEFT", "right": "KEY_RIGHT",
+        "page_up": "KEY_PAGEUP", "page_down": "KEY_PAGEDOWN", "caps_lock": "KEY_CAPSLOCK",
+        "num_lock": "KEY_NUMLOCK", "scroll_lock": "KEY_SCROLLLOCK", "print_screen": "KEY_SYSRQ",
+        "ctrl": "KEY_LEFTCTRL", "shift": "KEY_LEFTSHIFT", "alt": "KEY_LEFTALT", "cmd": "KEY_LEFTMETA",
+    }
+    # Key codes are positions, so characters are typed as on a US layout
+    CHAR_KEYS = {
+        " ": "KEY_SPACE", "-": "KEY_MINUS", "=": "KEY_EQUAL", "[": "KEY_LEFTBRACE",
+        "]": "KEY_RIGHTBRACE", "\\": "KEY_BACKSLASH", ";": "KEY_SEMICOLON",
+        "'": "KEY_APOSTROPHE", "`": "KEY_GRAVE", ",": "KEY_COMMA", ".": "KEY_DOT", "/": "KEY_SLASH",
+    }
+    SHIFTED_CHARS = dict(zip('~!@#$%^&*()_+{}|:"<>?', "`1234567890-=[]\\;',./"))
+
+    def __init__(self):
+        if not import_evdev():
+            raise RuntimeError("The uinput backend requires python-evdev")
+        ecodes = evdev.ecodes
+        buttons = [getattr(ecodes, name) for name in self.BUTTON_CODES.values()]
+        keys = [code for name, code in ecodes.ecodes.items()
+                if name.startswith("KEY_") and isinstance(code, int) and code < ecodes.BTN_MISC]
+        try:
+            self.device = evdev.UInput(
+                {ecodes.EV_KEY: sorted(set(buttons + keys)),
+                 ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y]},
+                name="ultra-autoclicker"
+            )
+        except evdev.UInputError as e:
+            raise RuntimeError(f"Cannot create uinput device: {e}")
+        self.key_cache = {}
+
+    def open(self, plan):
+        if plan.action == "type":
+            return  # Typing resolves its own keys through key_table()
+        ecodes = evdev.ecodes
+        if plan.action == "mouse" and plan.location != "current":
+            raise ValueError("The uinput backend can only click at the current position")
+        if plan.action == "mouse":
+            name = self.BUTTON_CODES[plan.button]
+        else:
+            key = plan.key.lower()
+            name = self.KEY_NAMES.get(key, f"KEY_{key.upper()}")
+        code = getattr(ecodes, name, None)
+        if code is None:
+            raise ValueError(f"No uinput code for key: {plan.key}")
+        self.code = code
+
+    def fire(self, count=1):
+        device, code = self.device, self.code
+        ev_key = evdev.ecodes.EV_KEY
+        for _ in range(count):
+            device.write(ev_key, code, 1)
+            device.syn()
+            device.write(ev_key, code, 0)
+            device.syn()
+
+    def resolve_key(self, name):
+        mask = 0
+        if len(name) == 1:
+            if name in self.SHIFTED_CHARS:
+                name, mask = self.SHIFTED_CHARS[name], SHIFT
+            elif name.isascii() and name.isupper():
+                name, mask = name.lower(), SHIFT
+            if name in self.CHAR_KEYS:
+                code_name = self.CHAR_KEYS[name]
+            elif name.isascii() and name.isalnum():
+                code_name = f"KEY_{name.upper()}"
+            else:
+                raise ValueError(f"The uinput backend types with a US layout and has no key for {name!r}")
+        else:
+            code_name = self.KEY_NAMES.get(name, f"KEY_{name.upper()}")
+        code = getattr(evdev.ecodes, code_name, None)
+        if code is None:
+            raise ValueError(f"No uinput code for key: {name}")
+        return code, mask
+
+    def key_event(self, code, down):
+        self.device.write(evdev.ecodes.EV_KEY, code, 1 if down else 0)
+        self.device.syn()
+
+class NullBackend(InputBackend):
+    """Discards every action; measures the engine with zero injection cost"""
+    name = "null"
+
+    def __init__(self):
+        self.fired = 0
+        self.key_cache = {}
+
+    def open(self, plan):
+        pass
+
+    def fire(self, count=1):
+        self.fired += count
+
+    def move(self, x, y):
+        self.fired += 1
+
+    def button(self, name, down):
+        self.fired += 1
+
+    def scroll(self, dx, dy):
+        self.fired += 1
+
+    def key(self, name, down):
+        self.fired += 1
+
+    def resolve_key(self, name):
+        return 0, 0
+
+    def type_keys(self, taps):
+        self.fired += len(taps)
+
+class RecordingBackend(InputBackend):
+    """Logs timestamped actions into a preallocated ring buffer
+
+    Timestamps are perf_counter() seconds taken once per fire() call, so every
+    action of a burst shares its burst's timestamp. Once capacity is reached
+    the oldest entries are overwritten; total keeps counting.
+    """
+    name = "recording"
+    MOUSE = 0
+    KEYBOARD = 1
+    MOVE = 2
+    BUTTON = 3
+    SCROLL = 4
+    KEY = 5
+
+    def __init__(self, capacity=1 << 20):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.kinds = array("B", bytes(capacity))
+        self.total = 0
+        self.kind = self.MOUSE
+        self.key_cache = {}
+
+    def open(self, plan):
+        self.kind = self.MOUSE if plan.action == "mouse" else self.KEYBOARD
+
+    def reset(self):
+        self.total = 0
+
+    def fire(self, count=1, kind=None):
+        now = time.perf_counter()
+        times, kinds, capacity = self.times, self.kinds, self.capacity
+        kind = self.kind if kind is None else kind
+        index = self.total % capacity
+        for _ in range(count):
+            times[index] = now
+            kinds[index] = kind
+            index += 1
+            if index == capacity:
+                index = 0
+        self.total += count
+
+    def move(self, x, y):
+        self.fire(1, self.MOVE)
+
+    def button(self, name, down):
+        self.fire(1, self.BUTTON)
+
+    def scroll(self, dx, dy):
+        self.fire(1, self.SCROLL)
+
+    def key(self, name, down):
+        self.fire(1, self.KEY)
+
+    def resolve_key(self, name):
+        return 0, 0
+
+    def type_keys(self, taps):
+        self.fire(len(taps), self.KEYBOARD)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def timestamps(self):
+        """Recorded timestamps, oldest first"""
+        if self.total <= self.capacity:
+            return self.times[:self.total]
+        split = self.total % self.capacity
+        return self.times[split:] + self.times[:split]
+
+    def intervals(self):
+        """Gaps between consecutive recorded actions in seconds"""
+        stamps = self.timestamps()
+        return array("d", (b - a for a, b in zip(stamps, stamps[1:])))
+
+BACKENDS = {
+    "pynput": PynputBackend,
+    "xtest": XTestBackend,
+    "uinput": UInputBackend,
+    "null": NullBackend,
+    "recording": RecordingBackend,
+}
+
+def make_backend(spec="auto"):
+    """Resolve a backend name, class or instance; "auto" prefers XTest on X11"""
+    if isinstance(spec, InputBackend):
+        return spec
+    if isinstance(spec, type):
+        return spec()
+    if spec == "auto":
+        if sys.platform.startswith("linux") and os.environ.get("DISPLAY") and import_xlib():
+            try:
+                return XTestBackend()
+            except Exception:
+                pass
+        return PynputBackend()
+    try:
+        return BACKENDS[spec]()
+    except KeyError:
+        raise ValueError(f"Unknown input backend: {spec}")
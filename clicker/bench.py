@@ -0,0 +1,208 @@
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .backends import RecordingBackend
+from .engine import ClickEngine, RunPlan
+
+DEFAULT_CPS = (10, 100, 1000, 5000, 10000)
+DEFAULT_JITTER = (0.0, 0.2)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def drift_stats(stamps, cps):
+    """Lag of each action behind the ideal schedule start + i / cps
+
+    Returns the final and worst lag plus the least-squares slope of lag over
+    time, which is the steady drift a longer run would accumulate.
+    """
+    if len(stamps) < 2:
+        return {"final_ms": 0.0, "max_ms": 0.0, "slope_ms_per_s": 0.0}
+    t0 = stamps[0]
+    n = len(stamps)
+    sum_t = sum_lag = sum_tt = sum_tl = 0.0
+    worst = 0.0
+    for i, stamp in enumerate(stamps):
+        t = stamp - t0
+        lag = t - i / cps
+        if abs(lag) > abs(worst):
+            worst = lag
+        sum_t += t
+        sum_lag += lag
+        sum_tt += t * t
+        sum_tl += t * lag
+    denom = n * sum_tt - sum_t * sum_t
+    slope = (n * sum_tl - sum_t * sum_lag) / denom if denom else 0.0
+    return {
+        "final_ms": lag * 1000,
+        "max_ms": worst * 1000,
+        "slope_ms_per_s": slope * 1000,
+    }
+
+class Contention:
+    """Pure-Python threads holding the GIL in bursts, like Tk redraws and input hooks
+
+    Each thread computes for busy seconds out of every period.
+    """
+    def __init__(self, threads=1, busy=0.002, period=0.01):
+        self.threads = threads
+        self.busy = busy
+        self.period = period
+        self.stop_event = threading.Event()
+        self.workers = []
+
+    def __enter__(self):
+        for _ in range(self.threads):
+            worker = threading.Thread(target=self.spin, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join()
+
+    def spin(self):
+        while not self.stop_event.is_set():
+            until = time.perf_counter() + self.busy
+            while time.perf_counter() < until:
+                sum(i * i for i in range(100))
+            self.stop_event.wait(self.period - self.busy)
+
+def run_case(cps, jitter=0.0, duration=2.0, jitter_model="uniform", seed=1, burst=True,
+             isolated=False):
+    """Benchmark one CPS / jitter combination
+
+    isolated runs it on a ProcessClickEngine, whose CPU time is not measured.
+    """
+    plan = RunPlan(
+        interval=1.0 / cps, jitter=jitter, jitter_model=jitter_model,
+        jitter_seed=seed, burst=burst
+    )
+    recorder = RecordingBackend(capacity=int(cps * duration * 1.5) + 1024)
+    if isolated:
+        from .isolated import ProcessClickEngine
+
+        engine = ProcessClickEngine(backend=recorder)
+        engine.start_worker()
+    else:
+        engine = ClickEngine(backend=recorder)
+
+    cpu_start = time.process_time()
+    stats = engine.run(plan, duration=duration)
+    cpu = time.process_time() - cpu_start
+    if isolated:
+        engine.close()
+        # The recording made in the worker comes back with the final results
+        recorder = engine.backend
+
+    metrics = engine.metrics.snapshot()
+    stamps = recorder.timestamps()
+    intervals = sorted(recorder.intervals())
+    to_us = lambda seconds: round(seconds * 1e6, 2)
+    return {
+        "cps": cps,
+        "jitter": jitter,
+        "jitter_model": jitter_model if jitter else None,
+        "burst": burst,
+        "duration": round(stats["elapsed"], 4),
+        "actions": stats["actions"],
+        "achieved_rate": round(stats["achieved_rate"], 2),
+        "rate_error_pct": round((stats["achieved_rate"] / cps - 1) * 100, 3),
+        "missed_ticks": stats["missed_ticks"],
+        "final_burst": stats["burst"],
+        "interval_us": {
+            "target": to_us(1.0 / cps),
+            "p50": to_us(percentile(intervals, 0.50)),
+            "p99": to_us(percentile(intervals, 0.99)),
+            "p99.9": to_us(percentile(intervals, 0.999)),
+            "max": to_us(intervals[-1]) if intervals else 0.0,
+        },
+        "drift": {k: round(v, 4) for k, v in drift_stats(stamps, cps).items()},
+        "injection_us": {k: metrics["injection"][k] for k in ("p50_us", "p99_us", "max_us")},
+        "oversleep_us": {k: metrics["oversleep"][k] for k in ("p50_us", "p99_us", "max_us")},
+        "busy_fraction": round(metrics["busy_fraction"], 4),
+        "isolated": isolated,
+        "cpu_pct": None if isolated else round(100 * cpu / stats["elapsed"], 1) if stats["elapsed"] else 0.0,
+    }
+
+def run_sweep(cps_values=DEFAULT_CPS, jitters=DEFAULT_JITTER, duration=2.0,
+              jitter_model="uniform", burst=True, label="", progress=None,
+              isolated=False, contention=0):
+    """Benchmark every CPS x jitter combination and return a JSON-ready report
+
+    contention runs that many GIL-bound busy threads in this process meanwhile.
+    """
+    results = []
+    with Contention(contention):
+        for cps in cps_values:
+            for jitter in jitters:
+                result = run_case(cps, jitter, duration, jitter_model, burst=burst, isolated=isolated)
+                results.append(result)
+                if progress:
+                    progress(result)
+    return {
+        "label": label,
+        "isolated": isolated,
+        "contention": contention,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def compare(baseline, report):
+    """Per-case changes in achieved rate and p99 interval against a baseline report"""
+    old = {(r["cps"], r["jitter"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in report["results"]:
+        before = old.get((result["cps"], result["jitter"]))
+        if before is None:
+            continue
+        rows.append({
+            "cps": result["cps"],
+            "jitter": result["jitter"],
+            "achieved_rate_delta": round(result["achieved_rate"] - before["achieved_rate"], 2),
+            "p99_us_delta": round(result["interval_us"]["p99"] - before["interval_us"]["p99"], 2),
+        })
+    return rows
+
+def format_result(result):
+    iv = result["interval_us"]
+    return (f"{result['cps']:>6g} CPS  jitter {result['jitter']:<4}  "
+            f"achieved {result['achieved_rate']:>9.1f}  "
+            f"p50 {iv['p50']:>8.1f}us  p99 {iv['p99']:>8.1f}us  p99.9 {iv['p99.9']:>8.1f}us  "
+            f"drift {result['drift']['final_ms']:>7.2f}ms  " +
+            (f"cpu {result['cpu_pct']:>5.1f}%" if result["cpu_pct"] is not None else "isolated"))
+
+def bench_command(args):
+    report = run_sweep(
+        args.cps, args.jitter, args.duration, args.jitter_model,
+        burst=not args.no_burst, label=args.label,
+        isolated=args.isolated, contention=args.contention,
+        progress=lambda result: print(format_result(result), file=sys.stderr)
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for row in compare(baseline, report):
+            print(f"{row['cps']:>6g} CPS  jitter {row['jitter']:<4}  "
+                  f"rate {row['achieved_rate_delta']:+.1f}  p99 {row['p99_us_delta']:+.1f}us",
+                  file=sys.stderr)
+    return 0
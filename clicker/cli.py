@@ -0,0 +1,621 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from .backends import BACKENDS
+from .bench import DEFAULT_CPS, DEFAULT_JITTER, bench_command
+from .engine import ClickEngine, RunPlan
+from .jobs import JobScheduler, load_jobs
+from .keyseq import KeySequence
+from .history import HistoryStore, default_history_path
+from .hotkeys import HotkeyListener
+from .jitter import JitterSchedule
+from .macro import MAX_SPEED, MIN_SPEED, MacroPlayer, MacroRecorder
+from .macrofile import convert_macro, load_macro, save_macro
+from .metrics import MetricsServer
+from .profiler import StackSampler, format_phases, write_profile
+from .scheduler import DeadlineScheduler
+from .settings import DEFAULT_SETTINGS, ProfileStore, config_dir, load_settings
+from .startup import startup_command
+from .targets import PATHS
+from .watch import ChangeTrigger, ColorTrigger, ScreenWatcher, make_source, parse_color, parse_region
+
+def parse_position(value):
+    try:
+        x, y = (int(v) for v in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("position must be X,Y")
+    return (x, y)
+
+def parse_floats(value):
+    try:
+        return [float(v) for v in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a comma-separated list of numbers")
+
+def parse_ints(value):
+    try:
+        return [int(v) for v in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a comma-separated list of whole numbers")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="autoclicker",
+        description="Ultra Autoclicker Pro. Without a command the GUI is started."
+    )
+    commands = parser.add_subparsers(dest="command")
+    
+    run = commands.add_parser("run", help="run the click engine headless")
+    run.add_argument("--settings", metavar="PATH", help="start from a settings JSON file")
+    run.add_argument("--settings-profile", metavar="NAME",
+                     help="start from a saved settings profile (see the profiles command)")
+    run.add_argument("--cps", type=float, help="actions per second (1-10000)")
+    run.add_argument("--button", choices=["left", "right", "middle"], help="mouse button to click")
+    run.add_argument("--key", help="press this key instead of clicking")
+    typing = run.add_mutually_exclusive_group()
+    typing.add_argument("--type", metavar="TEXT",
+                        help='type TEXT instead of clicking; {enter} or {ctrl+s} press keys, {{ types a brace')
+    typing.add_argument("--type-file", metavar="PATH",
+                        help="type the contents of a UTF-8 text file literally")
+    run.add_argument("--loop", action="store_true", help="type the text over and over until stopped")
+    run.add_argument("--position", type=parse_position, metavar="X,Y",
+                     help="click at a fixed position instead of the cursor")
+    run.add_argument("--targets", metavar="SPEC",
+                     help='cycle through targets: "X,Y; X,Y", "grid L,T R,B CxR" or "region L,T R,B xN"')
+    run.add_argument("--path", choices=PATHS, help="pointer path between targets (default: none)")
+    run.add_argument("--path-steps", type=int, metavar="N",
+                     help="intermediate pointer moves per path leg")
+    run.add_argument("--duration", metavar="SECONDS",
+                     help="stop after this many seconds of clicking (default: until Ctrl+C)")
+    run.add_argument("--count", metavar="N", help="stop after exactly N actions")
+    run.add_argument("--start-at", metavar="TIME",
+                     help='start at a wall-clock time: "14:00:00" (next occurrence) or "2026-10-18 14:00"')
+    run.add_argument("--stop-at", metavar="TIME", help="stop at a wall-clock time, same formats")
+    run.add_argument("--jitter", type=float, metavar="FRACTION",
+                     help="randomize intervals by this fraction, e.g. 0.2")
+    run.add_argument("--jitter-model", choices=JitterSchedule.MODELS)
+    run.add_argument("--jitter-sequence", metavar="SECONDS,...",
+                     help="intervals the sequence model cycles through, e.g. 0.05,0.08,0.12")
+    run.add_argument("--seed", type=int, help="seed for reproducible jitter")
+    run.add_argument("--missed-ticks", choices=DeadlineScheduler.POLICIES)
+    run.add_argument("--no-burst", action="store_true", help="fire exactly one action per wake-up")
+    run.add_argument("--metrics-port", type=int, metavar="PORT",
+                     help="serve live metrics on 127.0.0.1:PORT (/metrics, /metrics.json)")
+    run.add_argument("--metrics-csv", metavar="PATH", help="write the run's metrics here when it stops")
+    run.add_argument("--profile", nargs="?", const="autoclicker-profile", metavar="PREFIX",
+                     help="sample the engine thread; writes PREFIX.collapsed and PREFIX.json")
+    run.add_argument("--profile-interval", type=float, default=1.0, metavar="MS",
+                     help="stack sampling interval in milliseconds (default: 1)")
+    run.add_argument("--backend", choices=["auto", *BACKENDS], default="auto",
+                     help="input backend (null/recording inject nothing)")
+    run.add_argument("--isolated", action="store_true",
+                     help="run the engine in a separate process, away from this one's GIL")
+    run.add_argument("--history", metavar="PATH",
+                     help="append the finished run to this history database "
+                          "(default: history.db in the config directory)")
+    run.add_argument("--no-history", action="store_true", help="do not record the run")
+    
+    bench = commands.add_parser("bench", help="measure pacing accuracy against the recording backend")
+    bench.add_argument("--cps", type=parse_floats, default=list(DEFAULT_CPS),
+                       help="comma-separated CPS targets (default: %(default)s)")
+    bench.add_argument("--jitter", type=parse_floats, default=list(DEFAULT_JITTER),
+                       help="comma-separated jitter fractions (default: %(default)s)")
+    bench.add_argument("--jitter-model", choices=["uniform", "gaussian", "lognormal"], default="uniform")
+    bench.add_argument("--duration", type=float, default=2.0, metavar="SECONDS",
+                       help="length of each case (default: %(default)s)")
+    bench.add_argument("--no-burst", action="store_true")
+    bench.add_argument("--isolated", action="store_true", help="run the engine in a separate process")
+    bench.add_argument("--contention", type=int, default=0, metavar="THREADS",
+                       help="busy Python threads competing for the GIL meanwhile (default: 0)")
+    bench.add_argument("--label", default="", help="free-form tag stored in the report, e.g. a version")
+    bench.add_argument("--output", metavar="PATH", help="write the JSON report here instead of stdout")
+    bench.add_argument("--baseline", metavar="PATH", help="print deltas against an earlier report")
+    
+    macro = commands.add_parser("macro", help="record, replay and convert input macros")
+    macro_commands = macro.add_subparsers(dest="macro_command", required=True)
+    record = macro_commands.add_parser("record", help="record mouse and keyboard input")
+    record.add_argument("output", help="macro file to write (.acm binary or .json)")
+    record.add_argument("--duration", type=float, metavar="SECONDS",
+                        help="stop after this many seconds (default: until Ctrl+C)")
+    record.add_argument("--no-moves", action="store_true", help="do not record pointer movement")
+    record.add_argument("--move-interval", type=float, default=0.0, metavar="SECONDS",
+                        help="drop pointer moves closer together than this")
+    play = macro_commands.add_parser("play", help="replay a macro file")
+    play.add_argument("path")
+    play.add_argument("--speed", type=float, default=1.0, help=f"{MIN_SPEED:g}-{MAX_SPEED:g}x (default: 1)")
+    play.add_argument("--loops", type=int, default=1)
+    play.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    convert = macro_commands.add_parser("convert", help="convert between .acm and .json")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    info = macro_commands.add_parser("info", help="show event count and duration")
+    info.add_argument("path")
+    
+    jobs = commands.add_parser("jobs", help="run several click jobs at once from a JSON file")
+    jobs.add_argument("path", help='{"jobs": [{"name": ..., "cps": ... or "interval": ..., ...}]}')
+    jobs.add_argument("--duration", type=float, metavar="SECONDS",
+                      help="stop after this many seconds (default: until Ctrl+C)")
+    jobs.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    jobs.add_argument("--no-hotkeys", action="store_true", help="ignore the jobs' hotkeys")
+    
+    watch = commands.add_parser("watch", help="click when a screen region changes or shows a colour")
+    watch.add_argument("--region", required=True, metavar="L,T,W,H",
+                       help="screen region to capture: left, top, width, height")
+    watch.add_argument("--color", metavar="RRGGBB",
+                       help="fire when the region shows this colour (default: fire on any change)")
+    watch.add_argument("--tolerance", type=int, default=0,
+                       help="per-channel difference still counted as equal (default: 0)")
+    watch.add_argument("--min-fraction", type=float, default=0.0, metavar="FRACTION",
+                       help="share of the region that must match or change (default: any pixel)")
+    watch.add_argument("--reference", choices=ChangeTrigger.REFERENCES, default="previous",
+                       help="change mode: compare with the previous or the first frame")
+    watch.add_argument("--poll-hz", type=float, default=60.0, help="captures per second (default: 60)")
+    watch.add_argument("--cooldown", type=float, default=0.1, metavar="SECONDS",
+                       help="ignore matches for this long after firing (default: 0.1)")
+    watch.add_argument("--once", action="store_true", help="exit after the first trigger")
+    watch.add_argument("--duration", type=float, metavar="SECONDS",
+                       help="stop after this many seconds (default: until Ctrl+C)")
+    watch.add_argument("--button", choices=["left", "right", "middle"], default="left")
+    watch.add_argument("--key", help="press this key instead of clicking")
+    watch.add_argument("--position", type=parse_position, metavar="X,Y",
+                       help="click at a fixed position instead of the cursor")
+    watch.add_argument("--source", choices=["auto", "xshm", "xlib"], default="auto",
+                       help="capture method (default: MIT-SHM, falling back to GetImage)")
+    watch.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    
+    history = commands.add_parser("history", help="show per-day totals and best rates of past runs")
+    history.add_argument("--db", metavar="PATH",
+                         help="history database (default: history.db in the config directory)")
+    history.add_argument("--days", type=int, default=14, help="days to list (default: 14)")
+    history.add_argument("--recent", type=int, default=0, metavar="N", help="also list the last N runs")
+    
+    commands.add_parser("profiles", help="list the saved settings profiles")
+    
+    startup = commands.add_parser("startup", help="measure GUI import time and time-to-interactive")
+    startup.add_argument("--runs", type=int, default=5, help="launches to take the median of (default: 5)")
+    startup.add_argument("--budget", type=float, metavar="MS",
+                         help="exit with an error if time-to-interactive exceeds this")
+    startup.add_argument("--label", default="", help="free-form tag stored in the report")
+    startup.add_argument("--output", metavar="PATH", help="write the JSON report here instead of stdout")
+    startup.add_argument("--baseline", metavar="PATH", help="print deltas against an earlier report")
+    
+    serve = commands.add_parser("serve", help="listen for start/stop/rate commands on a control socket")
+    serve.add_argument("--socket", metavar="PATH", help="Unix socket to listen on (default: autoclicker-UID.sock in $XDG_RUNTIME_DIR)")
+    serve.add_argument("--settings", metavar="PATH", help="settings that start and rate build on")
+    serve.add_argument("--settings-profile", metavar="NAME", help="use a saved settings profile instead")
+    serve.add_argument("--start", action="store_true", help="start a run with those settings right away")
+    serve.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    serve.add_argument("--isolated", action="store_true", help="run the engine in a separate process")
+    
+    control = commands.add_parser("control", help="send a command to a running serve, or benchmark it")
+    control.add_argument("request", nargs="*", metavar="COMMAND",
+                         help='ping, start [JSON], stop, rate CPS, stats or shutdown')
+    control.add_argument("--socket", metavar="PATH", help="control socket (default: the serve default)")
+    control.add_argument("--bench", type=int, metavar="N",
+                         help="measure round trips: N requests per client (spawns a null-backend "
+                              "server unless --socket is given)")
+    control.add_argument("--clients", type=parse_ints, default=[1, 4], metavar="N,N",
+                         help="concurrent client counts to benchmark (default: 1,4)")
+    control.add_argument("--cps", type=float, default=1000, help="rate the server clicks at meanwhile")
+    control.add_argument("--output", metavar="PATH", help="write the JSON report here instead of stdout")
+    
+    gui = commands.add_parser("gui", help="start the graphical interface (default)")
+    gui.add_argument("--startup-report", action="store_true",
+                     help="print startup timings as JSON once interactive, then exit")
+    return parser
+
+def settings_from_args(args):
+    """Settings named by --settings-profile or --settings, else the defaults"""
+    if args.settings_profile:
+        with ProfileStore() as profiles:
+            return profiles.get(args.settings_profile)
+    if args.settings:
+        return load_settings(args.settings, strict=True)
+    return dict(DEFAULT_SETTINGS)
+
+def plan_from_args(args):
+    """RunPlan from saved settings (or defaults) with command-line overrides"""
+    settings = settings_from_args(args)
+    overrides = {}
+    if args.cps is not None:
+        if args.cps <= 0:
+            raise ValueError("Speed must be greater than zero")
+        overrides["interval"] = 1.0 / args.cps
+    if args.button:
+        overrides["action"] = "mouse"
+        overrides["button"] = args.button
+    if args.key:
+        overrides["action"] = "keyboard"
+        overrides["key"] = args.key
+    if args.type is not None:
+        overrides["action"] = "type"
+        overrides["keys"] = KeySequence.parse(args.type, repeat=args.loop)
+    elif args.type_file:
+        with open(args.type_file, encoding="utf-8") as f:
+            overrides["action"] = "type"
+            overrides["keys"] = KeySequence.from_text(f.read(), repeat=args.loop)
+    if args.position:
+        overrides["location"] = "fixed"
+        overrides["position"] = args.position
+    if args.targets:
+        # Parsed by from_settings so the path shares the jitter seed
+        settings.update(click_location="targets", targets=args.targets)
+    if args.path:
+        settings["target_path"] = args.path
+    if args.path_steps is not None:
+        settings["path_steps"] = args.path_steps
+    if args.seed is not None:
+        settings["jitter_seed"] = str(args.seed)
+    if args.jitter_sequence:
+        settings["jitter_sequence"] = args.jitter_sequence
+        overrides.setdefault("jitter_model", "sequence")
+    # Limits are parsed by from_settings so a stop time is taken after the start time
+    for key, value in (("stop_after_actions", args.count), ("stop_after_seconds", args.duration),
+                       ("start_at", args.start_at), ("stop_at", args.stop_at)):
+        if value is not None:
+            settings[key] = value
+    if args.jitter is not None:
+        overrides["jitter"] = args.jitter
+    if args.jitter_model:
+        overrides["jitter_model"] = args.jitter_model
+    if args.seed is not None:
+        overrides["jitter_seed"] = args.seed
+    if args.missed_ticks:
+        overrides["missed_ticks"] = args.missed_ticks
+    if args.no_burst:
+        overrides["burst"] = False
+    return RunPlan.from_settings(settings, position=args.position, **overrides)
+
+def format_stats(stats):
+    text = (f"Actions: {stats['actions']:,} | Time: {stats['elapsed']:.2f}s | "
+            f"Target: {stats['target_rate']:.6g} | Achieved: {stats['achieved_rate']:.1f} | "
+            f"Missed ticks: {stats['missed_ticks']:,}")
+    if stats.get("halt_latency_ms") is not None:
+        text += f" | Halt: {stats['halt_latency_ms']:.2f} ms"
+    return text
+
+def make_engine(args):
+    if not args.isolated:
+        return ClickEngine(backend=args.backend)
+    # Live metrics and stack samples are taken in this process
+    if args.profile:
+        raise ValueError("--profile samples the engine thread and cannot be used with --isolated")
+    if args.metrics_port is not None:
+        raise ValueError("--metrics-port serves live metrics and cannot be used with --isolated")
+    from .isolated import ProcessClickEngine
+    
+    return ProcessClickEngine(backend=args.backend)
+
+def run_command(args):
+    try:
+        plan = plan_from_args(args)
+        engine = make_engine(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    server = None
+    sampler = None
+    try:
+        if args.metrics_port is not None:
+            server = MetricsServer(lambda: engine.metrics, port=args.metrics_port)
+            server.start()
+        engine.start(plan)
+        if args.profile:
+            sampler = StackSampler(engine.thread.ident, args.profile_interval / 1000).start()
+    except (OSError, RuntimeError, ValueError) as e:
+        if server is not None:
+            server.stop()
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    
+    if plan.start_at is not None:
+        print(f"Starting at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(plan.start_at))}",
+              file=sys.stderr)
+    try:
+        stats = engine.wait()
+    except KeyboardInterrupt:
+        engine.stop()
+        engine.join()
+        stats = engine.stats()
+    finally:
+        if server is not None:
+            server.stop()
+        if sampler is not None:
+            sampler.stop()
+    if sampler is not None:
+        try:
+            report = write_profile(sampler, engine, args.profile)
+            print(f"Profile ({report['samples']:,} samples): {format_phases(report)} "
+                  f"-> {args.profile}.collapsed", file=sys.stderr)
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+    if args.metrics_csv:
+        try:
+            engine.metrics.write_csv(args.metrics_csv)
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+    if not args.no_history:
+        try:
+            with HistoryStore(args.history) as history:
+                history.record_engine(engine)
+        except RuntimeError as e:
+            print(f"warning: {e}", file=sys.stderr)
+    if args.isolated:
+        engine.close()
+    if engine.error is not None:
+        print(f"error: {engine.error}", file=sys.stderr)
+        return 1
+    print(format_stats(stats))
+    return 0
+
+def history_command(args):
+    path = args.db or default_history_path()
+    if not os.path.exists(path):
+        print(f"No history yet ({path})")
+        return 0
+    try:
+        with HistoryStore(path) as history:
+            days = history.daily(args.days)
+            bests = history.best_rates()
+            recent = history.recent(args.recent) if args.recent > 0 else []
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"{'Day':<12}{'Runs':>7}{'Actions':>14}{'Time':>11}")
+    for day in days:
+        print(f"{day['day']:<12}{day['runs']:>7,}{day['actions']:>14,}{day['seconds']:>10.0f}s")
+    print(f"\n{'Target':>10}{'Runs':>7}{'Best':>12}")
+    for best in bests:
+        print(f"{best['target_rate']:>10.6g}{best['runs']:>7,}{best['best_rate']:>12.1f}")
+    if recent:
+        print()
+        for run in recent:
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started"]))
+            print(f"#{run['id']} {started} {run['plan']['action']} "
+                  f"{run['actions']:,} actions in {run['stopped'] - run['started']:.1f}s | "
+                  f"Target: {run['target_rate']:.6g} | Achieved: {run['achieved_rate']:.1f}")
+    return 0
+
+def macro_command(args):
+    try:
+        if args.macro_command == "record":
+            recorder = MacroRecorder(record_moves=not args.no_moves,
+                                     min_move_interval=args.move_interval)
+            recorder.start()
+            print("Recording... press Ctrl+C to stop", file=sys.stderr)
+            try:
+                time.sleep(args.duration if args.duration is not None else float("inf"))
+            except KeyboardInterrupt:
+                pass
+            log = recorder.stop()
+            save_macro(log, args.output)
+            print(f"Saved {len(log):,} events ({log.duration:.1f}s) to {args.output}")
+        elif args.macro_command == "play":
+            macro = load_macro(args.path)
+            player = MacroPlayer(macro, backend=args.backend, speed=args.speed, loops=args.loops)
+            try:
+                played = player.play()
+            except KeyboardInterrupt:
+                player.stop()
+                played = player.played
+            print(f"Replayed {played:,} events ({player.skipped_moves:,} moves coalesced)")
+        elif args.macro_command == "convert":
+            convert_macro(args.source, args.target)
+        else:
+            macro = load_macro(args.path)
+            print(f"{args.path}: {len(macro):,} events, {macro.duration:.3f}s")
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def jobs_command(args):
+    try:
+        entries = load_jobs(args.path)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    scheduler = JobScheduler(backend=args.backend)
+    hotkeys = HotkeyListener()
+    try:
+        for name, plan, hotkey, start in entries:
+            scheduler.add(name, plan, hotkey, start=start)
+            if hotkey and not args.no_hotkeys:
+                hotkeys.bind(hotkey, lambda pressed_at, name=name: scheduler.toggle(name))
+    except (OSError, RuntimeError, ValueError) as e:
+        scheduler.close()
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    
+    if hotkeys.table:
+        try:
+            hotkeys.start()
+        except ImportError as e:
+            # pynput fails at import time without a display; the jobs still run
+            print(f"warning: hotkeys disabled: {str(e).splitlines()[0]}", file=sys.stderr)
+    
+    try:
+        time.sleep(args.duration if args.duration is not None else float("inf"))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hotkeys.stop()
+        scheduler.close()
+    
+    failed = False
+    for name, stats in scheduler.stats().items():
+        print(f"{name}: {format_stats(stats)}")
+        if stats["error"]:
+            print(f"error: {name}: {stats['error']}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+def watch_command(args):
+    try:
+        region = parse_region(args.region)
+        if args.color:
+            trigger = ColorTrigger(parse_color(args.color), args.tolerance, args.min_fraction)
+        else:
+            trigger = ChangeTrigger(args.tolerance, args.min_fraction, args.reference)
+        fields = dict(action="keyboard", key=args.key) if args.key else dict(button=args.button)
+        if args.position:
+            fields.update(location="fixed", position=args.position)
+        plan = RunPlan(**fields)
+    except (RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    source = None
+    try:
+        source = make_source(region, args.source)
+        watcher = ScreenWatcher(source, trigger, plan, backend=args.backend,
+                                poll_hz=args.poll_hz, cooldown=args.cooldown, once=args.once)
+        watcher.start()
+    except (OSError, RuntimeError, ValueError) as e:
+        if source is not None:
+            source.close()
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"Watching {args.region} via {source.name}... press Ctrl+C to stop", file=sys.stderr)
+    try:
+        watcher.join(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        watcher.join()
+        source.close()
+    
+    if watcher.error is not None:
+        print(f"error: {watcher.error}", file=sys.stderr)
+        return 1
+    stats = watcher.stats()
+    print(f"Polls: {stats['polls']:,} | Triggers: {stats['triggers']:,} | "
+          f"Missed polls: {stats['missed_polls']:,} | "
+          f"Capture p99: {stats['capture']['p99_us']:.0f} us | "
+          f"Capture-to-click p99: {stats['capture_to_click']['p99_us']:.0f} us")
+    return 0
+
+def profiles_command(args):
+    try:
+        with ProfileStore() as profiles:
+            for name in profiles.names():
+                settings = profiles.get(name)
+                marker = "*" if name == profiles.active else " "
+                action = settings["mouse_button"] if settings["action_type"] == "mouse" else settings["keyboard_key"]
+                print(f"{marker} {name:<20} {settings['action_type']:<9} {action:<8} {settings['cps']} CPS")
+            for name, error in profiles.errors.items():
+                print(f"error: {name}: {error}", file=sys.stderr)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"({config_dir()})", file=sys.stderr)
+    return 0
+
+def serve_command(args):
+    # Sockets and selectors are only imported for the control commands
+    from .control import ControlServer
+    
+    try:
+        settings = settings_from_args(args)
+        plan = RunPlan.from_settings(settings) if args.start else None
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.isolated:
+        from .isolated import ProcessClickEngine
+        
+        engine = ProcessClickEngine(backend=args.backend)
+    else:
+        engine = ClickEngine(backend=args.backend)
+    
+    server = ControlServer(engine, args.socket, settings)
+    try:
+        server.start()
+        if plan is not None:
+            engine.start(plan)
+    except (OSError, RuntimeError, ValueError) as e:
+        server.stop()
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Listening on {server.path}", file=sys.stderr)
+    
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        engine.stop()
+        engine.join()
+        if args.isolated:
+            engine.close()
+    print(f"{server.commands:,} commands from {server.connections:,} connections", file=sys.stderr)
+    return 0
+
+def control_command(args):
+    from .control import ControlClient, bench_control, format_round_trips
+    
+    if args.bench is not None:
+        try:
+            report = bench_control(
+                args.socket, requests=args.bench, clients=args.clients, cps=args.cps,
+                progress=lambda result: print(format_round_trips(result), file=sys.stderr)
+            )
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text)
+        else:
+            print(text)
+        return 0
+    
+    if not args.request:
+        print("error: expected a command, e.g. ping, stats or rate 100 (or --bench N)", file=sys.stderr)
+        return 2
+    try:
+        with ControlClient(args.socket) as client:
+            reply = client.request(" ".join(args.request))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print("ok" if reply is None else json.dumps(reply, indent=2))
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        return run_command(args)
+    if args.command == "bench":
+        return bench_command(args)
+    if args.command == "macro":
+        return macro_command(args)
+    if args.command == "jobs":
+        return jobs_command(args)
+    if args.command == "watch":
+        return watch_command(args)
+    if args.command == "history":
+        return history_command(args)
+    if args.command == "profiles":
+        return profiles_command(args)
+    if args.command == "startup":
+        return startup_command(args)
+    if args.command == "serve":
+        return serve_command(args)
+    if args.command == "control":
+        return control_command(args)
+    
+    # Tkinter is only imported when the GUI is actually requested
+    from .gui import main as gui_main
+    gui_main(report_startup=getattr(args, "startup_report", False))
+    return 0
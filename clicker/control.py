@@ -0,0 +1,541 @@
+import json
+import os
+import selectors
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
+
+from .bench import percentile
+from .jobs import plan_from_entry
+from .settings import DEFAULT_SETTINGS, validate_settings
+
+MAX_LINE = 1 << 16
+SWITCH_INTERVAL = 0.0005
+COMMANDS = ("ping", "start", "stop", "rate", "stats", "shutdown")
+# Jobs-file keys start takes besides the settings
+START_EXTRAS = ("interval", "position")
+# Returned by a command whose reply is sent later
+DEFERRED = object()
+
+def default_socket_path():
+    """Per-user socket in the runtime directory (the temp directory where there is none)"""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(directory, f"autoclicker-{user}.sock")
+
+def encode(value):
+    return json.dumps(value, separators=(",", ":"))
+
+class Connection:
+    def __init__(self, sock):
+        self.sock = sock
+        self.received = bytearray()
+        self.outgoing = bytearray()
+        self.skipping = False
+        self.waiting = False
+
+class ControlServer:
+    """Line-protocol control socket for a click engine
+
+    Clients connect to a Unix domain socket and send one command per line;
+    every command gets exactly one reply line, "ok" or "ok <JSON>" on
+    success and "error <message>" otherwise:
+
+        ping                    ok
+        start [JSON]            ok {"started_at": ...}   JSON holds settings keys, as in a jobs file
+        stop                    ok {stats}               once the last action has fired
+        rate CPS                ok {"cps": ...}          retunes a running plan atomically
+        stats                   ok {stats}
+        shutdown                ok                       stops the run and the server
+
+    One thread multiplexes every client with a selector, and only ever
+    calls the engine's thread-safe methods, so the click loop never waits
+    on a client. A stop reply is held back until the run has wound down,
+    which a helper thread watches for; the client that sent it sends
+    nothing else meanwhile, and every other client is served as usual.
+    The engine can be a ClickEngine or a ProcessClickEngine.
+    """
+    def __init__(self, engine, path=None, settings=None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Control sockets need Unix domain socket support")
+        self.engine = engine
+        self.path = path or default_socket_path()
+        self.settings = dict(settings or DEFAULT_SETTINGS)
+        self.selector = None
+        self.listener = None
+        self.waker = None
+        self.wake_send = None
+        self.thread = None
+        self.switch_interval = None
+        self.closed = threading.Event()
+        self.stopping = []
+        self.resuming = []
+        self.connections = 0
+        self.commands = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self.remove_stale_socket()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.path)
+            os.chmod(self.path, 0o600)
+            listener.listen(128)
+        except OSError:
+            listener.close()
+            raise
+        listener.setblocking(False)
+        self.listener = listener
+        self.waker, self.wake_send = socket.socketpair()
+        self.waker.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(listener, selectors.EVENT_READ, "accept")
+        self.selector.register(self.waker, selectors.EVENT_READ, "wake")
+        self.closed.clear()
+        # The engine thread spins near deadlines; let the server take the
+        # GIL after 0.5 ms instead of the default 5 ms when a command arrives
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, SWITCH_INTERVAL))
+        self.thread = threading.Thread(target=self.serve_loop, name="control-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)  # Left behind by a server that did not shut down
+        else:
+            raise RuntimeError(f"A control server is already listening on {self.path}")
+        finally:
+            probe.close()
+
+    def stop(self):
+        """Close every connection and the socket; the engine is left as it is"""
+        if self.thread is None:
+            return
+        self.closed.set()
+        try:
+            self.wake_send.send(b"x")
+        except OSError:
+            pass  # The loop is already on its way out after a shutdown command
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+        self.wake_send.close()
+        sys.setswitchinterval(self.switch_interval)
+        self.thread = None
+
+    def wait(self, timeout=None):
+        """Block until a shutdown command (or stop()) closes the server"""
+        return self.closed.wait(timeout)
+
+    def serve_loop(self):
+        selector = self.selector
+        try:
+            while not self.closed.is_set():
+                for key, events in selector.select():
+                    if key.data == "accept":
+                        self.accept()
+                    elif key.data == "wake":
+                        self.waker.recv(64)
+                        self.finish_stops()
+                        self.resume()
+                    else:
+                        if events & selectors.EVENT_READ:
+                            self.receive(key.data)
+                        if events & selectors.EVENT_WRITE and key.data.sock.fileno() != -1:
+                            self.flush(key.data)
+        finally:
+            # Whatever ended the loop, let wait() return so the owner can clean up
+            self.closed.set()
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        self.selector.register(sock, selectors.EVENT_READ, Connection(sock))
+        self.connections += 1
+
+    def drop(self, connection):
+        self.selector.unregister(connection.sock)
+        connection.sock.close()
+
+    def receive(self, connection):
+        try:
+            data = connection.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.drop(connection)
+            return
+        connection.received += data
+        self.process(connection)
+
+    def process(self, connection):
+        """Answer the complete lines received so far, in order"""
+        received = connection.received
+        start = 0
+        while not connection.waiting:
+            end = received.find(b"\n", start)
+            if end < 0:
+                break
+            if connection.skipping or end - start > MAX_LINE:
+                connection.outgoing += b"error line too long\n"
+                connection.skipping = False
+            else:
+                line = received[start:end].decode("utf-8", "replace").strip()
+                if line:
+                    reply = self.handle(line)
+                    if reply is DEFERRED:
+                        connection.waiting = True
+                        self.stopping.append(connection)
+                    else:
+                        connection.outgoing += (reply + "\n").encode("utf-8")
+            start = end + 1
+        del received[:start]
+        if not connection.waiting and len(received) > MAX_LINE:
+            # Drop the rest of an overlong line as it arrives
+            connection.skipping = True
+            received.clear()
+        self.flush(connection)
+
+    def flush(self, connection):
+        outgoing = connection.outgoing
+        if outgoing:
+            try:
+                sent = connection.sock.send(outgoing)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                self.drop(connection)
+                return
+            del outgoing[:sent]
+        # Only watch for writability while a slow reader has replies queued
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if outgoing else 0)
+        if self.selector.get_key(connection.sock).events != events:
+            self.selector.modify(connection.sock, events, connection)
+
+    def handle(self, line):
+        """Run one command line and return its reply line"""
+        received_at = time.perf_counter()
+        self.commands += 1
+        command, _, argument = line.partition(" ")
+        handler = getattr(self, f"command_{command.lower()}", None)
+        if command.lower() not in COMMANDS or handler is None:
+            return f"error unknown command: {command[:40]}"
+        try:
+            result = handler(argument.strip(), received_at)
+            if result is DEFERRED:
+                return result
+        except (OSError, RuntimeError, ValueError) as e:
+            return f"error {e}".replace("\n", " ")
+        except Exception as e:
+            # A bad command must never take down the thread every client depends on
+            return f"error {type(e).__name__}: {e}".replace("\n", " ")
+        return "ok" if result is None else f"ok {encode(result)}"
+
+    def command_ping(self, argument, received_at):
+        return None
+
+    def command_start(self, argument, received_at):
+        entry = json.loads(argument) if argument else {}
+        if not isinstance(entry, dict):
+            raise ValueError("start takes a JSON object of settings")
+        unknown = [key for key in entry if key not in DEFAULT_SETTINGS and key not in START_EXTRAS]
+        if unknown:
+            raise ValueError(f"unknown setting: {', '.join(unknown)}")
+        settings = validate_settings(dict(self.settings, **entry))
+        # The jobs-file extras, which the settings schema does not keep
+        extras = {key: entry[key] for key in START_EXTRAS if key in entry}
+        plan = plan_from_entry(extras, settings)
+        if self.stopping:
+            # Answer pending stops with the run they stopped, not the new one
+            self.engine.join()
+            self.finish_stops()
+            self.wake_send.send(b"r")
+        self.engine.start(plan)
+        return {"started_at": self.engine.started_at}
+
+    def command_stop(self, argument, received_at):
+        self.engine.stop(requested_at=received_at)
+        if not self.engine.is_alive():
+            return self.stats()
+        threading.Thread(target=self.wait_for_engine, name="control-stop", daemon=True).start()
+        return DEFERRED
+
+    def wait_for_engine(self):
+        """Wake the server once the stopped run has wound down"""
+        self.engine.join()
+        try:
+            self.wake_send.send(b"s")
+        except OSError:
+            pass  # The server has closed
+
+    def finish_stops(self):
+        """Queue the stop replies that were waiting for the run to end"""
+        if not self.stopping or self.engine.is_alive():
+            return
+        reply = f"ok {encode(self.stats())}\n".encode("utf-8")
+        stopping, self.stopping = self.stopping, []
+        for connection in stopping:
+            connection.waiting = False
+            if connection.sock.fileno() != -1:  # Unless it disconnected while it waited
+                connection.outgoing += reply
+                self.resuming.append(connection)
+
+    def resume(self):
+        """Send queued stop replies and answer the lines received meanwhile"""
+        resuming, self.resuming = self.resuming, []
+        for connection in resuming:
+            if connection.sock.fileno() != -1:
+                self.process(connection)
+
+    def command_rate(self, argument, received_at):
+        try:
+            cps = float(argument)
+        except ValueError:
+            raise ValueError("rate takes actions per second, e.g. rate 250")
+        if cps <= 0:
+            raise ValueError("Speed must be greater than zero")
+        plan = self.engine.plan
+        if plan is not None and self.engine.running:
+            self.engine.apply(replace(plan, interval=1.0 / cps))
+        else:
+            # Validated the same way, then used by the next start
+            plan_from_entry({"cps": argument}, self.settings)
+        self.settings["cps"] = argument
+        return {"cps": cps}
+
+    def command_stats(self, argument, received_at):
+        return self.stats()
+
+    def command_shutdown(self, argument, received_at):
+        self.engine.stop(requested_at=received_at)
+        self.closed.set()
+        return None
+
+    def stats(self):
+        stats = self.engine.stats()
+        stats["running"] = self.engine.running
+        stats["error"] = str(self.engine.error) if self.engine.error is not None else None
+        return stats
+
+class ControlClient:
+    """Blocking client for a ControlServer; one request in flight at a time"""
+    def __init__(self, path=None, timeout=5.0):
+        self.path = path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError as e:
+            self.sock.close()
+            raise RuntimeError(f"Cannot connect to the control socket {self.path}: {e}")
+        self.received = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.sock.close()
+
+    def send(self, line):
+        """Send one command line and return the raw reply line"""
+        self.sock.sendall(line.encode("utf-8") + b"\n")
+        received = self.received
+        while True:
+            end = received.find(b"\n")
+            if end >= 0:
+                reply = received[:end].decode("utf-8")
+                del received[:end + 1]
+                return reply
+            data = self.sock.recv(65536)
+            if not data:
+                raise RuntimeError("The control server closed the connection")
+            received += data
+
+    def request(self, line):
+        """Reply payload of a command (decoded JSON or None); raises RuntimeError on "error" """
+        reply = self.send(line)
+        status, _, payload = reply.partition(" ")
+        if status != "ok":
+            raise RuntimeError(payload or reply)
+        return json.loads(payload) if payload else None
+
+    def ping(self):
+        return self.request("ping")
+
+    def start(self, **settings):
+        return self.request(f"start {encode(settings)}" if settings else "start")
+
+    def stop(self):
+        return self.request("stop")
+
+    def rate(self, cps):
+        return self.request(f"rate {cps:g}")
+
+    def stats(self):
+        return self.request("stats")
+
+    def shutdown(self):
+        return self.request("shutdown")
+
+def measure_round_trips(path, command="ping", requests=10000, clients=1):
+    """Round-trip times in seconds of command, sent back to back by each client thread"""
+    results = [None] * clients
+    errors = []
+    barrier = threading.Barrier(clients)
+
+    def client_loop(index):
+        try:
+            with ControlClient(path) as client:
+                client.send(command)  # Warm up the connection
+                samples = []
+                clock = time.perf_counter
+                barrier.wait()
+                for _ in range(requests):
+                    sent = clock()
+                    reply = client.send(command)
+                    samples.append(clock() - sent)
+                    if not reply.startswith("ok"):
+                        raise RuntimeError(reply)
+                results[index] = samples
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise RuntimeError(f"Control benchmark failed: {errors[0]}")
+    samples = sorted(sample for result in results for sample in result)
+    to_us = lambda seconds: round(seconds * 1e6, 2)
+    return {
+        "command": command,
+        "clients": clients,
+        "requests": len(samples),
+        "throughput_per_s": round(len(samples) / elapsed, 1),
+        "rtt_us": {
+            "mean": to_us(statistics.fmean(samples)),
+            "p50": to_us(percentile(samples, 0.50)),
+            "p99": to_us(percentile(samples, 0.99)),
+            "p99.9": to_us(percentile(samples, 0.999)),
+            "max": to_us(samples[-1]),
+        },
+    }
+
+def spawn_server(path, backend="null", timeout=10.0):
+    """Start `serve` in a child process and wait until its socket answers"""
+    from .startup import child_env
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "clicker", "serve", "--socket", path, "--backend", backend],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=child_env()
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with ControlClient(path, timeout=1.0) as client:
+                client.ping()
+            return process
+        except RuntimeError:
+            if process.poll() is not None:
+                raise RuntimeError(f"The control server exited: {process.stderr.read().strip()}")
+            time.sleep(0.02)
+    process.kill()
+    raise RuntimeError("The control server did not come up")
+
+def bench_control(path=None, commands=("ping", "stats", "rate 1000"), requests=5000, clients=(1, 4),
+                  cps=1000, progress=None):
+    """Round-trip latency of each command for each client count, while the server clicks
+
+    Without path a server is spawned on a temporary socket with the null
+    backend and shut down afterwards.
+    """
+    process = None
+    directory = None
+    if path is None:
+        directory = tempfile.mkdtemp(prefix="autoclicker-")
+        path = os.path.join(directory, "control.sock")
+        process = spawn_server(path)
+    try:
+        with ControlClient(path) as control:
+            control.start(cps=str(cps))
+            results = []
+            for count in clients:
+                for command in commands:
+                    result = measure_round_trips(path, command, requests, count)
+                    results.append(result)
+                    if progress:
+                        progress(result)
+            # How well the engine kept its pace while serving all of that
+            under_load = control.stats()
+            # start/stop through the socket, including joining the run
+            cycles = []
+            for _ in range(50):
+                sent = time.perf_counter()
+                control.stop()
+                control.start(cps=str(cps))
+                cycles.append(time.perf_counter() - sent)
+            stats = control.stop()
+    finally:
+        if process is not None:
+            try:
+                with ControlClient(path) as control:
+                    control.shutdown()
+            except RuntimeError:
+                pass
+            try:
+                process.wait(5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            os.rmdir(directory)
+    cycles.sort()
+    return {
+        "cps": cps,
+        "results": results,
+        "clicking": {key: under_load[key] for key in ("actions", "target_rate", "achieved_rate", "missed_ticks")},
+        "stop_start_us": {
+            "p50": round(percentile(cycles, 0.50) * 1e6, 2),
+            "p99": round(percentile(cycles, 0.99) * 1e6, 2),
+        },
+        "halt_latency_ms": stats["halt_latency_ms"],
+    }
+
+def format_round_trips(result):
+    rtt = result["rtt_us"]
+    return (f"{result['command']:<12} clients {result['clients']:>3}  "
+            f"p50 {rtt['p50']:>8.1f}us  p99 {rtt['p99']:>8.1f}us  p99.9 {rtt['p99.9']:>8.1f}us  "
+            f"{result['throughput_per_s']:>9,.0f} req/s")
@@ -0,0 +1,382 @@
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from .backends import make_backend
+from .jitter import JitterSchedule, parse_sequence
+from .keyseq import KeySequence, action_cursor
+from .limits import RunLimits, limits_from_settings, wait_for_clock
+from .metrics import RunMetrics
+from .scheduler import BurstController, DeadlineScheduler
+from .targets import PATHS, TargetSequence, parse_targets
+
+@dataclass(frozen=True)
+class RunPlan:
+    """Immutable, validated snapshot of everything the action loop needs"""
+    action: str = "mouse"
+    button: str = "left"
+    key: str = "enter"
+    keys: KeySequence = None
+    location: str = "current"
+    position: tuple = None
+    targets: TargetSequence = None
+    interval: float = 0.001
+    jitter: float = 0.0
+    jitter_model: str = "uniform"
+    jitter_seed: int = None
+    jitter_sequence: tuple = None
+    min_interval: float = None
+    max_interval: float = None
+    missed_ticks: str = "skip"
+    burst: bool = True
+    max_burst: int = 64
+    max_actions: int = None
+    max_duration: float = None
+    start_at: float = None
+    stop_at: float = None
+
+    MAX_CPS = 10000
+    # Scheduled jobs may run far slower than the GUI's speed range, e.g. one key every 30 s
+    MAX_INTERVAL = 3600.0
+
+    def __post_init__(self):
+        if self.action not in ("mouse", "keyboard", "type"):
+            raise ValueError(f"Unknown action type: {self.action}")
+        if self.action == "type" and not self.keys:
+            raise ValueError("Typing requires a key sequence")
+        if self.button not in ("left", "right", "middle"):
+            raise ValueError(f"Unknown mouse button: {self.button}")
+        if not self.key:
+            raise ValueError("Keyboard key must not be empty")
+        if self.location not in ("current", "fixed", "targets"):
+            raise ValueError(f"Unknown click location: {self.location}")
+        if self.location == "fixed" and self.position is None:
+            raise ValueError("Fixed location requires a position")
+        if self.location == "targets" and not self.targets:
+            raise ValueError("Target location requires at least one target")
+        if not 1.0 / self.MAX_CPS <= self.interval <= self.MAX_INTERVAL:
+            raise ValueError(f"Speed must be at most {self.MAX_CPS:,} CPS/APS "
+                             f"and at least one action per {self.MAX_INTERVAL:g} seconds")
+        if not 0.0 <= self.jitter < 1.0:
+            raise ValueError("Jitter must be between 0 and 1")
+        if self.jitter_model not in JitterSchedule.MODELS:
+            raise ValueError(f"Unknown jitter model: {self.jitter_model}")
+        if self.jitter_model == "sequence" and not self.jitter_sequence:
+            raise ValueError("Sequence jitter requires at least one interval")
+        if (self.min_interval is not None and self.max_interval is not None
+                and self.min_interval > self.max_interval):
+            raise ValueError("Minimum interval must not exceed maximum interval")
+        if self.missed_ticks not in DeadlineScheduler.POLICIES:
+            raise ValueError(f"Unknown missed-tick policy: {self.missed_ticks}")
+        if self.max_burst < 1:
+            raise ValueError("Maximum burst size must be at least 1")
+        if self.max_actions is not None and self.max_actions < 1:
+            raise ValueError("Action limit must be at least 1")
+        if self.max_duration is not None and not self.max_duration > 0:
+            raise ValueError("Duration limit must be greater than zero")
+        if self.start_at is not None and self.stop_at is not None and self.stop_at <= self.start_at:
+            raise ValueError("Stop time must be after the start time")
+
+    @classmethod
+    def from_settings(cls, settings, position=None, **overrides):
+        """Build a plan from a settings dict as saved by the GUI"""
+        try:
+            cps = float(settings.get("cps", 1000))
+        except (TypeError, ValueError):
+            raise ValueError("Speed must be a number")
+        if cps <= 0:
+            raise ValueError("Speed must be greater than zero")
+        
+        seed = str(settings.get("jitter_seed", "") or "").strip()
+        if seed:
+            try:
+                seed = int(seed)
+            except ValueError:
+                raise ValueError("Seed must be a whole number")
+        else:
+            seed = None
+        
+        randomize = bool(settings.get("randomize", False))
+        jitter_model = settings.get("jitter_model", "uniform")
+        if jitter_model == "sequence" and not randomize:
+            jitter_model = "uniform"  # Randomization off means fixed pacing, whatever the model
+        
+        location = settings.get("click_location", "current")
+        targets = None
+        if location == "targets":
+            path = settings.get("target_path", "none")
+            if path not in PATHS:
+                raise ValueError(f"Unknown movement path: {path}")
+            try:
+                steps = int(settings.get("path_steps", 0))
+            except (TypeError, ValueError):
+                raise ValueError("Path steps must be a whole number")
+            targets = parse_targets(settings.get("targets", ""), path, steps, seed)
+        action = settings.get("action_type", "mouse")
+        keys = None
+        text = settings.get("type_text", "")
+        if action == "keyboard" and text:
+            # Keyboard mode types the text instead of repeating one key
+            action = "type"
+            keys = KeySequence.parse(text, repeat=bool(settings.get("type_loop", False)))
+        fields = dict(
+            action=action,
+            button=settings.get("mouse_button", "left"),
+            key=settings.get("keyboard_key", "enter"),
+            keys=keys,
+            location=location,
+            position=position if location == "fixed" else None,
+            targets=targets,
+            interval=1.0 / cps,
+            jitter=0.2 if randomize else 0.0,
+            jitter_model=jitter_model,
+            jitter_seed=seed,
+            jitter_sequence=parse_sequence(settings.get("jitter_sequence", "")),
+            missed_ticks=settings.get("missed_ticks", "skip"),
+            burst=bool(settings.get("burst", True)),
+            **limits_from_settings(settings)
+        )
+        fields.update(overrides)
+        return cls(**fields)
+
+    @property
+    def cps(self):
+        return 1.0 / self.interval
+
+    @property
+    def randomized(self):
+        return self.jitter > 0 or self.jitter_model == "sequence"
+
+    def make_intervals(self, background=True):
+        """JitterSchedule for this plan, or None for fixed pacing"""
+        if not self.randomized:
+            return None
+        return JitterSchedule(
+            self.interval, self.jitter_model, self.jitter, seed=self.jitter_seed,
+            min_interval=self.min_interval, max_interval=self.max_interval,
+            sequence=self.jitter_sequence, background=background
+        )
+
+class ClickEngine:
+    """Runs a RunPlan on a background thread; the GUI and CLI are both clients"""
+    def __init__(self, backend="auto"):
+        self.backend_spec = backend
+        self.backend = None
+        self.plan = None
+        self.error = None
+        self.count = 0
+        self.scheduler = None
+        self.burst = None
+        self.metrics = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.stop_requested = None
+        self.halt_latency = None
+        self.started_at = None
+        self.stopped_at = None
+        self.plan_updates = queue.SimpleQueue()
+
+    @property
+    def running(self):
+        return self.thread is not None and not self.stop_event.is_set()
+
+    def is_alive(self):
+        """True until the worker has finished its last action"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, plan, on_done=None):
+        """Start a run; any previous run is stopped and joined first
+        
+        on_done(engine) is called from the worker thread once the run has ended.
+        """
+        self.stop()
+        self.join()
+        if self.backend is None:
+            self.backend = make_backend(self.backend_spec)
+        
+        # Drop edits that were applied to the previous run
+        while not self.plan_updates.empty():
+            self.plan_updates.get()
+        
+        self.plan = plan
+        self.error = None
+        self.count = 0
+        self.scheduler = DeadlineScheduler(plan.interval, plan.missed_ticks)
+        self.burst = None
+        self.metrics = RunMetrics(plan.cps, self.scheduler)
+        self.stop_requested = None
+        self.halt_latency = None
+        self.started_at = time.time()
+        self.stopped_at = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self.action_loop, args=(plan, self.stop_event, on_done), daemon=True
+        )
+        self.thread.start()
+
+    def stop(self, requested_at=None):
+        """Signal the worker to halt; safe from any thread, including input hooks
+        
+        requested_at (perf_counter) is when the user asked, e.g. the hotkey
+        press, and is the start of the measured halt latency.
+        """
+        if self.stop_requested is None and not self.stop_event.is_set():
+            self.stop_requested = requested_at or time.perf_counter()
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def apply(self, plan):
+        """Swap a running plan for a new one atomically between actions"""
+        if not self.running:
+            return
+        self.plan = plan
+        self.plan_updates.put(plan)
+
+    def run(self, plan, duration=None):
+        """Blocking run for duration seconds (or until interrupted)"""
+        self.start(plan)
+        return self.wait(duration)
+
+    def wait(self, duration=None):
+        """Block until the run ends or duration elapses, then stop it"""
+        try:
+            if duration is None:
+                while self.is_alive():
+                    self.thread.join(0.5)
+            else:
+                self.stop_event.wait(duration)
+        finally:
+            self.stop()
+            self.join()
+        return self.stats()
+
+    def stats(self):
+        """Snapshot of the current or last run"""
+        scheduler = self.scheduler
+        started = scheduler is not None and scheduler.start_time is not None
+        return {
+            "actions": self.count,
+            "elapsed": scheduler.elapsed() if started else 0.0,
+            "target_rate": scheduler.requested_rate() if scheduler else 0.0,
+            "achieved_rate": scheduler.achieved_rate() if started else 0.0,
+            "missed_ticks": scheduler.missed if scheduler else 0,
+            "burst": self.burst.size if self.burst else 1,
+            "halt_latency_ms": self.halt_latency * 1000 if self.halt_latency is not None else None,
+        }
+
+    def interval_source(self, plan):
+        """Callable yielding successive delays: batched jitter or the fixed interval"""
+        intervals = plan.make_intervals()
+        if intervals is None:
+            return None, itertools.repeat(plan.interval).__next__
+        return intervals, intervals.next
+
+    def action_loop(self, plan, stop_event, on_done=None):
+        """Main action loop with advanced features"""
+        scheduler = self.scheduler
+        updates = self.plan_updates
+        stopped = stop_event.is_set
+        backend = self.backend
+        metrics = self.metrics
+        record = metrics.record
+        perf_counter = time.perf_counter
+        intervals = None
+        burst = BurstController(plan.interval, plan.max_burst if plan.burst else 1)
+        self.burst = burst
+        count = 1
+        typing = False
+        limits = None
+        
+        try:
+            backend.open(plan)
+            intervals, next_delay = self.interval_source(plan)
+            cursor = action_cursor(plan, backend)
+            typing = plan.action == "type"
+            fire = cursor.fire if cursor else backend.fire
+            start = None
+            if plan.start_at is not None:
+                # Armed: the first deadline is the start time, spun out like any other
+                start = wait_for_clock(plan.start_at, stop_event)
+                if start is not None:
+                    self.started_at = max(plan.start_at, self.started_at)
+            scheduler.start(start)
+            limits = RunLimits.for_plan(plan, scheduler.start_time, intervals)
+            if limits:
+                count = limits.clamp(count, 0, scheduler.deadline)
+                if not count:
+                    stop_event.set()
+            while not stopped():
+                deadline = scheduler.deadline
+                missed = scheduler.missed
+                woke = scheduler.wait(stop_event, count)
+                if stopped():
+                    break
+                if not updates.empty():
+                    plan = updates.get()
+                    scheduler.retune(plan.interval, plan.missed_ticks)
+                    if intervals:
+                        intervals.close()
+                    intervals, next_delay = self.interval_source(plan)
+                    backend.open(plan)
+                    burst = BurstController(plan.interval, plan.max_burst if plan.burst else 1)
+                    self.burst = burst
+                    count = 1
+                    if typing:
+                        cursor.close()
+                    cursor = action_cursor(plan, backend)
+                    typing = plan.action == "type"
+                    fire = cursor.fire if cursor else backend.fire
+                    metrics.target_rate = plan.cps
+                    limits = RunLimits.for_plan(plan, scheduler.start_time, intervals)
+                    if limits:
+                        count = limits.clamp(count, self.count, deadline)
+                        if not count:
+                            break
+                
+                injecting = perf_counter()
+                fire(count)
+                record(deadline, woke, injecting, perf_counter(), count)
+                self.count += count
+                if count == 1:
+                    scheduler.advance(next_delay())
+                    if cursor:
+                        cursor.walk(scheduler, stop_event)
+                else:
+                    scheduler.advance_burst(count, next_delay)
+                count = burst.update(scheduler.deadline - time.perf_counter(), scheduler.missed - missed)
+                if typing:
+                    # A sequence that does not repeat ends the run once it is typed
+                    count = min(count, cursor.remaining)
+                    if not count:
+                        break
+                if limits:
+                    # Checked before sleeping, so no action past a limit ever fires
+                    count = limits.clamp(count, self.count, scheduler.deadline)
+                    if not count:
+                        if not limits.spent(self.count):
+                            # Out of time: stay up to the end so elapsed covers the whole span
+                            scheduler.sleep_until(limits.end, stop_event)
+                        break
+        except Exception as e:
+            # Surfaced to the front end instead of dying silently on the worker
+            self.error = e
+        finally:
+            scheduler.stop()
+            metrics.stop()
+            if self.stop_requested is not None:
+                # Time from the stop request until no further action can fire
+                self.halt_latency = time.perf_counter() - self.stop_requested
+            self.stopped_at = time.time()
+            stop_event.set()
+            if typing:
+                cursor.close()
+            backend.close()
+            if intervals:
+                intervals.close()
+            if on_done is not None:
+                on_done(self)
@@ -0,0 +1,1023 @@
+import json
+import math
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+from dataclasses import replace
+
+from .engine import ClickEngine, RunPlan
+from .history import HistoryStore
+from .hotkeys import HotkeyListener, format_hotkey, parse_hotkey
+from .settings import DEFAULT_SETTINGS, ProfileStore
+from .targets import PATHS
+
+class ModernButton(tk.Canvas):
+    """Custom modern button with hover effects"""
+    def __init__(self, parent, text, command, width=120, height=40, 
+                 bg_color="#6366f1", hover_color="#4f46e5", text_color="white"):
+        super().__init__(parent, width=width, height=height, 
+                        highlightthickness=0, relief="flat", cursor="hand2")
+        self.command = command
+        self.bg_color = bg_color
+        self.hover_color = hover_color
+        self.text_color = text_color
+        self.text = text
+        self.drawn_size = None
+        self.drawn = None
+        
+        self.draw_button()
+        self.bind("<Enter>", self.on_enter)
+        self.bind("<Leave>", self.on_leave)
+        self.bind("<Button-1>", self.on_click)
+        
+    def draw_button(self, color=None):
+        """Draw the shape once; hover and state changes only recolor it"""
+        color = color or self.bg_color
+        size = (self.winfo_reqwidth(), self.winfo_reqheight())
+        if size != self.drawn_size:
+            self.delete("all")
+            w, h = size
+            radius = 12
+            
+            # Draw rounded rectangle: main rect + 4 corner circles
+            self.create_rectangle(radius, 0, w-radius, h, outline="", tags="shape")
+            self.create_rectangle(0, radius, w, h-radius, outline="", tags="shape")
+            self.create_oval(0, 0, radius*2, radius*2, outline="", tags="shape")
+            self.create_oval(w-radius*2, 0, w, radius*2, outline="", tags="shape")
+            self.create_oval(0, h-radius*2, radius*2, h, outline="", tags="shape")
+            self.create_oval(w-radius*2, h-radius*2, w, h, outline="", tags="shape")
+            
+            self.create_text(w//2, h//2, fill=self.text_color,
+                            font=("Segoe UI", 10, "bold"), tags="label")
+            self.drawn_size = size
+            self.drawn = None
+        if self.drawn != (color, self.text):
+            self.itemconfig("shape", fill=color)
+            self.itemconfig("label", text=self.text)
+            self.drawn = (color, self.text)
+        
+    def on_enter(self, e):
+        self.draw_button(self.hover_color)
+    
+    def on_leave(self, e):
+        self.draw_button(self.bg_color)
+    
+    def on_click(self, e):
+        if self.command:
+            self.command()
+
+class AutoclickerGUI:
+    def __init__(self, root, startup=None):
+        self.startup = startup if startup is not None else {}
+        self.root = root
+        self.root.title("⚡ Ultra Autoclicker Pro")
+        self.root.geometry("700x880")
+        self.root.resizable(False, False)
+        
+        # Settings are loaded before any widget exists, so everything is built once
+        try:
+            self.profiles = ProfileStore()
+        except OSError:
+            self.profiles = None  # No writable config dir: run on defaults
+        settings = self.profiles.get() if self.profiles else dict(DEFAULT_SETTINGS)
+        self.startup["settings"] = time.perf_counter()
+        
+        # Stop clicking before any UI changes to prevent freeze
+        self.clicking = False
+        self.action_type = tk.StringVar(value=settings["action_type"])
+        self.mouse_button = tk.StringVar(value=settings["mouse_button"])
+        self.keyboard_key = tk.StringVar(value=settings["keyboard_key"])
+        self.type_text = tk.StringVar(value=settings["type_text"])
+        self.type_loop = tk.BooleanVar(value=settings["type_loop"])
+        try:
+            self.toggle_chord = parse_hotkey(settings["toggle_hotkey"])
+        except ValueError:
+            self.toggle_chord = parse_hotkey(DEFAULT_SETTINGS["toggle_hotkey"])
+        self.toggle_key_str = tk.StringVar(value=format_hotkey(self.toggle_chord))
+        self.cps_var = tk.StringVar(value=settings["cps"])
+        self.delay_var = tk.StringVar(value=settings["delay"])
+        self.randomize_var = tk.BooleanVar(value=settings["randomize"])
+        self.burst_var = tk.BooleanVar(value=settings["burst"])
+        self.jitter_model = tk.StringVar(value=settings["jitter_model"])
+        self.jitter_seed = tk.StringVar(value=settings["jitter_seed"])
+        self.jitter_sequence = tk.StringVar(value=settings["jitter_sequence"])
+        self.click_location = tk.StringVar(value=settings["click_location"])
+        self.targets_spec = tk.StringVar(value=settings["targets"])
+        self.target_path = tk.StringVar(value=settings["target_path"])
+        self.path_steps = tk.StringVar(value=settings["path_steps"])
+        self.missed_tick_policy = tk.StringVar(value=settings["missed_ticks"])
+        self.stop_after_actions = tk.StringVar(value=settings["stop_after_actions"])
+        self.stop_after_seconds = tk.StringVar(value=settings["stop_after_seconds"])
+        self.start_at = tk.StringVar(value=settings["start_at"])
+        self.stop_at = tk.StringVar(value=settings["stop_at"])
+        self.engine_mode = tk.StringVar(value=settings["engine"])
+        self.engine = ClickEngine()
+        self.stats_refresh_hz = tk.StringVar(value=settings["stats_refresh_hz"])
+        self.stats_job = None
+        self.last_stats = None
+        self.start_time = None
+        self.hotkeys = HotkeyListener()
+        self.history = None
+        self.recorded_start = None
+        self.today = None
+        self.profile_name = tk.StringVar(value="")
+        self.applying_profile = False
+        self.built_options = set()
+        
+        # Premium color scheme - Modern gradient dark theme
+        self.bg_gradient_start = "#0f0c29"
+        self.bg_gradient_end = "#302b63"
+        self.card_bg = "#1a1a2e"
+        self.accent_primary = "#6366f1"
+        self.accent_secondary = "#8b5cf6"
+        self.success_color = "#10b981"
+        self.danger_color = "#ef4444"
+        self.text_primary = "#ffffff"
+        self.text_secondary = "#a0a0a0"
+        
+        self.root.configure(bg=self.bg_gradient_start)
+        self.setup_ui()
+        self.refresh_profiles()
+        self.watch_settings()
+        self.startup["built"] = time.perf_counter()
+        
+        # The listener (and with it pynput) starts once the window is up
+        self.root.after_idle(self.finish_startup)
+        
+    def setup_ui(self):
+        # Header with gradient effect
+        header = tk.Frame(self.root, bg=self.bg_gradient_start, height=80)
+        header.pack(fill="x", padx=0, pady=0)
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(
+            header,
+            text="⚡ ULTRA AUTOCLICKER PRO",
+            font=("Segoe UI", 24, "bold"),
+            bg=self.bg_gradient_start,
+            fg=self.accent_primary
+        )
+        title_label.pack(pady=20)
+        
+        subtitle = tk.Label(
+            header,
+            text="Professional Automation Tool",
+            font=("Segoe UI", 10),
+            bg=self.bg_gradient_start,
+            fg=self.text_secondary
+        )
+        subtitle.pack()
+        
+        # Main container with scroll
+        main_container = tk.Frame(self.root, bg=self.bg_gradient_start)
+        main_container.pack(fill="both", expand=True, padx=15, pady=10)
+        
+        # Action Type Card
+        self.create_card(main_container, "Action Type", 0)
+        type_frame = tk.Frame(self.cards[0], bg=self.card_bg)
+        type_frame.pack(pady=10)
+        
+        mouse_btn = ModernButton(
+            type_frame, "🖱️ Mouse", 
+            lambda: self.set_action_type("mouse"),
+            width=140, height=45, bg_color=self.accent_primary
+        )
+        mouse_btn.pack(side="left", padx=10)
+        
+        keyboard_btn = ModernButton(
+            type_frame, "⌨️ Keyboard",
+            lambda: self.set_action_type("keyboard"),
+            width=140, height=45, bg_color=self.accent_secondary
+        )
+        keyboard_btn.pack(side="left", padx=10)
+        
+        # Mouse and keyboard options; only the visible one is filled in (update_ui_state)
+        self.mouse_card = self.create_card(main_container, "Mouse Settings", 1)
+        self.keyboard_card = self.create_card(main_container, "Keyboard Settings", 2)
+        
+        # Advanced Settings Card
+        self.create_card(main_container, "Advanced Settings", 3)
+        self.setup_advanced_settings()
+        
+        # Statistics Card
+        self.stats_card = self.create_card(main_container, "Statistics", 4)
+        self.setup_statistics()
+        
+        # Control Panel
+        self.create_control_panel(main_container)
+        
+        self.update_ui_state()
+        
+    def create_card(self, parent, title, index):
+        """Create a modern card container"""
+        if not hasattr(self, 'cards'):
+            self.cards = []
+        
+        card = tk.Frame(parent, bg=self.card_bg, relief="flat", bd=0)
+        card.pack(fill="x", pady=8)
+        
+        # Card header
+        header = tk.Frame(card, bg=self.card_bg, height=35)
+        header.pack(fill="x", padx=15, pady=(15, 5))
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(
+            header,
+            text=title,
+            font=("Segoe UI", 12, "bold"),
+            bg=self.card_bg,
+            fg=self.text_primary,
+            anchor="w"
+        )
+        title_label.pack(side="left")
+        
+        # Content frame
+        content = tk.Frame(card, bg=self.card_bg)
+        content.pack(fill="x", padx=15, pady=(0, 15))
+        
+        if len(self.cards) <= index:
+            self.cards.append(content)
+        else:
+            self.cards[index] = content
+            
+        return content
+    
+    def setup_mouse_options(self):
+        """Setup mouse-specific options"""
+        mouse_frame = self.mouse_card
+        
+        # Button selection
+        btn_frame = tk.Frame(mouse_frame, bg=self.card_bg)
+        btn_frame.pack(fill="x", pady=5)
+        
+        tk.Label(btn_frame, text="Button:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary).pack(side="left", padx=5)
+        
+        for text, value in [("Left", "left"), ("Right", "right"), ("Middle", "middle")]:
+            rb = tk.Radiobutton(
+                btn_frame, text=text, variable=self.mouse_button, value=value,
+                font=("Segoe UI", 9), bg=self.card_bg, fg=self.text_primary,
+                selectcolor=self.accent_primary, activebackground=self.card_bg,
+                activeforeground=self.text_primary
+            )
+            rb.pack(side="left", padx=15)
+        
+        # Click location
+        loc_frame = tk.Frame(mouse_frame, bg=self.card_bg)
+        loc_frame.pack(fill="x", pady=5)
+        
+        tk.Label(loc_frame, text="Location:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary).pack(side="left", padx=5)
+        
+        for text, value in [("Current", "current"), ("Fixed", "fixed"), ("Targets", "targets")]:
+            rb = tk.Radiobutton(
+                loc_frame, text=text, variable=self.click_location, value=value,
+                font=("Segoe UI", 9), bg=self.card_bg, fg=self.text_primary,
+                selectcolor=self.accent_primary, activebackground=self.card_bg,
+                activeforeground=self.text_primary
+            )
+            rb.pack(side="left", padx=15)
+        
+        # Multi-target sequence: points, "grid L,T R,B CxR" or "region L,T R,B xN"
+        targets_frame = tk.Frame(mouse_frame, bg=self.card_bg)
+        targets_frame.pack(fill="x", pady=5)
+        
+        tk.Label(targets_frame, text="Targets:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary).pack(side="left", padx=5)
+        
+        tk.Entry(targets_frame, textvariable=self.targets_spec,
+                font=("Segoe UI", 10), width=26, relief="flat", bd=2).pack(side="left", padx=5)
+        
+        ttk.Combobox(
+            targets_frame, textvariable=self.target_path, values=list(PATHS),
+            state="readonly", width=7, font=("Segoe UI", 9)
+        ).pack(side="left", padx=5)
+        
+        tk.Label(targets_frame, text="Steps:", font=("Segoe UI", 9),
+                bg=self.card_bg, fg=self.text_secondary).pack(side="left", padx=(5, 2))
+        
+        tk.Entry(targets_frame, textvariable=self.path_steps,
+                font=("Segoe UI", 10), width=4, relief="flat", bd=2).pack(side="left")
+    
+    def setup_keyboard_options(self):
+        """Setup keyboard-specific options"""
+        kb_frame = self.keyboard_card
+        
+        key_frame = tk.Frame(kb_frame, bg=self.card_bg)
+        key_frame.pack(fill="x", pady=5)
+        
+        tk.Label(key_frame, text="Key:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary).pack(side="left", padx=5)
+        
+        keys = ["enter", "space", "tab", "backspace", "a", "b", "c", "d", "e", "f", 
+                "g", "h", "i", "j", "k", "l", "m", "n", "o", "p", "q", "r", "s", 
+                "t", "u", "v", "w", "x", "y", "z", "0", "1", "2", "3", "4", "5", 
+                "6", "7", "8", "9", "up", "down", "left", "right"]
+        
+        self.key_combo = ttk.Combobox(
+            key_frame, textvariable=self.keyboard_key, values=keys,
+            state="readonly", width=18, font=("Segoe UI", 10)
+        )
+        self.key_combo.pack(side="left", padx=10)
+        
+        # Text typing replaces the repeated key while the field is not empty
+        text_frame = tk.Frame(kb_frame, bg=self.card_bg)
+        text_frame.pack(fill="x", pady=5)
+        
+        tk.Label(text_frame, text="Type:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary).pack(side="left", padx=5)
+        
+        text_entry = tk.Entry(text_frame, textvariable=self.type_text,
+                             font=("Segoe UI", 10), width=32, relief="flat", bd=2)
+        text_entry.pack(side="left", padx=10)
+        
+        loop_cb = tk.Checkbutton(
+            text_frame, text="Loop",
+            variable=self.type_loop, font=("Segoe UI", 9),
+            bg=self.card_bg, fg=self.text_primary,
+            selectcolor=self.accent_primary, activebackground=self.card_bg,
+            activeforeground=self.text_primary
+        )
+        loop_cb.pack(side="left", padx=5)
+        
+        tk.Label(kb_frame, text="e.g. hello{enter} or {ctrl+a}{delete}; {{ types a brace",
+                font=("Segoe UI", 8), bg=self.card_bg,
+                fg=self.text_secondary).pack(anchor="w", padx=5)
+    
+    def setup_advanced_settings(self):
+        """Setup advanced configuration"""
+        adv_frame = self.cards[3]
+        
+        # Profiles
+        profile_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        profile_frame.pack(fill="x", pady=8)
+        
+        tk.Label(profile_frame, text="Profile:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        self.profile_combo = ttk.Combobox(
+            profile_frame, textvariable=self.profile_name,
+            state="readonly", width=16, font=("Segoe UI", 9)
+        )
+        self.profile_combo.pack(side="left", padx=5)
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda e: self.select_profile(self.profile_name.get()))
+        
+        new_btn = ModernButton(
+            profile_frame, "New", self.new_profile,
+            width=60, height=30, bg_color=self.accent_secondary
+        )
+        new_btn.pack(side="left", padx=5)
+        
+        delete_btn = ModernButton(
+            profile_frame, "Delete", self.delete_profile,
+            width=60, height=30, bg_color=self.danger_color, hover_color="#dc2626"
+        )
+        delete_btn.pack(side="left", padx=5)
+        
+        # CPS/APS Control
+        cps_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        cps_frame.pack(fill="x", pady=8)
+        
+        tk.Label(cps_frame, text="Speed (CPS/APS):", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        cps_entry = tk.Entry(cps_frame, textvariable=self.cps_var, 
+                            font=("Segoe UI", 10), width=10, relief="flat", bd=2)
+        cps_entry.pack(side="left", padx=5)
+        
+        tk.Label(cps_frame, text="(1-10000)", font=("Segoe UI", 9),
+                bg=self.card_bg, fg=self.text_secondary).pack(side="left", padx=5)
+        
+        burst_cb = tk.Checkbutton(
+            cps_frame, text="Adaptive Burst",
+            variable=self.burst_var, font=("Segoe UI", 9),
+            bg=self.card_bg, fg=self.text_primary,
+            selectcolor=self.accent_primary, activebackground=self.card_bg,
+            activeforeground=self.text_primary
+        )
+        burst_cb.pack(side="left", padx=10)
+        
+        # Delay Control
+        delay_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        delay_frame.pack(fill="x", pady=8)
+        
+        tk.Label(delay_frame, text="Delay (seconds):", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        delay_entry = tk.Entry(delay_frame, textvariable=self.delay_var,
+                              font=("Segoe UI", 10), width=10, relief="flat", bd=2)
+        delay_entry.pack(side="left", padx=5)
+        
+        # Randomization
+        rand_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        rand_frame.pack(fill="x", pady=8)
+        
+        cb = tk.Checkbutton(
+            rand_frame, text="Human-like Randomization (±20%)",
+            variable=self.randomize_var, font=("Segoe UI", 10),
+            bg=self.card_bg, fg=self.text_primary,
+            selectcolor=self.accent_primary, activebackground=self.card_bg,
+            activeforeground=self.text_primary
+        )
+        cb.pack(side="left")
+        
+        jitter_combo = ttk.Combobox(
+            rand_frame, textvariable=self.jitter_model,
+            values=["uniform", "gaussian", "lognormal", "sequence"],
+            state="readonly", width=10, font=("Segoe UI", 9)
+        )
+        jitter_combo.pack(side="left", padx=10)
+        
+        tk.Label(rand_frame, text="Seed:", font=("Segoe UI", 9),
+                bg=self.card_bg, fg=self.text_secondary).pack(side="left")
+        
+        seed_entry = tk.Entry(rand_frame, textvariable=self.jitter_seed,
+                             font=("Segoe UI", 9), width=8, relief="flat", bd=2)
+        seed_entry.pack(side="left", padx=5)
+        
+        tk.Label(rand_frame, text="Sequence (s):", font=("Segoe UI", 9),
+                bg=self.card_bg, fg=self.text_secondary).pack(side="left")
+        
+        sequence_entry = tk.Entry(rand_frame, textvariable=self.jitter_sequence,
+                                  font=("Segoe UI", 9), width=14, relief="flat", bd=2)
+        sequence_entry.pack(side="left", padx=5)
+        
+        # Missed tick policy
+        policy_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        policy_frame.pack(fill="x", pady=8)
+        
+        tk.Label(policy_frame, text="Missed Ticks:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        for text, value in [("Skip", "skip"), ("Catch Up", "catchup")]:
+            rb = tk.Radiobutton(
+                policy_frame, text=text, variable=self.missed_tick_policy, value=value,
+                font=("Segoe UI", 9), bg=self.card_bg, fg=self.text_primary,
+                selectcolor=self.accent_primary, activebackground=self.card_bg,
+                activeforeground=self.text_primary
+            )
+            rb.pack(side="left", padx=15)
+        
+        apply_btn = ModernButton(
+            policy_frame, "Apply", self.apply_changes,
+            width=80, height=30, bg_color=self.accent_secondary
+        )
+        apply_btn.pack(side="right", padx=5)
+        
+        # Run limits; blank entries mean no limit
+        limits_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        limits_frame.pack(fill="x", pady=8)
+        
+        tk.Label(limits_frame, text="Stop After:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        for variable, width, unit in [(self.stop_after_actions, 7, "actions"),
+                                      (self.stop_after_seconds, 6, "s")]:
+            entry = tk.Entry(limits_frame, textvariable=variable,
+                            font=("Segoe UI", 9), width=width, relief="flat", bd=2)
+            entry.pack(side="left", padx=(5, 2))
+            tk.Label(limits_frame, text=unit, font=("Segoe UI", 9),
+                    bg=self.card_bg, fg=self.text_secondary).pack(side="left", padx=(0, 8))
+        
+        for label, variable in [("From:", self.start_at), ("Until:", self.stop_at)]:
+            tk.Label(limits_frame, text=label, font=("Segoe UI", 9),
+                    bg=self.card_bg, fg=self.text_secondary).pack(side="left", padx=(5, 0))
+            entry = tk.Entry(limits_frame, textvariable=variable,
+                            font=("Segoe UI", 9), width=8, relief="flat", bd=2)
+            entry.pack(side="left", padx=5)
+        
+        # Statistics refresh rate
+        refresh_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        refresh_frame.pack(fill="x", pady=8)
+        
+        tk.Label(refresh_frame, text="Stats Refresh (Hz):", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        refresh_entry = tk.Entry(refresh_frame, textvariable=self.stats_refresh_hz,
+                                font=("Segoe UI", 10), width=10, relief="flat", bd=2)
+        refresh_entry.pack(side="left", padx=5)
+        
+        tk.Label(refresh_frame, text="(1-60)", font=("Segoe UI", 9),
+                bg=self.card_bg, fg=self.text_secondary).pack(side="left", padx=5)
+        
+        process_cb = tk.Checkbutton(
+            refresh_frame, text="Isolated Engine Process",
+            variable=self.engine_mode, onvalue="process", offvalue="thread",
+            command=self.ensure_engine, font=("Segoe UI", 9),
+            bg=self.card_bg, fg=self.text_primary,
+            selectcolor=self.accent_primary, activebackground=self.card_bg,
+            activeforeground=self.text_primary
+        )
+        process_cb.pack(side="left", padx=10)
+        
+        # Hotkey Capture
+        hotkey_frame = tk.Frame(adv_frame, bg=self.card_bg)
+        hotkey_frame.pack(fill="x", pady=8)
+        
+        tk.Label(hotkey_frame, text="Toggle Hotkey:", font=("Segoe UI", 10),
+                bg=self.card_bg, fg=self.text_primary, width=18, anchor="w").pack(side="left")
+        
+        self.hotkey_label = tk.Label(
+            hotkey_frame, text=self.toggle_key_str.get(), font=("Segoe UI", 10, "bold"),
+            bg=self.accent_primary, fg="white", width=8, relief="flat"
+        )
+        self.hotkey_label.pack(side="left", padx=5)
+        
+        capture_btn = ModernButton(
+            hotkey_frame, "Capture", self.capture_hotkey,
+            width=80, height=30, bg_color=self.accent_secondary
+        )
+        capture_btn.pack(side="left", padx=5)
+    
+    def setup_statistics(self):
+        """Setup statistics display"""
+        stats_frame = self.stats_card
+        
+        self.stats_text = tk.Text(
+            stats_frame, height=4, font=("Consolas", 10),
+            bg="#0a0a0a", fg=self.success_color, relief="flat",
+            wrap="word", state="disabled"
+        )
+        self.stats_text.pack(fill="x", pady=5)
+        
+        self.update_statistics()
+    
+    def create_control_panel(self, parent):
+        """Create main control panel"""
+        control_frame = tk.Frame(parent, bg=self.bg_gradient_start)
+        control_frame.pack(fill="x", pady=15)
+        
+        # Status indicator
+        status_container = tk.Frame(control_frame, bg=self.bg_gradient_start)
+        status_container.pack(pady=10)
+        
+        self.status_indicator = tk.Canvas(
+            status_container, width=20, height=20,
+            highlightthickness=0, bg=self.bg_gradient_start
+        )
+        self.status_indicator.pack(side="left", padx=10)
+        self.status_indicator.create_oval(5, 5, 15, 15, fill=self.danger_color, outline="")
+        
+        self.status_label = tk.Label(
+            status_container, text="STOPPED",
+            font=("Segoe UI", 14, "bold"), bg=self.bg_gradient_start,
+            fg=self.danger_color
+        )
+        self.status_label.pack(side="left")
+        
+        # Main toggle button
+        self.toggle_btn = ModernButton(
+            control_frame, "▶ START",
+            self.toggle_clicking, width=200, height=50,
+            bg_color=self.success_color, hover_color="#059669"
+        )
+        self.toggle_btn.pack(pady=10)
+        
+        # Info text
+        self.info_label = tk.Label(
+            control_frame,
+            text=f"Press {self.toggle_key_str.get()} to toggle | ESC to exit",
+            font=("Segoe UI", 9), bg=self.bg_gradient_start,
+            fg=self.text_secondary
+        )
+        self.info_label.pack(pady=5)
+    
+    def set_action_type(self, action_type):
+        """Safely switch action type - stops clicking first"""
+        if self.clicking:
+            self.toggle_clicking()  # Stop first
+        
+        self.action_type.set(action_type)
+        self.update_ui_state()
+    
+    def update_ui_state(self):
+        """Show the options of the current action type, building them on first use"""
+        action = self.action_type.get()
+        if action not in self.built_options:
+            self.built_options.add(action)
+            if action == "mouse":
+                self.setup_mouse_options()
+            else:
+                self.setup_keyboard_options()
+        if action == "mouse":
+            self.mouse_card.pack(fill="x", pady=8)
+            self.keyboard_card.pack_forget()
+        else:
+            self.mouse_card.pack_forget()
+            self.keyboard_card.pack(fill="x", pady=8)
+    
+    def capture_hotkey(self):
+        """Capture a new hotkey (with modifiers) through the shared listener"""
+        self.hotkey_label.config(text="Press keys...", bg=self.danger_color)
+        self.hotkeys.capture(lambda chord: self.root.after(0, lambda: self.set_hotkey(chord)))
+    
+    def bind_toggle_hotkey(self, chord):
+        self.hotkeys.unbind(self.toggle_chord)
+        self.toggle_chord = self.hotkeys.bind(chord, self.on_toggle_hotkey)
+        self.toggle_key_str.set(format_hotkey(chord))
+        self.hotkey_label.config(text=self.toggle_key_str.get(), bg=self.accent_primary)
+        self.info_label.config(text=f"Press {self.toggle_key_str.get()} to toggle | ESC to exit")
+    
+    def set_hotkey(self, chord):
+        """Set the captured hotkey"""
+        self.bind_toggle_hotkey(chord)
+        self.save_settings()
+    
+    def collect_settings(self):
+        """Current Tk settings as a plain dict"""
+        return {
+            "action_type": self.action_type.get(),
+            "mouse_button": self.mouse_button.get(),
+            "keyboard_key": self.keyboard_key.get(),
+            "type_text": self.type_text.get(),
+            "type_loop": self.type_loop.get(),
+            "cps": self.cps_var.get(),
+            "delay": self.delay_var.get(),
+            "randomize": self.randomize_var.get(),
+            "burst": self.burst_var.get(),
+            "click_location": self.click_location.get(),
+            "targets": self.targets_spec.get(),
+            "target_path": self.target_path.get(),
+            "path_steps": self.path_steps.get(),
+            "jitter_model": self.jitter_model.get(),
+            "jitter_seed": self.jitter_seed.get(),
+            "jitter_sequence": self.jitter_sequence.get(),
+            "missed_ticks": self.missed_tick_policy.get(),
+            "stop_after_actions": self.stop_after_actions.get(),
+            "stop_after_seconds": self.stop_after_seconds.get(),
+            "start_at": self.start_at.get(),
+            "stop_at": self.stop_at.get(),
+            "stats_refresh_hz": self.stats_refresh_hz.get(),
+            "engine": self.engine_mode.get(),
+            "toggle_hotkey": "+".join(sorted(self.toggle_chord))
+        }
+    
+    def build_run_plan(self, previous=None):
+        """Snapshot the Tk settings into a validated RunPlan (Tk thread only)"""
+        position = None
+        if self.click_location.get() == "fixed":
+            if previous is not None and previous.position is not None:
+                position = previous.position
+            else:
+                from pynput import mouse
+                
+                position = mouse.Controller().position
+        return RunPlan.from_settings(self.collect_settings(), position=position)
+    
+    def apply_changes(self):
+        """Send edited settings to the running loop as one atomic plan swap"""
+        if not self.clicking:
+            return
+        current = self.engine.plan
+        try:
+            plan = self.build_run_plan(previous=current)
+        except ValueError as e:
+            messagebox.showerror("Invalid Settings", str(e))
+            return
+        if plan.action != current.action:
+            plan = replace(plan, action=current.action, keys=current.keys)
+        # The schedule is fixed once armed; "14:00" would now mean tomorrow
+        plan = replace(plan, start_at=current.start_at, stop_at=current.stop_at)
+        self.engine.apply(plan)
+    
+    def toggle_clicking(self):
+        """Toggle clicking on/off"""
+        if not self.clicking:
+            try:
+                plan = self.build_run_plan()
+            except ValueError as e:
+                messagebox.showerror("Invalid Settings", str(e))
+                return
+            
+            try:
+                self.ensure_engine()
+                self.engine.start(plan)
+            except (OSError, RuntimeError) as e:
+                messagebox.showerror("Input Backend Error", str(e))
+                return
+            
+            self.clicking = True
+            self.start_time = time.time()
+            self.schedule_stats_refresh()
+            
+            self.status_indicator.delete("all")
+            self.status_indicator.create_oval(5, 5, 15, 15, fill=self.success_color, outline="")
+            self.status_label.config(text="RUNNING", fg=self.success_color)
+            self.toggle_btn.text = "⏸ STOP"
+            self.toggle_btn.bg_color = self.danger_color
+            self.toggle_btn.hover_color = "#dc2626"
+            self.toggle_btn.draw_button(self.danger_color)
+        else:
+            self.clicking = False
+            self.engine.stop()
+            self.status_indicator.delete("all")
+            self.status_indicator.create_oval(5, 5, 15, 15, fill=self.danger_color, outline="")
+            self.status_label.config(text="STOPPED", fg=self.danger_color)
+            self.toggle_btn.text = "▶ START"
+            self.toggle_btn.bg_color = self.success_color
+            self.toggle_btn.hover_color = "#059669"
+            self.toggle_btn.draw_button(self.success_color)
+            self.finalize_statistics()
+    
+    def get_stats_refresh_ms(self):
+        """Interval between statistics redraws from the refresh rate setting"""
+        try:
+            hz = float(self.stats_refresh_hz.get())
+        except ValueError:
+            hz = 20.0
+        if math.isnan(hz):
+            hz = 20.0
+        return int(1000 / min(max(hz, 1.0), 60.0))
+    
+    def cancel_stats_refresh(self):
+        if self.stats_job is not None:
+            self.root.after_cancel(self.stats_job)
+            self.stats_job = None
+    
+    def schedule_stats_refresh(self):
+        """Redraw statistics periodically while running, independent of the click rate"""
+        self.cancel_stats_refresh()
+        if not self.clicking:
+            return
+        if not self.engine.running:
+            self.toggle_clicking()  # The engine stopped on its own
+            return
+        self.update_statistics()
+        self.stats_job = self.root.after(self.get_stats_refresh_ms(), self.schedule_stats_refresh)
+    
+    def finalize_statistics(self):
+        """Show the exact final count once the worker has finished its last action"""
+        self.cancel_stats_refresh()
+        if self.engine.is_alive():
+            self.stats_job = self.root.after(10, self.finalize_statistics)
+            return
+        self.record_history()
+        self.update_statistics()
+        if self.engine.error is not None:
+            messagebox.showerror("Autoclicker Error", str(self.engine.error))
+            self.engine.error = None
+    
+    def record_history(self):
+        """Append the finished run to the session history, once per run"""
+        started = self.engine.started_at
+        if started is None or started == self.recorded_start:
+            return
+        self.recorded_start = started
+        try:
+            if self.history is None:
+                self.history = HistoryStore()
+            self.history.record_engine(self.engine)
+            self.today = self.history.day()
+        except RuntimeError:
+            pass  # History is a convenience; never block stopping on it
+    
+    def update_statistics(self):
+        """Update statistics display"""
+        count = self.engine.count
+        plan = self.engine.plan
+        if self.clicking and plan.start_at is not None and time.time() < plan.start_at:
+            starts = time.strftime("%H:%M:%S", time.localtime(plan.start_at))
+            stats = f"Scheduled: starts at {starts} (in {plan.start_at - time.time():.0f}s)"
+        elif self.start_time and self.clicking:
+            elapsed = time.time() - max(self.start_time, plan.start_at or 0)
+            cps = count / elapsed if elapsed > 0 else 0
+            stats = f"Actions: {count:,} | Time: {elapsed:.1f}s | Rate: {cps:.1f} CPS/APS"
+            stats += self.format_pacing_stats()
+        elif count > 0:
+            stats = f"Last Session: {count:,} actions"
+            if self.today is not None:
+                stats += f" | Today: {self.today['actions']:,} in {self.today['runs']:,} runs"
+            stats += self.format_pacing_stats()
+        else:
+            stats = "Ready to start..."
+        
+        if stats == self.last_stats:
+            return
+        self.last_stats = stats
+        
+        self.stats_text.config(state="normal")
+        self.stats_text.delete("1.0", "end")
+        self.stats_text.insert("1.0", stats)
+        self.stats_text.config(state="disabled")
+    
+    def format_pacing_stats(self):
+        """Requested vs achieved rate from the deadline scheduler"""
+        if self.engine.plan is None:
+            return ""
+        engine_stats = self.engine.stats()
+        stats = (f"\nTarget: {engine_stats['target_rate']:.1f} | "
+                 f"Achieved: {engine_stats['achieved_rate']:.1f} | "
+                 f"Missed ticks: {engine_stats['missed_ticks']:,}")
+        if engine_stats["burst"] > 1:
+            stats += f" | Burst: {engine_stats['burst']}"
+        metrics = self.engine.metrics
+        if metrics is not None and metrics.wakeups:
+            stats += (f"\nInjection p99: {metrics.injection.percentile(0.99) * 1e6:.1f} us | "
+                      f"Oversleep p99: {metrics.oversleep.percentile(0.99) * 1e6:.1f} us")
+        if engine_stats["halt_latency_ms"] is not None:
+            stats += f"\nPress-to-halt: {engine_stats['halt_latency_ms']:.2f} ms"
+        return stats
+    
+    def on_toggle_hotkey(self, pressed_at):
+        """Runs on the listener thread: stop the engine here, the Tk update can wait"""
+        if self.engine.running:
+            self.engine.stop(requested_at=pressed_at)
+        self.root.after(0, self.toggle_clicking)
+    
+    def on_escape(self, pressed_at):
+        self.engine.stop(requested_at=pressed_at)
+        self.root.after(0, self.on_closing)
+    
+    def finish_startup(self):
+        """First idle moment after the window is drawn: the UI is interactive"""
+        self.startup["interactive"] = time.perf_counter()
+        reporting = self.startup.get("report")
+        if reporting:
+            from .startup import loaded_modules, startup_report
+            
+            self.startup.update(heavy_modules=loaded_modules(), modules=len(sys.modules))
+        self.start_keyboard_listener()
+        self.startup["hotkeys"] = time.perf_counter()
+        if reporting:
+            print(json.dumps(startup_report(self.startup)), flush=True)
+            self.on_closing()
+            return
+        # Load what the first start needs (backend, jitter) off the Tk thread
+        threading.Thread(target=warm_up, daemon=True).start()
+        self.ensure_engine()
+    
+    def ensure_engine(self):
+        """Swap the engine to match the isolation setting; the next start uses it
+        
+        The process engine's worker is spawned here rather than on the first
+        start, so starting does not wait for a new interpreter.
+        """
+        if self.clicking:
+            return
+        isolated = self.engine_mode.get() == "process"
+        if isolated == isinstance(self.engine, ClickEngine):
+            self.record_history()
+            self.close_engine()
+            if isolated:
+                from .isolated import ProcessClickEngine
+                
+                self.engine = ProcessClickEngine()
+            else:
+                self.engine = ClickEngine()
+        if isolated:
+            self.engine.start_worker()
+    
+    def close_engine(self):
+        self.engine.stop()
+        self.engine.join()
+        if not isinstance(self.engine, ClickEngine):
+            self.engine.close()
+    
+    def start_keyboard_listener(self):
+        """Start the shared listener behind every hotkey and the capture button"""
+        self.hotkeys.bind(self.toggle_chord, self.on_toggle_hotkey)
+        self.hotkeys.bind("esc", self.on_escape)
+        try:
+            self.hotkeys.start()
+        except ImportError:
+            pass  # pynput cannot load without a display server; the buttons still work
+    
+    def watch_settings(self):
+        """Save the active profile whenever a setting changes (writes are debounced)"""
+        for var in (self.action_type, self.mouse_button, self.keyboard_key, self.type_text,
+                    self.type_loop, self.cps_var, self.delay_var, self.randomize_var,
+                    self.burst_var, self.click_location, self.targets_spec, self.target_path,
+                    self.path_steps, self.jitter_model, self.jitter_seed, self.jitter_sequence,
+                    self.missed_tick_policy, self.stop_after_actions, self.stop_after_seconds,
+                    self.start_at, self.stop_at, self.stats_refresh_hz, self.engine_mode):
+            var.trace_add("write", lambda *args: self.save_settings())
+    
+    def save_settings(self):
+        """Store the current settings in the active profile"""
+        if self.profiles is None or self.applying_profile:
+            return
+        try:
+            self.profiles.save(self.collect_settings())
+        except ValueError:
+            pass  # Half-typed values are not saved until they are valid again
+    
+    def apply_settings(self, settings):
+        """Copy a validated settings dict into the Tk variables"""
+        self.applying_profile = True
+        try:
+            self.action_type.set(settings["action_type"])
+            self.mouse_button.set(settings["mouse_button"])
+            self.keyboard_key.set(settings["keyboard_key"])
+            self.type_text.set(settings["type_text"])
+            self.type_loop.set(settings["type_loop"])
+            self.cps_var.set(settings["cps"])
+            self.delay_var.set(settings["delay"])
+            self.randomize_var.set(settings["randomize"])
+            self.burst_var.set(settings["burst"])
+            self.click_location.set(settings["click_location"])
+            self.targets_spec.set(settings["targets"])
+            self.target_path.set(settings["target_path"])
+            self.path_steps.set(settings["path_steps"])
+            self.jitter_model.set(settings["jitter_model"])
+            self.jitter_seed.set(settings["jitter_seed"])
+            self.jitter_sequence.set(settings["jitter_sequence"])
+            self.missed_tick_policy.set(settings["missed_ticks"])
+            self.stop_after_actions.set(settings["stop_after_actions"])
+            self.stop_after_seconds.set(settings["stop_after_seconds"])
+            self.start_at.set(settings["start_at"])
+            self.stop_at.set(settings["stop_at"])
+            self.stats_refresh_hz.set(settings["stats_refresh_hz"])
+            self.engine_mode.set(settings["engine"])
+            try:
+                self.bind_toggle_hotkey(parse_hotkey(settings["toggle_hotkey"]))
+            except ValueError:
+                pass
+        finally:
+            self.applying_profile = False
+        self.update_ui_state()
+    
+    def refresh_profiles(self):
+        if self.profiles is None:
+            self.profile_combo.config(values=[], state="disabled")
+            return
+        self.profile_combo.config(values=self.profiles.names())
+        self.profile_name.set(self.profiles.active)
+    
+    def select_profile(self, name):
+        """Switch profiles from the cached snapshot; a running session picks it up at once"""
+        try:
+            settings = self.profiles.activate(name)
+        except ValueError as e:
+            messagebox.showerror("Profile Error", str(e))
+            return
+        self.apply_settings(settings)
+        self.refresh_profiles()
+        if self.clicking:
+            self.apply_changes()
+    
+    def new_profile(self):
+        """Create a profile from the current settings and switch to it"""
+        if self.profiles is None:
+            return
+        name = simpledialog.askstring("New Profile", "Profile name:", parent=self.root)
+        if not name:
+            return
+        try:
+            self.profiles.create(name.strip(), self.collect_settings())
+        except ValueError as e:
+            messagebox.showerror("Profile Error", str(e))
+            return
+        self.refresh_profiles()
+    
+    def delete_profile(self):
+        if self.profiles is None:
+            return
+        name = self.profiles.active
+        if not messagebox.askyesno("Delete Profile", f"Delete profile '{name}'?"):
+            return
+        try:
+            self.profiles.delete(name)
+        except ValueError as e:
+            messagebox.showerror("Profile Error", str(e))
+            return
+        self.select_profile(self.profiles.active)
+    
+    def on_closing(self):
+        """Handle window closing"""
+        self.clicking = False
+        self.engine.stop()
+        self.engine.join()
+        self.record_history()
+        self.close_engine()
+        if self.history is not None:
+            self.history.close()
+        self.save_settings()
+        if self.profiles is not None:
+            try:
+                self.profiles.close()
+            except OSError:
+                pass
+        try:
+            self.hotkeys.stop()
+        except:
+            pass
+        self.root.destroy()
+
+def warm_up():
+    """Import the input and jitter libraries the first run needs"""
+    from .backends import import_xlib
+    from .jitter import import_numpy
+    
+    import_xlib()
+    import_numpy()
+
+def main(report_startup=False):
+    """Run the GUI; report_startup prints startup timings as JSON once interactive and exits"""
+    startup = {"main": time.perf_counter(), "report": report_startup}
+    root = tk.Tk()
+    startup["tk"] = time.perf_counter()
+    app = AutoclickerGUI(root, startup)
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.mainloop()
@@ -0,0 +1,230 @@
+import json
+import os
+import time
+
+from .settings import config_dir
+
+sqlite3 = None  # Imported by the first HistoryStore, after the GUI is up
+
+HISTORY_FILE = "history.db"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    stopped REAL NOT NULL,
+    day TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    target_rate REAL NOT NULL,
+    achieved_rate REAL NOT NULL,
+    actions INTEGER NOT NULL,
+    missed_ticks INTEGER NOT NULL,
+    interval_p50_us REAL,
+    interval_p99_us REAL,
+    injection_p99_us REAL,
+    oversleep_p99_us REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    actions INTEGER NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rate_bests (
+    target_rate REAL PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    best_rate REAL NOT NULL,
+    best_run INTEGER NOT NULL
+);
+"""
+
+ADD_DAILY = """
+INSERT INTO daily_totals (day, runs, actions, seconds) VALUES (?, 1, ?, ?)
+ON CONFLICT (day) DO UPDATE SET
+    runs = runs + 1, actions = actions + excluded.actions, seconds = seconds + excluded.seconds
+"""
+
+ADD_RATE = """
+INSERT INTO rate_bests (target_rate, runs, best_rate, best_run) VALUES (?, 1, ?, ?)
+ON CONFLICT (target_rate) DO UPDATE SET
+    runs = runs + 1,
+    best_run = CASE WHEN excluded.best_rate > best_rate THEN excluded.best_run ELSE best_run END,
+    best_rate = max(best_rate, excluded.best_rate)
+"""
+
+COLUMNS = ("started", "stopped", "day", "plan", "target_rate", "achieved_rate", "actions",
+           "missed_ticks", "interval_p50_us", "interval_p99_us", "injection_p99_us",
+           "oversleep_p99_us", "error")
+
+def plan_summary(plan):
+    """The parts of a RunPlan worth keeping with a run, as a plain dict"""
+    summary = {
+        "action": plan.action,
+        "cps": plan.cps,
+        "location": plan.location,
+        "jitter": plan.jitter,
+        "jitter_model": plan.jitter_model,
+        "missed_ticks": plan.missed_ticks,
+        "burst": plan.burst,
+    }
+    if plan.action == "mouse":
+        summary["button"] = plan.button
+    elif plan.action == "type":
+        summary["keys"] = len(plan.keys)
+        summary["repeat"] = plan.keys.repeat
+    else:
+        summary["key"] = plan.key
+    return summary
+
+def default_history_path():
+    """history.db in the per-user config directory, next to the settings profiles"""
+    return os.path.join(config_dir(), HISTORY_FILE)
+
+def rate_key(rate):
+    # Target rates come from 1 / interval, so round away the float noise
+    return float(f"{rate:.6g}")
+
+class HistoryStore:
+    """Append-only SQLite log of finished runs with incrementally kept rollups
+
+    Each run is one row in `runs`; the per-day totals and the best achieved
+    rate per target are updated in the same transaction, so the summary
+    queries read a handful of rows however long the history grows. The
+    database runs in WAL mode so a reader never blocks the writer.
+    """
+    def __init__(self, path=None):
+        global sqlite3
+        import sqlite3
+
+        path = path or default_history_path()
+        self.path = path
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+        except (OSError, sqlite3.Error) as e:
+            raise RuntimeError(f"Cannot open history {path}: {e}")
+        try:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            with self.db:
+                self.db.executescript(SCHEMA)
+                version = self.db.execute("PRAGMA user_version").fetchone()[0]
+                if version < SCHEMA_VERSION:
+                    self.rebuild_rollups()
+                    self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.Error as e:
+            self.db.close()
+            raise RuntimeError(f"Cannot open history {path}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def record(self, run):
+        """Append one run (a dict with the COLUMNS keys, day optional); returns its id"""
+        run = dict(run)
+        run.setdefault("day", time.strftime("%Y-%m-%d", time.localtime(run["started"])))
+        run["target_rate"] = rate_key(run["target_rate"])
+        if not isinstance(run["plan"], str):
+            run["plan"] = json.dumps(run["plan"], sort_keys=True)
+        values = [run.get(column) for column in COLUMNS]
+        try:
+            with self.db:
+                cursor = self.db.execute(
+                    f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    values
+                )
+                self.add_to_rollups(cursor.lastrowid, run)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Cannot write history {self.path}: {e}")
+        return cursor.lastrowid
+
+    def record_engine(self, engine):
+        """Append the engine's last run; runs that never fired are not recorded"""
+        if engine.plan is None or engine.started_at is None or not engine.count:
+            return None
+        stats = engine.stats()
+        run = dict(
+            started=engine.started_at,
+            stopped=engine.stopped_at or time.time(),
+            plan=plan_summary(engine.plan),
+            target_rate=stats["target_rate"],
+            achieved_rate=stats["achieved_rate"],
+            actions=stats["actions"],
+            missed_ticks=stats["missed_ticks"],
+            error=str(engine.error) if engine.error is not None else None,
+        )
+        if engine.metrics is not None:
+            snapshot = engine.metrics.snapshot()
+            run.update(
+                interval_p50_us=snapshot["interval"]["p50_us"],
+                interval_p99_us=snapshot["interval"]["p99_us"],
+                injection_p99_us=snapshot["injection"]["p99_us"],
+                oversleep_p99_us=snapshot["oversleep"]["p99_us"],
+            )
+        return self.record(run)
+
+    def add_to_rollups(self, run_id, run):
+        self.db.execute(ADD_DAILY, (run["day"], run["actions"], run["stopped"] - run["started"]))
+        self.db.execute(ADD_RATE, (run["target_rate"], run["achieved_rate"], run_id))
+
+    def rebuild_rollups(self):
+        """Recompute both rollup tables from the run log"""
+        with self.db:
+            self.db.execute("DELETE FROM daily_totals")
+            self.db.execute("DELETE FROM rate_bests")
+            rows = self.db.execute(
+                "SELECT id, day, actions, started, stopped, target_rate, achieved_rate FROM runs ORDER BY id"
+            )
+            for run_id, day, actions, started, stopped, target_rate, achieved_rate in rows.fetchall():
+                self.add_to_rollups(run_id, dict(
+                    day=day, actions=actions, started=started, stopped=stopped,
+                    target_rate=target_rate, achieved_rate=achieved_rate
+                ))
+
+    def daily(self, days=None):
+        """Per-day totals, newest first: dicts with day, runs, actions and seconds"""
+        query = "SELECT day, runs, actions, seconds FROM daily_totals ORDER BY day DESC"
+        if days is not None:
+            query += f" LIMIT {int(days)}"
+        return [dict(day=day, runs=runs, actions=actions, seconds=seconds)
+                for day, runs, actions, seconds in self.db.execute(query)]
+
+    def day(self, day=None):
+        """Totals for one day (default: today), zeros if nothing ran"""
+        day = day or time.strftime("%Y-%m-%d")
+        row = self.db.execute(
+            "SELECT runs, actions, seconds FROM daily_totals WHERE day = ?", (day,)
+        ).fetchone()
+        runs, actions, seconds = row or (0, 0, 0.0)
+        return dict(day=day, runs=runs, actions=actions, seconds=seconds)
+
+    def best_rates(self):
+        """Best achieved rate per target rate, fastest target first"""
+        return [dict(target_rate=target, runs=runs, best_rate=best, best_run=run_id)
+                for target, runs, best, run_id in self.db.execute(
+                    "SELECT target_rate, runs, best_rate, best_run FROM rate_bests "
+                    "ORDER BY target_rate DESC")]
+
+    def recent(self, limit=20):
+        """The latest runs, newest first, as dicts with the plan decoded"""
+        cursor = self.db.execute(
+            f"SELECT id, {', '.join(COLUMNS)} FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        runs = []
+        for row in cursor:
+            run = dict(zip(("id",) + COLUMNS, row))
+            run["plan"] = json.loads(run["plan"])
+            runs.append(run)
+        return runs
+
+    def count(self):
+        return self.db.execute("SELECT count(*) FROM runs").fetchone()[0]
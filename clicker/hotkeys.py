@@ -0,0 +1,111 @@
+import threading
+import time
+
+from .macro import key_to_name
+
+MODIFIERS = ("ctrl", "shift", "alt", "cmd")
+ALIASES = {
+    "ctrl_l": "ctrl", "ctrl_r": "ctrl", "control": "ctrl",
+    "shift_l": "shift", "shift_r": "shift",
+    "alt_l": "alt", "alt_r": "alt", "alt_gr": "alt",
+    "cmd_l": "cmd", "cmd_r": "cmd", "super": "cmd", "win": "cmd",
+    "escape": "esc", "return": "enter",
+}
+
+def parse_hotkey(spec):
+    """Chord from a spec such as "f6" or "ctrl+shift+s": a frozenset of key names"""
+    names = [ALIASES.get(part, part) for part in
+             (p.strip().lower() for p in spec.split("+")) if part]
+    keys = [name for name in names if name not in MODIFIERS]
+    if len(keys) != 1:
+        raise ValueError(f"Hotkey needs exactly one non-modifier key: {spec!r}")
+    return frozenset(names)
+
+def format_hotkey(chord):
+    """Display form of a chord, modifiers first: CTRL+SHIFT+S"""
+    modifiers = [m for m in MODIFIERS if m in chord]
+    keys = sorted(name for name in chord if name not in MODIFIERS)
+    return "+".join(modifiers + keys).upper()
+
+class HotkeyListener:
+    """One shared keyboard listener dispatching chords from a hotkey table
+
+    Callbacks run directly on the listener thread and receive the press time
+    (perf_counter), so anything that must react fast, like stopping the
+    engine, should do so there and leave UI updates to its own thread. A
+    chord is the held modifiers plus the key just pressed; other held keys
+    are ignored, so a lost release event cannot wedge the table.
+    """
+    def __init__(self):
+        self.table = {}
+        self.pressed = set()
+        self.capture_callback = None
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def bind(self, spec, callback):
+        chord = spec if isinstance(spec, frozenset) else parse_hotkey(spec)
+        with self.lock:
+            self.table[chord] = callback
+        return chord
+
+    def unbind(self, spec):
+        chord = spec if isinstance(spec, frozenset) else parse_hotkey(spec)
+        with self.lock:
+            self.table.pop(chord, None)
+
+    def capture(self, callback):
+        """Deliver the next chord to callback(chord) instead of the table, once"""
+        self.capture_callback = callback
+
+    def cancel_capture(self):
+        self.capture_callback = None
+
+    def start(self):
+        if self.listener is not None:
+            return
+        from pynput import keyboard
+
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.pressed.clear()
+
+    def key_name(self, key):
+        listener = self.listener
+        if listener is not None and hasattr(listener, "canonical"):
+            # Strips modifier side and shift/ctrl effects on characters
+            key = listener.canonical(key)
+        name = key_to_name(key).lower()
+        return ALIASES.get(name, name)
+
+    def on_press(self, key):
+        pressed_at = time.perf_counter()
+        name = self.key_name(key)
+        self.pressed.add(name)
+        if name in MODIFIERS:
+            return
+        chord = frozenset([m for m in MODIFIERS if m in self.pressed] + [name])
+
+        capture = self.capture_callback
+        if capture is not None:
+            self.capture_callback = None
+            callback, argument = capture, chord
+        else:
+            with self.lock:
+                callback = self.table.get(chord)
+            if callback is None:
+                return
+            argument = pressed_at
+        try:
+            callback(argument)
+        except Exception:
+            # A failing callback must not take the shared listener down
+            pass
+
+    def on_release(self, key):
+        self.pressed.discard(self.key_name(key))
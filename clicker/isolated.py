@@ -0,0 +1,298 @@
+import ctypes
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+
+from .backends import RecordingBackend
+from .engine import ClickEngine
+
+WORKER_SWITCH_INTERVAL = 0.0005
+
+class Counters(ctypes.Structure):
+    _fields_ = [
+        ("seq", ctypes.c_uint64),
+        ("actions", ctypes.c_uint64),
+        ("missed_ticks", ctypes.c_uint64),
+        ("burst", ctypes.c_uint64),
+        ("elapsed", ctypes.c_double),
+        ("target_rate", ctypes.c_double),
+        ("achieved_rate", ctypes.c_double),
+    ]
+
+class SharedStats:
+    """Live run counters in a shared memory block
+
+    The worker process publishes, the front end reads with no IPC. A
+    sequence number guards each update (seqlock): it is odd while a write is
+    in progress, and a reader retries until it sees the same even value
+    before and after copying the fields.
+    """
+    FIELDS = ("actions", "missed_ticks", "burst", "elapsed", "target_rate", "achieved_rate")
+
+    def __init__(self, block):
+        self.block = block
+
+    def publish(self, stats):
+        block = self.block
+        block.seq += 1
+        block.actions = stats["actions"]
+        block.missed_ticks = stats["missed_ticks"]
+        block.burst = stats["burst"]
+        block.elapsed = stats["elapsed"]
+        block.target_rate = stats["target_rate"]
+        block.achieved_rate = stats["achieved_rate"]
+        block.seq += 1
+
+    def read(self):
+        block = self.block
+        while True:
+            seq = block.seq
+            if seq & 1:
+                continue
+            values = {name: getattr(block, name) for name in self.FIELDS}
+            if block.seq == seq:
+                return values
+
+def run_result(engine):
+    """What the front end needs once a run has ended, sent back over the pipe"""
+    backend = engine.backend
+    return {
+        "stats": engine.stats(),
+        "error": engine.error,
+        "metrics": engine.metrics,
+        "started_at": engine.started_at,
+        "stopped_at": engine.stopped_at,
+        "halt_latency": engine.halt_latency,
+        # Measurement runs hand their recording back for analysis
+        "backend": backend if isinstance(backend, RecordingBackend) else None,
+    }
+
+def worker_main(conn, block, backend, publish_interval):
+    """Child process: run plans on a ClickEngine as commands arrive on conn"""
+    # Ctrl+C reaches the whole process group; the front end decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # The engine thread spins near deadlines; hand the GIL to this thread
+    # quickly when a stop arrives instead of after the default 5 ms
+    sys.setswitchinterval(WORKER_SWITCH_INTERVAL)
+    shared = SharedStats(block)
+    engine = ClickEngine(backend)
+    running = False
+    while True:
+        if running and not engine.is_alive():
+            running = False
+            shared.publish(engine.stats())
+            conn.send(("done", run_result(engine)))
+        try:
+            if not conn.poll(publish_interval if running else None):
+                shared.publish(engine.stats())
+                continue
+            kind, argument = conn.recv()
+        except (EOFError, OSError):
+            kind, argument = "close", None  # The front end went away
+        if kind == "start":
+            try:
+                engine.start(argument)
+            except Exception as e:
+                conn.send(("failed", e))
+                continue
+            running = True
+            shared.publish(engine.stats())
+            conn.send(("started", engine.started_at))
+        elif kind == "stop":
+            engine.stop(requested_at=argument)
+        elif kind == "apply":
+            engine.apply(argument)
+        elif kind == "close":
+            engine.stop()
+            engine.join()
+            if engine.backend is not None:
+                engine.backend.close()
+            return
+
+class ProcessClickEngine:
+    """ClickEngine running in a child process, out of reach of the front end's GIL
+
+    A drop-in for ClickEngine: plans, stop requests and plan swaps go to the
+    worker over a pipe, live counters come back through a SharedStats block
+    that stats() and count read directly, and the final metrics arrive when
+    the run ends. The worker is spawned once (start_worker() can do that
+    early) and keeps its input backend open between runs.
+    """
+    def __init__(self, backend="auto", publish_interval=0.01):
+        self.backend_spec = backend
+        self.backend = backend if isinstance(backend, RecordingBackend) else None
+        self.publish_interval = publish_interval
+        self.plan = None
+        self.error = None
+        self.metrics = None
+        self.started_at = None
+        self.stopped_at = None
+        self.halt_latency = None
+        self.final_stats = None
+        self.process = None
+        self.conn = None
+        self.shared = None
+        self.reader = None
+        self.on_done = None
+        self.send_lock = threading.Lock()
+        self.reply = threading.Event()
+        self.reply_message = None
+        self.done = threading.Event()
+        self.done.set()
+        self.stop_sent = False
+
+    @property
+    def running(self):
+        return not self.done.is_set() and not self.stop_sent
+
+    @property
+    def count(self):
+        return self.shared.read()["actions"] if self.shared else 0
+
+    def is_alive(self):
+        return not self.done.is_set()
+
+    def start_worker(self):
+        """Spawn the worker process if it is not running yet"""
+        if self.process is not None and self.process.is_alive():
+            return
+        # spawn, not fork: the GUI process has Tk and listener threads
+        context = multiprocessing.get_context("spawn")
+        block = context.RawValue(Counters)
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=worker_main, name="clicker-engine", daemon=True,
+            args=(child_conn, block, self.backend_spec, self.publish_interval)
+        )
+        self.process.start()
+        child_conn.close()
+        self.shared = SharedStats(block)
+        self.reader = threading.Thread(target=self.read_loop, args=(self.conn,), daemon=True)
+        self.reader.start()
+
+    def send(self, message):
+        with self.send_lock:
+            self.conn.send(message)
+
+    def read_loop(self, conn):
+        while True:
+            try:
+                kind, argument = conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "done":
+                self.finish(argument)
+            else:
+                self.reply_message = (kind, argument)
+                self.reply.set()
+        # The worker exited or was closed; release anyone still waiting on it
+        if not self.done.is_set():
+            self.finish({"error": RuntimeError("The engine process exited unexpectedly")})
+        self.reply_message = ("failed", RuntimeError("The engine process is not running"))
+        self.reply.set()
+
+    def finish(self, result):
+        self.error = result.get("error")
+        self.metrics = result.get("metrics")
+        self.final_stats = result.get("stats")
+        # A scheduled run starts after the worker has replied "started"
+        self.started_at = result.get("started_at") or self.started_at
+        self.stopped_at = result.get("stopped_at") or time.time()
+        self.halt_latency = result.get("halt_latency")
+        if result.get("backend") is not None:
+            self.backend = result["backend"]
+        on_done, self.on_done = self.on_done, None
+        self.done.set()
+        if on_done is not None:
+            on_done(self)
+
+    def start(self, plan, on_done=None):
+        """Start a run in the worker; raises the worker's error if it cannot start"""
+        self.stop()
+        self.join()
+        self.start_worker()
+        self.plan = plan
+        self.error = None
+        self.metrics = None
+        self.final_stats = None
+        self.halt_latency = None
+        self.stopped_at = None
+        self.stop_sent = False
+        self.on_done = on_done
+        self.reply.clear()
+        self.done.clear()
+        try:
+            self.send(("start", plan))
+        except (OSError, ValueError) as e:
+            self.done.set()
+            raise RuntimeError(f"The engine process is not running: {e}")
+        self.reply.wait()
+        kind, argument = self.reply_message
+        if kind != "started":
+            self.on_done = None
+            self.done.set()
+            raise argument
+        self.started_at = argument
+
+    def stop(self, requested_at=None):
+        """Ask the worker to halt; safe from any thread
+
+        requested_at is a perf_counter() value, which is a system-wide
+        monotonic clock, so the worker can measure the halt latency from it.
+        """
+        if self.done.is_set() or self.stop_sent:
+            return
+        self.stop_sent = True
+        try:
+            self.send(("stop", requested_at or time.perf_counter()))
+        except (OSError, ValueError):
+            pass
+
+    def join(self, timeout=None):
+        self.done.wait(timeout)
+
+    def apply(self, plan):
+        if not self.running:
+            return
+        self.plan = plan
+        self.send(("apply", plan))
+
+    def run(self, plan, duration=None):
+        self.start(plan)
+        return self.wait(duration)
+
+    def wait(self, duration=None):
+        try:
+            self.done.wait(duration)
+        finally:
+            self.stop()
+            self.join()
+        return self.stats()
+
+    def stats(self):
+        if self.final_stats is not None:
+            return self.final_stats
+        stats = dict(self.shared.read()) if self.shared else {
+            "actions": 0, "missed_ticks": 0, "burst": 1,
+            "elapsed": 0.0, "target_rate": 0.0, "achieved_rate": 0.0,
+        }
+        stats["halt_latency_ms"] = None
+        return stats
+
+    def close(self):
+        """Stop any run and shut the worker process down"""
+        self.stop()
+        self.join(1.0)
+        if self.process is None:
+            return
+        try:
+            self.send(("close", None))
+        except (OSError, ValueError):
+            pass
+        self.process.join(2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.process = None
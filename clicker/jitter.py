@@ -0,0 +1,142 @@
+import itertools
+import random
+import threading
+from array import array
+
+# NumPy is imported by the first randomized schedule, not with the package
+numpy = None
+
+def import_numpy():
+    """Load numpy into this module; returns False if it is not installed"""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+    return True
+
+def parse_sequence(value):
+    """Intervals in seconds from "0.05, 0.08, 0.12": None when blank"""
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        sequence = tuple(float(v) for v in text.replace(";", ",").split(","))
+    except ValueError:
+        raise ValueError("Jitter sequence must be comma-separated seconds, e.g. 0.05, 0.08")
+    if not all(0 < v < float("inf") for v in sequence):
+        raise ValueError("Jitter sequence intervals must be greater than zero")
+    return sequence
+
+class JitterSchedule:
+    """Jittered intervals served from pre-generated batches refilled in the background
+    
+    Each batch is an array('d') drawn in one vectorized call (NumPy when available,
+    the random module otherwise), so taking the next interval is an index lookup.
+    With a seed the sequence is reproducible for a given backend.
+    """
+    MODELS = ("uniform", "gaussian", "lognormal", "sequence")
+
+    def __init__(self, base, model="uniform", spread=0.2, seed=None, min_interval=None,
+                 max_interval=None, sequence=None, batch_size=4096, background=True,
+                 use_numpy=None):
+        if model not in self.MODELS:
+            raise ValueError(f"Unknown jitter model: {model}")
+        if model == "sequence" and not sequence:
+            raise ValueError("Sequence jitter requires at least one interval")
+        self.base = base
+        self.model = model
+        self.spread = spread
+        self.min_interval = max(0.0001, base * 0.1) if min_interval is None else min_interval
+        self.max_interval = base * 10 if max_interval is None else max_interval
+        if self.min_interval > self.max_interval:
+            raise ValueError("Minimum interval must not exceed maximum interval")
+        self.batch_size = batch_size
+        self.use_numpy = import_numpy() if use_numpy is None else use_numpy and import_numpy()
+        if self.use_numpy:
+            self.rng = numpy.random.default_rng(seed)
+        else:
+            self.rng = random.Random(seed)
+        if model == "sequence":
+            clamped = [min(max(v, self.min_interval), self.max_interval) for v in sequence]
+            self.sequence = itertools.cycle(clamped)
+        
+        self.batch = self.generate()
+        self.pos = 0
+        self.next_batch = None
+        self.ready = threading.Event()
+        self.wanted = threading.Event()
+        self.closed = False
+        self.filler = None
+        if background:
+            self.filler = threading.Thread(target=self.refill_loop, daemon=True)
+            self.filler.start()
+            self.wanted.set()
+
+    def generate(self):
+        """Draw one batch of clamped intervals"""
+        n, base, spread = self.batch_size, self.base, self.spread
+        lo, hi = self.min_interval, self.max_interval
+        if self.model == "sequence":
+            return array("d", itertools.islice(self.sequence, n))
+        
+        if self.use_numpy:
+            rng = self.rng
+            if self.model == "uniform":
+                values = base * (1.0 + rng.uniform(-spread, spread, n))
+            elif self.model == "gaussian":
+                values = base * (1.0 + rng.normal(0.0, spread, n))
+            else:
+                # Mean-preserving log-normal: E[X] == base
+                values = base * rng.lognormal(-spread * spread / 2, spread, n)
+            numpy.clip(values, lo, hi, out=values)
+            batch = array("d")
+            batch.frombytes(values.astype("d").tobytes())
+            return batch
+        
+        rng = self.rng
+        if self.model == "uniform":
+            draw = lambda: base * (1.0 + rng.uniform(-spread, spread))
+        elif self.model == "gaussian":
+            draw = lambda: base * (1.0 + rng.gauss(0.0, spread))
+        else:
+            mu = -spread * spread / 2
+            draw = lambda: base * rng.lognormvariate(mu, spread)
+        return array("d", [min(max(draw(), lo), hi) for _ in range(n)])
+
+    def refill_loop(self):
+        while True:
+            self.wanted.wait()
+            self.wanted.clear()
+            if self.closed:
+                return
+            self.next_batch = self.generate()
+            self.ready.set()
+
+    def swap(self):
+        if self.filler is None:
+            self.batch = self.generate()
+        else:
+            self.ready.wait()
+            self.ready.clear()
+            self.batch = self.next_batch
+            self.next_batch = None
+            self.wanted.set()
+        self.pos = 0
+
+    def next(self):
+        """Next interval in seconds"""
+        if self.pos >= len(self.batch):
+            self.swap()
+        value = self.batch[self.pos]
+        self.pos += 1
+        return value
+
+    def take(self, count):
+        """The next count intervals as a list (for tests and previews)"""
+        return [self.next() for _ in range(count)]
+
+    def close(self):
+        self.closed = True
+        self.wanted.set()
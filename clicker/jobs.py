@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+
+from .backends import make_backend
+from .engine import RunPlan
+from .keyseq import action_cursor
+from .limits import RunLimits, perf_time
+from .scheduler import BurstController, DeadlineScheduler
+from .settings import DEFAULT_SETTINGS
+
+class Job:
+    """One independently paced action stream driven by a JobScheduler
+
+    Each job keeps its own deadline grid, jitter source, burst controller and
+    backend, so jobs never share pacing state; only the timer thread is shared.
+    """
+    def __init__(self, name, plan, backend="auto", hotkey=None):
+        self.name = name
+        self.plan = plan
+        self.hotkey = hotkey
+        self.backend_spec = backend
+        self.backend = None
+        self.error = None
+        self.count = 0
+        self.scheduler = None
+        self.burst = None
+        self.intervals = None
+        self.next_delay = None
+        self.fire = None
+        self.typer = None
+        self.limits = None
+        self.size = 1
+        self.generation = 0
+        self.running = False
+
+    def open(self):
+        """Prepare the backend and pacing state for a fresh run"""
+        plan = self.plan
+        if self.backend is None:
+            self.backend = make_backend(self.backend_spec)
+        self.backend.open(plan)
+        self.intervals = plan.make_intervals()
+        if self.intervals is None:
+            self.next_delay = itertools.repeat(plan.interval).__next__
+        else:
+            self.next_delay = self.intervals.next
+
+        # Path legs need their own sleeps, which a shared timer cannot give one job
+        cursor = action_cursor(plan, self.backend)
+        self.typer = cursor if plan.action == "type" else None
+        self.fire = cursor.fire if cursor else self.backend.fire
+
+        self.error = None
+        self.count = 0
+        self.size = 1
+        self.burst = BurstController(plan.interval, plan.max_burst if plan.burst else 1)
+        self.scheduler = DeadlineScheduler(plan.interval, plan.missed_ticks)
+        # A scheduled start is simply a first deadline in the future on the timer heap
+        start = None
+        if plan.start_at is not None:
+            start = max(perf_time(plan.start_at), time.perf_counter())
+        self.scheduler.start(start)
+        self.limits = RunLimits.for_plan(plan, self.scheduler.start_time, self.intervals)
+        if self.limits:
+            self.size = self.limits.clamp(1, 0, self.scheduler.deadline)
+        self.generation += 1
+        self.running = True
+        if not self.size:
+            self.close()  # Its stop time has already passed
+
+    def close(self):
+        self.running = False
+        self.generation += 1
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.intervals:
+            self.intervals.close()
+            self.intervals = None
+        if self.typer is not None:
+            self.typer.close()
+            self.typer = None
+        if self.backend is not None:
+            self.backend.close()
+
+    def step(self, now):
+        """Fire the due actions and return the next deadline"""
+        scheduler = self.scheduler
+        missed = scheduler.missed
+        scheduler.catch_up(now, self.size)
+        count = self.size
+        self.fire(count)
+        self.count += count
+        if count == 1:
+            scheduler.advance(self.next_delay())
+        else:
+            scheduler.advance_burst(count, self.next_delay)
+        self.size = self.burst.update(scheduler.deadline - time.perf_counter(), scheduler.missed - missed)
+        if self.typer is not None:
+            self.size = min(self.size, self.typer.remaining)
+        if self.limits:
+            self.size = self.limits.clamp(self.size, self.count, scheduler.deadline)
+        if not self.size:
+            self.close()  # Typed to the end or out of limits; the heap drops its entry
+        return scheduler.deadline
+
+    def stats(self):
+        scheduler = self.scheduler
+        started = scheduler is not None and scheduler.start_time is not None
+        return {
+            "running": self.running,
+            "actions": self.count,
+            "elapsed": scheduler.elapsed() if started else 0.0,
+            "target_rate": self.plan.cps,
+            "achieved_rate": scheduler.achieved_rate() if started else 0.0,
+            "missed_ticks": scheduler.missed if scheduler else 0,
+            "burst": self.burst.size if self.burst else 1,
+            "error": str(self.error) if self.error else None,
+        }
+
+class JobScheduler:
+    """Runs many jobs off a single timer thread and a heap of next deadlines
+
+    The thread sleeps (then spins) until the earliest deadline, steps that
+    job and pushes its next deadline back onto the heap. Starting or stopping
+    a job wakes the thread so it re-reads the heap; stopped jobs leave stale
+    entries behind that are dropped when they surface.
+    """
+    def __init__(self, backend="auto"):
+        self.backend = backend
+        self.jobs = {}
+        self.heap = []
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.timer = DeadlineScheduler(float("inf"))
+        self.thread = None
+        self.closed = False
+
+    def add(self, name, plan, hotkey=None, backend=None, start=False):
+        """Register a job; names are unique"""
+        if name in self.jobs:
+            raise ValueError(f"Duplicate job name: {name}")
+        job = Job(name, plan, self.backend if backend is None else backend, hotkey)
+        self.jobs[name] = job
+        if start:
+            self.start(name)
+        return job
+
+    def remove(self, name):
+        self.stop(name)
+        del self.jobs[name]
+
+    def start(self, name):
+        """Start a job now; backend errors are raised to the caller"""
+        job = self.jobs[name]
+        with self.lock:
+            if job.running:
+                return
+            job.open()
+            self.push(job, job.scheduler.deadline)
+        self.ensure_thread()
+        self.wakeup.set()
+
+    def stop(self, name):
+        job = self.jobs[name]
+        with self.lock:
+            if job.running:
+                job.close()
+        self.wakeup.set()
+
+    def toggle(self, name):
+        if self.jobs[name].running:
+            self.stop(name)
+        else:
+            self.start(name)
+
+    def start_all(self):
+        for name in self.jobs:
+            self.start(name)
+
+    def stop_all(self):
+        for name in self.jobs:
+            self.stop(name)
+
+    def running(self):
+        return [name for name, job in self.jobs.items() if job.running]
+
+    def stats(self):
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    def close(self):
+        """Stop every job and end the timer thread"""
+        self.stop_all()
+        self.closed = True
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def push(self, job, deadline):
+        heapq.heappush(self.heap, (deadline, next(self.sequence), job.generation, job))
+
+    def ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.closed = False
+            self.thread = threading.Thread(target=self.timer_loop, daemon=True)
+            self.thread.start()
+
+    def timer_loop(self):
+        """Single thread that fires every job at its own deadlines"""
+        heap, lock, wakeup = self.heap, self.lock, self.wakeup
+        sleep_until = self.timer.sleep_until
+        while not self.closed:
+            wakeup.clear()
+            with lock:
+                # Drop entries left behind by stopped or restarted jobs
+                while heap and (not heap[0][3].running or heap[0][2] != heap[0][3].generation):
+                    heapq.heappop(heap)
+                deadline = heap[0][0] if heap else None
+            if deadline is None:
+                wakeup.wait()
+                continue
+            now = sleep_until(deadline, wakeup)
+            if now < deadline:
+                continue
+
+            with lock:
+                entry = heap[0] if heap else None
+                if entry is None or entry[0] > now:
+                    continue
+                heapq.heappop(heap)
+                _, _, generation, job = entry
+                if not job.running or generation != job.generation:
+                    continue
+                try:
+                    self.push(job, job.step(now))
+                except Exception as e:
+                    # One failing job must not take the others down
+                    job.close()
+                    job.error = e
+
+def plan_from_entry(entry, base=DEFAULT_SETTINGS):
+    """RunPlan from settings keys over base, plus "interval" in seconds and "position" as [x, y]"""
+    settings = dict(base, **entry)
+    overrides = {}
+    if "interval" in entry:
+        try:
+            overrides["interval"] = float(entry["interval"])
+        except (TypeError, ValueError):
+            raise ValueError("interval must be a number")
+    position = None
+    if entry.get("position"):
+        try:
+            x, y = entry["position"]
+            position = (int(x), int(y))
+        except (TypeError, ValueError):
+            raise ValueError("position must be [x, y]")
+    return RunPlan.from_settings(settings, position=position, **overrides)
+
+def job_from_settings(entry):
+    """(name, plan, hotkey, start) from one job entry of a jobs file
+
+    Entries use the settings keys, plus "name", optional "interval" in
+    seconds (instead of "cps"), "position" as [x, y], "hotkey" and "start".
+    """
+    name = entry.get("name")
+    if not name:
+        raise ValueError("Every job needs a name")
+    try:
+        plan = plan_from_entry(entry)
+    except ValueError as e:
+        raise ValueError(f"Job {name}: {e}")
+    return name, plan, entry.get("hotkey"), bool(entry.get("start", True))
+
+def load_jobs(path):
+    """Job tuples from a JSON file: {"jobs": [{...}, ...]} or a bare list"""
+    with open(path) as f:
+        document = json.load(f)
+    entries = document.get("jobs", []) if isinstance(document, dict) else document
+    return [job_from_settings(entry) for entry in entries]
@@ -0,0 +1,153 @@
+import re
+from array import array
+
+from .backends import MODIFIER_BITS
+from .hotkeys import MODIFIERS, parse_hotkey
+from .targets import target_cursor
+
+# Keys every backend can name, besides single characters
+KEY_NAMES = frozenset([
+    "enter", "space", "tab", "backspace", "delete", "esc", "insert", "home", "end",
+    "page_up", "page_down", "up", "down", "left", "right", "caps_lock", "num_lock",
+    "scroll_lock", "print_screen", "pause", "menu",
+    *MODIFIERS, *(f"f{n}" for n in range(1, 21)),
+])
+CONTROL_KEYS = {"\n": "enter", "\t": "tab", "\b": "backspace", "\x1b": "esc"}
+BRACES = re.compile(r"\{\{|\}\}|\{([^{}]*)\}|[{}]")
+
+def key_for_char(char):
+    """Key name typing a character needs: itself, or the key behind a control character"""
+    if char in CONTROL_KEYS:
+        return CONTROL_KEYS[char]
+    if char < " " or char == "\x7f":
+        raise ValueError(f"Cannot type control character U+{ord(char):04X}")
+    return char
+
+def parse_chord(text):
+    """(key name, modifier mask) from the inside of a {...} escape, e.g. "ctrl+shift+t" """
+    try:
+        chord = parse_hotkey(text)
+    except ValueError:
+        raise ValueError(f"Invalid key {{{text}}}: expected a key with optional modifiers")
+    name = next(name for name in chord if name not in MODIFIERS)
+    if len(name) > 1 and name not in KEY_NAMES:
+        raise ValueError(f"Unknown key: {{{text}}}")
+    mask = 0
+    for modifier in MODIFIERS:
+        if modifier in chord:
+            mask |= MODIFIER_BITS[modifier]
+    return name, mask
+
+class KeySequence:
+    """Key taps laid out in arrays, ready for the action loop
+
+    alphabet lists every distinct key once (a character or a key name such
+    as "enter"); tap i is alphabet[symbols[i]] with the modifier mask
+    mods[i] held, and mods is None when nothing is held explicitly. Text is
+    decoded here, once, and a backend resolves only the alphabet to key
+    codes, so typing a long buffer costs a few array lookups per key.
+    """
+    def __init__(self, alphabet, symbols, mods=None, repeat=False):
+        if not symbols:
+            raise ValueError("Nothing to type")
+        self.alphabet = tuple(alphabet)
+        self.symbols = symbols
+        self.mods = mods
+        self.repeat = repeat
+
+    @classmethod
+    def from_text(cls, text, repeat=False):
+        """Type text literally; newlines and tabs press Enter and Tab"""
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        chars = sorted(set(text))
+        index = {char: i for i, char in enumerate(chars)}
+        symbols = array("B" if len(chars) <= 256 else "I", map(index.__getitem__, text))
+        return cls([key_for_char(char) for char in chars], symbols, repeat=repeat)
+
+    @classmethod
+    def parse(cls, spec, repeat=False):
+        """Text with {key} and {chord} escapes, typed left to right
+
+            "user{tab}secret{enter}"     text and named keys
+            "{ctrl+a}{delete}"           chords hold their modifiers
+            "{{literal}}"                doubled braces type a brace
+        """
+        alphabet = []
+        index = {}
+        symbols = array("I")
+        mods = array("B")
+
+        def add(name, mask=0):
+            if name not in index:
+                index[name] = len(alphabet)
+                alphabet.append(name)
+            symbols.append(index[name])
+            mods.append(mask)
+
+        position = 0
+        for match in BRACES.finditer(spec):
+            for char in spec[position:match.start()]:
+                add(key_for_char(char))
+            token = match.group(0)
+            if token in ("{{", "}}"):
+                add(token[0])
+            elif match.group(1) is None:
+                raise ValueError(f"Unmatched {token!r} at position {match.start()} (type {token * 2} for a brace)")
+            else:
+                add(*parse_chord(match.group(1)))
+            position = match.end()
+        for char in spec[position:]:
+            add(key_for_char(char))
+        return cls(alphabet, symbols, mods if any(mods) else None, repeat)
+
+    def __len__(self):
+        return len(self.symbols)
+
+class KeyTyper:
+    """Types a KeySequence through a backend, one burst per fire()
+
+    Takes the place of a TargetCursor in the action loop. The backend turns
+    the alphabet into (code, implied modifiers) pairs up front and keeps
+    them cached between runs. remaining is how many taps may still fire; a
+    repeating sequence never runs out.
+    """
+    def __init__(self, backend, keys):
+        self.backend = backend
+        self.keys = keys
+        self.codes, self.implied = backend.key_table(keys.alphabet)
+        self.index = 0
+
+    @property
+    def remaining(self):
+        return len(self.keys) if self.keys.repeat else len(self.keys) - self.index
+
+    def fire(self, count=1):
+        keys = self.keys
+        symbols, mods, codes, implied = keys.symbols, keys.mods, self.codes, self.implied
+        end = len(symbols)
+        index = self.index
+        taps = []
+        for _ in range(count):
+            if index == end:
+                if not keys.repeat:
+                    break
+                index = 0
+            symbol = symbols[index]
+            mask = implied[symbol] if mods is None else implied[symbol] | mods[index]
+            taps.append((codes[symbol], mask))
+            index += 1
+        self.index = index
+        self.backend.type_keys(taps)
+
+    def walk(self, scheduler, stop_event):
+        pass  # Nothing moves between keys
+
+    def close(self):
+        """Let go of any modifier still held"""
+        self.backend.release_modifiers()
+
+def action_cursor(plan, backend):
+    """KeyTyper for a typing plan, otherwise the plan's TargetCursor (None to act in place)"""
+    if plan.action == "type":
+        return KeyTyper(backend, plan.keys)
+    return target_cursor(plan, backend)
@@ -0,0 +1,131 @@
+import math
+import time
+from datetime import date, datetime, timedelta
+
+# Re-read the wall clock this long before a scheduled start, in case it was adjusted
+CLOCK_REANCHOR = 1.0
+CLOCK_FORMATS = ("%H:%M", "%H:%M:%S", "%H:%M:%S.%f")
+# Deadlines are sums of intervals; one due this close to the end counts as at the end
+END_SLACK = 1e-6
+
+def parse_count(value):
+    """Action limit from a setting: None when blank, else a whole number above zero"""
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        count = int(text)
+    except ValueError:
+        raise ValueError("Action limit must be a whole number")
+    if count < 1:
+        raise ValueError("Action limit must be at least 1")
+    return count
+
+def parse_seconds(value):
+    """Duration limit in seconds from a setting: None when blank"""
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        seconds = float(text)
+    except ValueError:
+        raise ValueError("Duration limit must be a number of seconds")
+    if not 0 < seconds < math.inf:
+        raise ValueError("Duration limit must be greater than zero")
+    return seconds
+
+def parse_clock(value, after=None):
+    """Wall-clock time (time.time() seconds) from a setting: None when blank
+
+    "14:00", "14:00:00" or "14:00:00.250" mean the next such time of day
+    after `after` (default: now); "2026-10-18 14:00:00" is taken as is.
+    """
+    text = str(value).strip()
+    if not text:
+        return None
+    after = time.time() if after is None else after
+    for pattern in CLOCK_FORMATS:
+        try:
+            clock = datetime.strptime(text, pattern).time()
+        except ValueError:
+            continue
+        day = date.fromtimestamp(after)
+        when = datetime.combine(day, clock).timestamp()
+        if when <= after:
+            when = datetime.combine(day + timedelta(days=1), clock).timestamp()
+        return when
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time {text!r}: expected HH:MM[:SS] or YYYY-MM-DD HH:MM[:SS]")
+
+def limits_from_settings(settings, now=None):
+    """RunPlan limit fields from the limit settings; a stop time is taken after the start time"""
+    start_at = parse_clock(settings.get("start_at", ""), now)
+    return dict(
+        max_actions=parse_count(settings.get("stop_after_actions", "")),
+        max_duration=parse_seconds(settings.get("stop_after_seconds", "")),
+        start_at=start_at,
+        stop_at=parse_clock(settings.get("stop_at", ""), start_at or now),
+    )
+
+def perf_time(when):
+    """perf_counter() value of a wall-clock time, as of now"""
+    return time.perf_counter() + (when - time.time())
+
+def wait_for_clock(when, stop_event):
+    """Sleep towards a wall-clock time and return it on the perf_counter clock
+
+    One coarse wait on the stop event covers all but the last second, then
+    the target is converted again so a clock adjustment during a long wait
+    still lands on time; the caller spins out the rest with its scheduler.
+    Returns None if stop_event was set meanwhile.
+    """
+    while True:
+        remaining = when - time.time()
+        if remaining <= CLOCK_REANCHOR:
+            return max(perf_time(when), time.perf_counter())
+        if stop_event.wait(remaining - CLOCK_REANCHOR):
+            return None
+
+class RunLimits:
+    """Where a run has to end: an action budget and an end deadline
+
+    end is on the perf_counter clock: the earlier of start + max_duration
+    and stop_at, converted from wall-clock time when the limits are made.
+    An action is only fired if its deadline is before end, so a run of
+    max_duration seconds at n CPS fires exactly max_duration * n actions.
+    Bursts are sized by the longest delay between actions, which for a
+    jittered plan is its JitterSchedule's max_interval.
+    """
+    def __init__(self, plan, start, intervals=None):
+        self.max_actions = plan.max_actions
+        self.spacing = plan.interval if intervals is None else intervals.max_interval
+        end = math.inf
+        if plan.max_duration is not None:
+            end = start + plan.max_duration
+        if plan.stop_at is not None:
+            end = min(end, perf_time(plan.stop_at))
+        self.end = end - END_SLACK
+
+    @classmethod
+    def for_plan(cls, plan, start, intervals=None):
+        """RunLimits for a plan with any limit, else None"""
+        if plan.max_actions is None and plan.max_duration is None and plan.stop_at is None:
+            return None
+        return cls(plan, start, intervals)
+
+    def clamp(self, count, done, deadline):
+        """How many of count actions, the first due at deadline, stay within the limits"""
+        if self.max_actions is not None:
+            count = min(count, self.max_actions - done)
+        if deadline >= self.end:
+            return 0
+        if count > 1 and self.end < math.inf:
+            # A burst fires the actions due at deadline, then at most spacing apart
+            count = min(count, math.ceil((self.end - deadline) / self.spacing))
+        return count
+
+    def spent(self, done):
+        """True once the action budget is used up"""
+        return self.max_actions is not None and done >= self.max_actions
@@ -0,0 +1,219 @@
+import threading
+import time
+from array import array
+
+from .backends import make_backend
+from .scheduler import DeadlineScheduler
+
+MOVE = 0
+BUTTON_DOWN = 1
+BUTTON_UP = 2
+SCROLL = 3
+KEY_DOWN = 4
+KEY_UP = 5
+
+KIND_NAMES = ("move", "button_down", "button_up", "scroll", "key_down", "key_up")
+
+MIN_SPEED = 0.1
+MAX_SPEED = 100.0
+
+class EventLog:
+    """Compact, array-backed log of recorded input events
+
+    Each event costs 21 bytes: a float64 offset in seconds from the start of
+    the recording, a uint8 kind and three int32 fields. x/y hold the pointer
+    position (or the scroll deltas for SCROLL) and data indexes the symbol
+    table of button and key names, so repeated names are stored once.
+    """
+    def __init__(self):
+        self.times = array("d")
+        self.kinds = array("B")
+        self.xs = array("i")
+        self.ys = array("i")
+        self.data = array("i")
+        self.symbols = []
+        self.symbol_index = {}
+        self.lock = threading.Lock()
+
+    def symbol(self, name):
+        """Index of name in the symbol table, adding it on first use"""
+        index = self.symbol_index.get(name)
+        if index is None:
+            index = len(self.symbols)
+            self.symbols.append(name)
+            self.symbol_index[name] = index
+        return index
+
+    def append(self, t, kind, x=0, y=0, name=None):
+        with self.lock:
+            self.times.append(t)
+            self.kinds.append(kind)
+            self.xs.append(int(x))
+            self.ys.append(int(y))
+            self.data.append(-1 if name is None else self.symbol(name))
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        """(t, kind, x, y, name) tuples, mainly for tests and converters"""
+        symbols = self.symbols
+        for t, kind, x, y, d in zip(self.times, self.kinds, self.xs, self.ys, self.data):
+            yield t, kind, x, y, symbols[d] if d >= 0 else None
+
+    @property
+    def duration(self):
+        return self.times[-1] if self.times else 0.0
+
+    def nbytes(self):
+        """Memory held by the event arrays"""
+        return sum(a.itemsize * len(a) for a in (self.times, self.kinds, self.xs, self.ys, self.data))
+
+def key_to_name(key):
+    """Stable name for a pynput key: Key member name, character or vk:N"""
+    name = getattr(key, "name", None)
+    if name:
+        return name
+    if getattr(key, "char", None):
+        return key.char
+    return f"vk:{key.vk}"
+
+class MacroRecorder:
+    """Records mouse and keyboard input with pynput listeners into an EventLog"""
+    def __init__(self, record_moves=True, min_move_interval=0.0, ignore_keys=()):
+        self.record_moves = record_moves
+        self.min_move_interval = min_move_interval
+        self.ignore_keys = set(ignore_keys)
+        self.log = EventLog()
+        self.start_time = None
+        self.last_move = -1.0
+        self.listeners = []
+
+    def start(self):
+        from pynput import mouse, keyboard
+
+        self.log = EventLog()
+        self.start_time = time.perf_counter()
+        self.last_move = -1.0
+        self.listeners = [
+            mouse.Listener(on_move=self.on_move, on_click=self.on_click, on_scroll=self.on_scroll),
+            keyboard.Listener(on_press=self.on_press, on_release=self.on_release),
+        ]
+        for listener in self.listeners:
+            listener.start()
+
+    def stop(self):
+        """Stop listening and return the finished log"""
+        for listener in self.listeners:
+            listener.stop()
+        self.listeners = []
+        return self.log
+
+    def now(self):
+        return time.perf_counter() - self.start_time
+
+    def on_move(self, x, y):
+        if not self.record_moves:
+            return
+        t = self.now()
+        if t - self.last_move < self.min_move_interval:
+            return
+        self.last_move = t
+        self.log.append(t, MOVE, x, y)
+
+    def on_click(self, x, y, button, pressed):
+        self.log.append(self.now(), BUTTON_DOWN if pressed else BUTTON_UP, x, y, button.name)
+
+    def on_scroll(self, x, y, dx, dy):
+        self.log.append(self.now(), SCROLL, dx, dy)
+
+    def on_press(self, key):
+        name = key_to_name(key)
+        if name not in self.ignore_keys:
+            self.log.append(self.now(), KEY_DOWN, name=name)
+
+    def on_release(self, key):
+        name = key_to_name(key)
+        if name not in self.ignore_keys:
+            self.log.append(self.now(), KEY_UP, name=name)
+
+def check_speed(speed):
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        raise ValueError(f"Replay speed must be between {MIN_SPEED}x and {MAX_SPEED:g}x")
+    return speed
+
+class MacroPlayer:
+    """Replays an EventLog through a backend on the deadline scheduler
+
+    Event i fires at start + times[i] / speed, an absolute deadline, so long
+    replays do not accumulate drift. When replay falls behind, pointer moves
+    whose successor is also overdue are dropped; clicks and keys never are.
+    """
+    def __init__(self, log, backend="auto", speed=1.0, loops=1):
+        self.log = log
+        self.backend = make_backend(backend)
+        self.speed = check_speed(speed)
+        self.loops = loops
+        self.played = 0
+        self.skipped_moves = 0
+        self.scheduler = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def play(self, stop_event=None):
+        """Blocking replay; returns the number of events injected
+
+        The log only needs duration and iteration over (t, kind, x, y, name),
+        so in-memory EventLogs and memory-mapped macro files both stream.
+        """
+        stop_event = stop_event or self.stop_event
+        stopped = stop_event.is_set
+        backend = self.backend
+        move, button, scroll, key = backend.move, backend.button, backend.scroll, backend.key
+        inv_speed = 1.0 / self.speed
+        scheduler = DeadlineScheduler(float("inf"))
+        self.scheduler = scheduler
+        self.played = self.skipped_moves = 0
+
+        scheduler.start()
+        offset = 0.0
+        for _ in range(self.loops):
+            events = iter(self.log)
+            pending = next(events, None)
+            while pending is not None:
+                t, kind, x, y, name = pending
+                pending = next(events, None)
+                now = scheduler.wait_until(offset + t * inv_speed, stop_event)
+                if stopped():
+                    break
+                if kind == MOVE:
+                    # Coalesce overdue moves: only the latest position matters
+                    if (pending is not None and pending[1] == MOVE
+                            and scheduler.start_time + offset + pending[0] * inv_speed <= now):
+                        self.skipped_moves += 1
+                        continue
+                    move(x, y)
+                elif kind == BUTTON_DOWN or kind == BUTTON_UP:
+                    button(name, kind == BUTTON_DOWN)
+                elif kind == SCROLL:
+                    scroll(x, y)
+                else:
+                    key(name, kind == KEY_DOWN)
+                self.played += 1
+            if stopped():
+                break
+            offset += self.log.duration * inv_speed
+        scheduler.stop()
+        return self.played
+
+    def start(self):
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.play, args=(self.stop_event,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
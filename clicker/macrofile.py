@@ -0,0 +1,256 @@
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_right
+
+from .macro import (
+    BUTTON_DOWN, BUTTON_UP, KEY_DOWN, KEY_UP, KIND_NAMES, MOVE, SCROLL, EventLog,
+)
+
+# File layout (little endian):
+#   header | records | symbol table (UTF-8 JSON list) | index
+# The header is rewritten on close, so a file can be recorded straight to disk.
+MAGIC = b"ACMACRO\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQQdIIQIQ")
+# magic, version, record size, record count, event count, duration,
+# index interval, index count, symbols offset, symbols length, index offset
+
+# dt_us (since previous record), kind, pad, dx, dy, symbol index
+RECORD = struct.Struct("<IBxhhi")
+# record number, absolute time in microseconds, x, y before that record
+INDEX_ENTRY = struct.Struct("<QQii")
+
+# Escape records, never surfaced as events
+ABS_POS = 254   # dx/dy carry an absolute position when a delta overflows int16
+WAIT = 253      # dt-only filler for gaps longer than a uint32 of microseconds
+
+MAX_DT = 0xFFFFFFFF
+INT16 = range(-32768, 32768)
+POSITIONED = (MOVE, BUTTON_DOWN, BUTTON_UP)
+MACRO_EXTENSION = ".acm"
+
+class MacroWriter:
+    """Streams events into the binary macro format
+
+    Timestamps are stored as whole-microsecond deltas and pointer positions as
+    int16 deltas from the previous positioned event, so a record is 14 bytes.
+    Every index_interval records an index entry snapshots the absolute time
+    and position, which lets readers seek without decoding from the start.
+    """
+    def __init__(self, path, index_interval=4096):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(bytes(HEADER.size))
+        self.index_interval = index_interval
+        self.index = []
+        self.symbols = []
+        self.symbol_index = {}
+        self.records = 0
+        self.events = 0
+        self.t_us = 0
+        self.x = 0
+        self.y = 0
+        self.buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def symbol(self, name):
+        index = self.symbol_index.get(name)
+        if index is None:
+            index = len(self.symbols)
+            self.symbols.append(name)
+            self.symbol_index[name] = index
+        return index
+
+    def record(self, dt, kind, dx=0, dy=0, data=-1):
+        if self.records % self.index_interval == 0:
+            self.index.append((self.records, self.t_us, self.x, self.y))
+        self.buffer += RECORD.pack(dt, kind, dx, dy, data)
+        self.records += 1
+        if len(self.buffer) >= 1 << 16:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        
+        # Mirror the reader's running state so index snapshots stay exact
+        self.t_us += dt
+        if kind == ABS_POS:
+            self.x, self.y = dx, dy
+        elif kind in POSITIONED:
+            self.x += dx
+            self.y += dy
+
+    def append(self, t, kind, x=0, y=0, name=None):
+        """Add an event at t seconds from the start of the macro"""
+        dt = max(int(round(t * 1e6)) - self.t_us, 0)
+        while dt > MAX_DT:
+            self.record(MAX_DT, WAIT)
+            dt -= MAX_DT
+
+        if kind in POSITIONED:
+            x, y = int(x), int(y)
+            dx, dy = x - self.x, y - self.y
+            if dx not in INT16 or dy not in INT16:
+                if x not in INT16 or y not in INT16:
+                    raise ValueError(f"Position out of range: {x}, {y}")
+                self.record(dt, ABS_POS, x, y)
+                dt = dx = dy = 0
+            self.record(dt, kind, dx, dy, -1 if name is None else self.symbol(name))
+        elif kind == SCROLL:
+            self.record(dt, kind, int(x), int(y))
+        else:
+            self.record(dt, kind, 0, 0, self.symbol(name))
+        self.events += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write(self.buffer)
+        symbols = json.dumps(self.symbols).encode("utf-8")
+        symbols_offset = self.file.tell()
+        self.file.write(symbols)
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(
+            MAGIC, VERSION, RECORD.size, self.records, self.events, self.t_us / 1e6,
+            self.index_interval, len(self.index), symbols_offset, len(symbols), index_offset
+        ))
+        self.file.close()
+
+class MacroFile:
+    """Read-only, memory-mapped view of a binary macro
+
+    Opening only parses the header, symbol table and index, so even
+    multi-million-event files start instantly; records are decoded lazily
+    while iterating and pages are loaded by the OS on demand.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a macro file")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, record_size, self.records, self.events, self.duration,
+         self.index_interval, index_count, symbols_offset, symbols_length,
+         index_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a macro file")
+        if version > VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Unsupported macro file version {version}")
+
+        self.symbols = json.loads(self.mm[symbols_offset:symbols_offset + symbols_length])
+        self.index = [INDEX_ENTRY.unpack_from(self.mm, index_offset + i * INDEX_ENTRY.size)
+                      for i in range(index_count)]
+        self.index_times = [entry[1] for entry in self.index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.events
+
+    def __iter__(self):
+        return self.iter_from(0.0)
+
+    def iter_from(self, t=0.0):
+        """Decode events from time t (seconds) onwards as (t, kind, x, y, name)"""
+        entry = max(0, bisect_right(self.index_times, int(t * 1e6)) - 1)
+        first, t_us, x, y = self.index[entry] if self.index else (0, 0, 0, 0)
+        start_us = int(t * 1e6)
+        symbols = self.symbols
+        begin = HEADER.size + first * RECORD.size
+        view = memoryview(self.mm)[begin:HEADER.size + self.records * RECORD.size]
+        try:
+            for dt, kind, dx, dy, data in RECORD.iter_unpack(view):
+                t_us += dt
+                if kind == ABS_POS:
+                    x, y = dx, dy
+                    continue
+                if kind == WAIT:
+                    continue
+                if kind in POSITIONED:
+                    x += dx
+                    y += dy
+                    if t_us >= start_us:
+                        yield t_us / 1e6, kind, x, y, symbols[data] if data >= 0 else None
+                elif t_us >= start_us:
+                    if kind == SCROLL:
+                        yield t_us / 1e6, kind, dx, dy, None
+                    else:
+                        yield t_us / 1e6, kind, 0, 0, symbols[data]
+        finally:
+            view.release()
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+def save_macro(events, path):
+    """Write any iterable of (t, kind, x, y, name) to .acm or .json by extension"""
+    if path.lower().endswith(".json"):
+        save_json(events, path)
+        return
+    with MacroWriter(path) as writer:
+        for t, kind, x, y, name in events:
+            writer.append(t, kind, x, y, name)
+
+def load_macro(path):
+    """MacroFile for binary macros, EventLog for JSON ones"""
+    if path.lower().endswith(".json"):
+        return load_json(path)
+    return MacroFile(path)
+
+def save_json(events, path):
+    """Human-readable form: one JSON object per event, with named kinds"""
+    rows = []
+    for t, kind, x, y, name in events:
+        row = {"t": round(t, 6), "kind": KIND_NAMES[kind]}
+        if kind in POSITIONED or kind == SCROLL:
+            row["x"], row["y"] = x, y
+        if name is not None:
+            row["name"] = name
+        rows.append(row)
+    # One event per line keeps large macros readable and diffable
+    with open(path, "w") as f:
+        f.write(f'{{"version": {VERSION}, "events": [\n')
+        f.write(",\n".join(json.dumps(row) for row in rows))
+        f.write("\n]}\n")
+
+def load_json(path):
+    with open(path) as f:
+        document = json.load(f)
+    kinds = {name: code for code, name in enumerate(KIND_NAMES)}
+    log = EventLog()
+    for row in document.get("events", []):
+        try:
+            kind = kinds[row["kind"]]
+        except KeyError:
+            raise ValueError(f"Unknown macro event kind: {row.get('kind')}")
+        if kind in (BUTTON_DOWN, BUTTON_UP, KEY_DOWN, KEY_UP) and "name" not in row:
+            raise ValueError(f"Macro event at {row.get('t')}s is missing its name")
+        log.append(float(row["t"]), kind, row.get("x", 0), row.get("y", 0), row.get("name"))
+    return log
+
+def convert_macro(source, target):
+    """Convert between the binary and JSON forms (direction from the extensions)"""
+    macro = load_macro(source)
+    try:
+        save_macro(macro, target)
+    finally:
+        if isinstance(macro, MacroFile):
+            macro.close()
@@ -0,0 +1,251 @@
+import csv
+import json
+import threading
+import time
+from array import array
+
+# Log-linear buckets: exact below 128 ns, then 128 linear sub-buckets per
+# power of two, so any recorded value is within 1% of its bucket's bounds.
+SUB_BITS = 7
+SUB_BUCKETS = 1 << SUB_BITS
+MAX_SHIFT = 40
+BUCKETS = (MAX_SHIFT + 2) * SUB_BUCKETS
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+def bucket_index(ns):
+    if ns < SUB_BUCKETS:
+        return ns if ns > 0 else 0
+    shift = min(ns.bit_length() - SUB_BITS - 1, MAX_SHIFT)
+    return min((shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS, BUCKETS - 1)
+
+def bucket_bounds(index):
+    """Lowest and highest nanosecond value counted in a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    lower = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return lower, lower + (1 << shift) - 1
+
+class Histogram:
+    """HDR-style histogram of durations with fixed memory and O(1) recording
+
+    Values are seconds, stored as nanosecond counts in log-linear buckets
+    covering 1 ns to about 36 hours at roughly two significant digits.
+    """
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bucket_index(int(seconds * 1e9))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+
+    def reset(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples, in seconds"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    return min(bucket_bounds(index)[1] / 1e9, self.max)
+        return self.max
+
+    def buckets(self):
+        """(lower_s, upper_s, count) for every non-empty bucket"""
+        return [(bucket_bounds(i)[0] / 1e9, bucket_bounds(i)[1] / 1e9, n)
+                for i, n in enumerate(self.counts) if n]
+
+    def summary(self):
+        """Count, mean, extremes and quantiles in microseconds"""
+        to_us = lambda seconds: round(seconds * 1e6, 3)
+        summary = {
+            "count": self.count,
+            "mean_us": to_us(self.mean()),
+            "min_us": to_us(self.min or 0.0),
+            "max_us": to_us(self.max),
+        }
+        for q in QUANTILES:
+            summary[f"p{q * 100:g}_us"] = to_us(self.percentile(q))
+        return summary
+
+class RunMetrics:
+    """Per-run instrumentation recorded by the engine's action loop
+
+    Per wake-up: how late the worker woke relative to its deadline
+    (oversleep), the gap since the previous wake-up and how long the backend
+    call took. The busy fraction (time inside the backend over elapsed time)
+    shows whether a missed target is spent injecting or waking up late.
+    """
+    def __init__(self, target_rate=0.0, scheduler=None):
+        self.target_rate = target_rate
+        self.scheduler = scheduler
+        self.intervals = Histogram()
+        self.injection = Histogram()
+        self.oversleep = Histogram()
+        self.actions = 0
+        self.wakeups = 0
+        self.max_burst = 1
+        self.start_time = time.perf_counter()
+        self.stop_time = None
+        self.last_wake = None
+
+    def record(self, deadline, woke, injecting, injected, count):
+        """One wake-up that fired count actions, timestamps from perf_counter()"""
+        if self.last_wake is not None:
+            self.intervals.record(woke - self.last_wake)
+        self.last_wake = woke
+        self.oversleep.record(woke - deadline if woke > deadline else 0.0)
+        self.injection.record(injected - injecting)
+        self.actions += count
+        self.wakeups += 1
+        if count > self.max_burst:
+            self.max_burst = count
+
+    def stop(self):
+        self.stop_time = time.perf_counter()
+
+    @property
+    def missed_ticks(self):
+        """Ticks the deadline scheduler dropped under its missed-tick policy"""
+        return self.scheduler.missed if self.scheduler is not None else 0
+
+    def elapsed(self):
+        end = self.stop_time if self.stop_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    def snapshot(self):
+        elapsed = self.elapsed()
+        return {
+            "elapsed": elapsed,
+            "actions": self.actions,
+            "wakeups": self.wakeups,
+            "target_rate": self.target_rate,
+            "achieved_rate": self.actions / elapsed if elapsed > 0 else 0.0,
+            "missed_ticks": self.missed_ticks,
+            "max_burst": self.max_burst,
+            "busy_fraction": self.injection.total / elapsed if elapsed > 0 else 0.0,
+            "interval": self.intervals.summary(),
+            "injection": self.injection.summary(),
+            "oversleep": self.oversleep.summary(),
+        }
+
+    def histograms(self):
+        return (("interval", self.intervals), ("injection", self.injection),
+                ("oversleep", self.oversleep))
+
+    def to_prometheus(self, prefix="autoclicker"):
+        """Prometheus text exposition: counters, gauges and one summary per histogram"""
+        snap = self.snapshot()
+        lines = []
+        for name, kind, value in (
+            ("actions_total", "counter", snap["actions"]),
+            ("wakeups_total", "counter", snap["wakeups"]),
+            ("missed_ticks_total", "counter", snap["missed_ticks"]),
+            ("target_rate", "gauge", snap["target_rate"]),
+            ("achieved_rate", "gauge", snap["achieved_rate"]),
+            ("busy_fraction", "gauge", snap["busy_fraction"]),
+            ("max_burst", "gauge", snap["max_burst"]),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {value}")
+        for name, histogram in self.histograms():
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {histogram.percentile(q):.9f}')
+            lines.append(f"{metric}_sum {histogram.total:.9f}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_csv(self, path):
+        """Dump counters, summaries and full bucket distributions as metric,key,value rows"""
+        snap = self.snapshot()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("metric", "key", "value"))
+            for key in ("elapsed", "actions", "wakeups", "target_rate", "achieved_rate",
+                        "missed_ticks", "max_burst", "busy_fraction"):
+                writer.writerow(("run", key, snap[key]))
+            for name, histogram in self.histograms():
+                for key, value in snap[name].items():
+                    writer.writerow((name, key, value))
+                for lower, upper, count in histogram.buckets():
+                    writer.writerow((name, f"bucket_le_us:{upper * 1e6:.3f}", count))
+
+class MetricsServer:
+    """Serves the live metrics of a run on a local HTTP port
+
+    GET /metrics answers in Prometheus text format, /metrics.json as JSON.
+    source() returns the RunMetrics to report, or None before the first run.
+    """
+    def __init__(self, source, host="127.0.0.1", port=9464):
+        # http.server is slow to import and only needed when metrics are served
+        from http.server import ThreadingHTTPServer
+
+        self.source = source
+        self.server = ThreadingHTTPServer((host, port), self.make_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+
+        source = self.source
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                metrics = source()
+                if self.path == "/metrics":
+                    body = metrics.to_prometheus() if metrics else ""
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.snapshot() if metrics else {})
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,119 @@
+import json
+import sys
+import threading
+from collections import Counter
+
+PHASES = ("wait", "inject", "bookkeeping", "other")
+WAIT_FUNCTIONS = ("wait", "sleep_until", "wait_until")
+INJECT_MODULES = ("clicker.backends", "clicker.targets", "pynput", "Xlib", "evdev")
+
+def frame_name(frame):
+    code = frame.f_code
+    # co_qualname (3.11+) keeps Histogram.record and RunMetrics.record apart
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+def split_frame(name):
+    """Module and bare function name of a sampled frame name"""
+    module, _, qualname = name.partition(":")
+    return module, qualname.rsplit(".", 1)[-1]
+
+def phase_of(stack):
+    """Which part of the action loop a sampled stack (outermost first) was in"""
+    frames = [split_frame(name) for name in stack]
+    if any(module == "clicker.scheduler" and function in WAIT_FUNCTIONS for module, function in frames):
+        return "wait"
+    if any(module.startswith(INJECT_MODULES) for module, _ in frames):
+        return "inject"
+    if ("clicker.engine", "action_loop") in frames:
+        return "bookkeeping"
+    return "other"
+
+class StackSampler:
+    """Samples one thread's Python stack from the outside at a fixed interval
+
+    Nothing is added to the sampled thread, so the action loop runs the same
+    code with profiling on or off; the cost is one extra thread briefly
+    taking the GIL per sample. While the scheduler spins it holds the GIL,
+    so at high rates samples arrive about once per sys.getswitchinterval().
+    Stacks are kept collapsed, ready for flamegraph.pl or speedscope.
+    """
+    def __init__(self, thread_ident, interval=0.001):
+        self.thread_ident = thread_ident
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.sample_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def sample_loop(self):
+        ident, stacks = self.thread_ident, self.stacks
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(ident)
+            if frame is None:
+                break  # The sampled thread has exited
+            stack = []
+            while frame is not None:
+                stack.append(frame_name(frame))
+                frame = frame.f_back
+            stack.reverse()
+            stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def phases(self):
+        """Share of samples per phase of the action loop"""
+        counts = Counter()
+        for stack, n in self.stacks.items():
+            counts[phase_of(stack.split(";"))] += n
+        total = sum(counts.values()) or 1
+        return {phase: {"samples": counts[phase], "share": counts[phase] / total}
+                for phase in PHASES}
+
+    def hottest(self, limit=10):
+        """Leaf frames with the most samples"""
+        leaves = Counter()
+        for stack, n in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        return leaves.most_common(limit)
+
+    def write_collapsed(self, path):
+        """Brendan Gregg's collapsed format: frame;frame;frame count"""
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+def profile_report(sampler, engine):
+    """Phase breakdown from the samples next to the engine's exact timings"""
+    stats = engine.stats()
+    metrics = engine.metrics.snapshot() if engine.metrics else {}
+    return {
+        "samples": sampler.samples,
+        "interval_ms": sampler.interval * 1000,
+        "elapsed": stats["elapsed"],
+        "actions": stats["actions"],
+        "achieved_rate": stats["achieved_rate"],
+        "phases": sampler.phases(),
+        "measured_inject_fraction": metrics.get("busy_fraction"),
+        "hottest": [{"frame": frame, "samples": n} for frame, n in sampler.hottest()],
+    }
+
+def write_profile(sampler, engine, prefix):
+    """Write PREFIX.collapsed and PREFIX.json; returns the report"""
+    report = profile_report(sampler, engine)
+    sampler.write_collapsed(f"{prefix}.collapsed")
+    with open(f"{prefix}.json", "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def format_phases(report):
+    phases = report["phases"]
+    return " | ".join(f"{phase} {phases[phase]['share'] * 100:.1f}%" for phase in PHASES)
@@ -0,0 +1,147 @@
+import time
+
+class DeadlineScheduler:
+    """Drift-free pacing against absolute deadlines on a monotonic clock"""
+    POLICIES = ("skip", "catchup")
+
+    def __init__(self, interval, policy="skip", spin_threshold=0.002, max_catchup=100):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown missed-tick policy: {policy}")
+        self.interval = interval
+        self.policy = policy
+        self.spin_threshold = spin_threshold
+        self.max_catchup = max_catchup
+        self.start_time = None
+        self.stop_time = None
+        self.deadline = None
+        self.ticks = 0
+        self.missed = 0
+
+    def start(self, at=None):
+        """Anchor the deadline grid at the current instant, or a later perf_counter() time"""
+        self.start_time = time.perf_counter() if at is None else at
+        self.stop_time = None
+        self.deadline = self.start_time
+        self.ticks = 0
+        self.missed = 0
+
+    def stop(self):
+        """Freeze the elapsed time so rates stay accurate after the run"""
+        self.stop_time = time.perf_counter()
+
+    def sleep_until(self, deadline, stop_event=None):
+        """Hybrid sleep to an absolute perf_counter time; returns early only on stop"""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_threshold:
+            if stop_event is None:
+                time.sleep(remaining - self.spin_threshold)
+            elif stop_event.wait(remaining - self.spin_threshold):
+                return time.perf_counter()
+        now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        return now
+
+    def wait(self, stop_event=None, burst=1):
+        """Block until the next deadline: coarse sleep, then spin the last stretch
+        
+        With a stop_event the coarse sleep wakes as soon as the event is set.
+        burst is how many ticks the caller fires on waking.
+        """
+        deadline = self.deadline
+        now = self.sleep_until(deadline, stop_event)
+        if now >= deadline:
+            self.catch_up(now, burst)
+        return now
+
+    def catch_up(self, now, burst=1):
+        """Apply the missed-tick policy when now is late past the ticks a burst will fire"""
+        deadline = self.deadline
+        late = now - deadline
+        if late > self.interval * burst:
+            # The burst fires the first late ticks itself
+            behind = int(late / self.interval) - (burst - 1)
+            if self.policy == "skip":
+                self.missed += behind
+                self.deadline = deadline + behind * self.interval
+            elif behind > self.max_catchup:
+                dropped = behind - self.max_catchup
+                self.missed += dropped
+                self.deadline = deadline + dropped * self.interval
+
+    def wait_until(self, offset, stop_event=None):
+        """Wait for an absolute offset from start(), e.g. a recorded event time"""
+        self.deadline = self.start_time + offset
+        return self.wait(stop_event)
+
+    def advance(self, interval=None):
+        """Record a fired tick and move the deadline forward"""
+        self.ticks += 1
+        self.deadline += self.interval if interval is None else interval
+
+    def advance_burst(self, count, next_delay):
+        """Record a burst of fired ticks, moving the deadline past all of them"""
+        total = 0.0
+        for _ in range(count):
+            total += next_delay()
+        self.ticks += count
+        self.deadline += total
+
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        end = self.stop_time if self.stop_time is not None else time.perf_counter()
+        return max(end - self.start_time, 0.0)  # Zero while a scheduled start is pending
+
+    def achieved_rate(self):
+        """Fired ticks per second of the deadline grid they cover
+
+        The span runs from the first deadline to the one after the last
+        tick, so a loop that keeps up reports exactly the requested rate;
+        skipped ticks widen the span without adding ticks.
+        """
+        if self.start_time is None or not self.ticks:
+            return 0.0
+        span = self.deadline - self.start_time
+        return self.ticks / span if span > 0 else 0.0
+
+    def requested_rate(self):
+        return 1.0 / self.interval
+
+    def retune(self, interval, policy=None):
+        """Switch to a new nominal interval without resetting the deadline grid"""
+        if policy is not None:
+            if policy not in self.POLICIES:
+                raise ValueError(f"Unknown missed-tick policy: {policy}")
+            self.policy = policy
+        self.interval = interval
+
+class BurstController:
+    """Adapts how many actions are fired per wake-up to the achieved rate
+    
+    The burst doubles whenever a wake-up finishes past the next deadline and
+    shrinks by one after a run of wake-ups with at least half a burst of slack.
+    Ticks the scheduler skipped count against the slack, since the skip
+    policy moves the deadline past them before the controller sees it.
+    """
+    def __init__(self, interval, max_burst=64, calm_window=32):
+        self.interval = interval
+        self.max_burst = max_burst
+        self.calm_window = calm_window
+        self.size = 1
+        self.calm = 0
+
+    def update(self, slack, skipped=0):
+        """Burst size for the next wake-up given the slack before its deadline"""
+        if self.max_burst == 1:
+            return 1
+        slack -= skipped * self.interval
+        if slack < 0:
+            self.size = min(self.size * 2, self.max_burst)
+            self.calm = 0
+        elif self.size > 1 and slack > self.size * self.interval * 0.5:
+            self.calm += 1
+            if self.calm >= self.calm_window:
+                self.size -= 1
+                self.calm = 0
+        return self.size
@@ -0,0 +1,358 @@
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+
+from .hotkeys import parse_hotkey
+from .jitter import JitterSchedule, parse_sequence
+from .keyseq import KeySequence
+from .limits import parse_clock, parse_count, parse_seconds
+from .scheduler import DeadlineScheduler
+from .targets import PATHS
+
+SETTINGS_FILE = "autoclicker_settings.json"
+APP_NAME = "autoclicker"
+DEFAULT_PROFILE = "default"
+SNAPSHOT_VERSION = 1
+SAVE_DELAY = 0.5
+
+DEFAULT_SETTINGS = {
+    "action_type": "mouse",
+    "mouse_button": "left",
+    "keyboard_key": "enter",
+    "type_text": "",
+    "type_loop": False,
+    "cps": "1000",
+    "delay": "0.001",
+    "randomize": False,
+    "burst": True,
+    "click_location": "current",
+    "targets": "",
+    "target_path": "none",
+    "path_steps": "0",
+    "jitter_model": "uniform",
+    "jitter_seed": "",
+    "jitter_sequence": "",
+    "missed_ticks": "skip",
+    "stop_after_actions": "",
+    "stop_after_seconds": "",
+    "start_at": "",
+    "stop_at": "",
+    "stats_refresh_hz": "20",
+    "toggle_hotkey": "f6",
+    "engine": "thread",
+}
+
+CHOICES = {
+    "action_type": ("mouse", "keyboard"),
+    "mouse_button": ("left", "right", "middle"),
+    "click_location": ("current", "fixed", "targets"),
+    "target_path": PATHS,
+    "jitter_model": JitterSchedule.MODELS,
+    "missed_ticks": DeadlineScheduler.POLICIES,
+    "engine": ("thread", "process"),
+}
+NUMBERS = ("cps", "delay", "path_steps", "stats_refresh_hz")
+FLAGS = ("randomize", "burst", "type_loop")
+# Blank means no limit
+LIMITS = {
+    "stop_after_actions": parse_count,
+    "stop_after_seconds": parse_seconds,
+    "start_at": parse_clock,
+    "stop_at": parse_clock,
+}
+
+PROFILE_NAME = re.compile(r"^[\w][\w .-]{0,63}$")
+
+def check_setting(key, value):
+    """The stored form of one setting; raises ValueError if it does not fit the schema"""
+    if key in FLAGS:
+        if not isinstance(value, bool):
+            raise ValueError(f"{key} must be true or false")
+        return value
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{key} must be a string")
+    value = str(value)
+    if key in CHOICES and value not in CHOICES[key]:
+        raise ValueError(f"{key} must be one of {', '.join(CHOICES[key])}")
+    if key in NUMBERS:
+        try:
+            float(value)
+        except ValueError:
+            raise ValueError(f"{key} must be a number")
+    if key == "jitter_seed" and value.strip():
+        try:
+            int(value)
+        except ValueError:
+            raise ValueError("jitter_seed must be a whole number")
+    if key == "jitter_sequence":
+        parse_sequence(value)
+    if key == "toggle_hotkey":
+        parse_hotkey(value)
+    if key == "type_text" and value:
+        KeySequence.parse(value)
+    if key in LIMITS:
+        LIMITS[key](value)
+    return value
+
+def validate_settings(data, strict=True):
+    """Complete, schema-checked settings dict; unknown keys are dropped
+
+    Missing keys take their defaults. With strict=False an invalid value is
+    replaced by its default instead of raising ValueError.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Settings must be a JSON object")
+    settings = dict(DEFAULT_SETTINGS)
+    for key in DEFAULT_SETTINGS:
+        if key not in data:
+            continue
+        try:
+            settings[key] = check_setting(key, data[key])
+        except ValueError:
+            if strict:
+                raise
+    return settings
+
+def write_json_atomic(path, data):
+    """Write JSON through a temp file and rename, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+
+def load_settings(path=SETTINGS_FILE, strict=False):
+    """Load settings from file, falling back to defaults for anything missing or invalid
+
+    With strict=True an unreadable file or invalid value raises OSError or
+    ValueError instead, for settings the user named explicitly.
+    """
+    try:
+        with open(path, "r") as f:
+            return validate_settings(json.load(f), strict=strict)
+    except (OSError, ValueError):
+        if strict:
+            raise
+        return dict(DEFAULT_SETTINGS)
+
+def save_settings(settings, path=SETTINGS_FILE):
+    """Validate and atomically save settings to file"""
+    write_json_atomic(path, validate_settings(settings))
+
+def config_dir():
+    """Per-user configuration directory (AUTOCLICKER_CONFIG_DIR overrides it)"""
+    override = os.environ.get("AUTOCLICKER_CONFIG_DIR")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, APP_NAME)
+
+def check_profile_name(name):
+    if not isinstance(name, str) or not PROFILE_NAME.match(name):
+        raise ValueError(f"Invalid profile name: {name!r} (letters, digits, space, '.', '-', '_')")
+    return name
+
+class ProfileStore:
+    """Named settings profiles in the per-user config directory
+
+    Each profile is profiles/NAME.json. snapshot.json caches every profile
+    already validated, keyed by file stamps, so a normal start reads one file
+    and switching profiles is a dict lookup. save() updates the cache at once
+    and coalesces the disk writes of rapid changes into one after delay
+    seconds; every write is atomic. Call flush() (or close()) before exiting.
+    """
+    def __init__(self, directory=None, delay=SAVE_DELAY, legacy_path=SETTINGS_FILE):
+        self.directory = directory or config_dir()
+        self.profile_dir = os.path.join(self.directory, "profiles")
+        self.snapshot_path = os.path.join(self.directory, "snapshot.json")
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.timer = None
+        self.pending = set()
+        self.deleted = set()
+        self.snapshot_dirty = False
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = {}
+        self.write_error = None
+        self.profiles = {}
+        self.active = DEFAULT_PROFILE
+        self.from_snapshot = False
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.load(legacy_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def path(self, name):
+        return os.path.join(self.profile_dir, name + ".json")
+
+    def stamps(self):
+        """{name: [mtime_ns, size]} of the profile files on disk"""
+        stamps = {}
+        for entry in os.scandir(self.profile_dir):
+            name, ext = os.path.splitext(entry.name)
+            if ext == ".json" and PROFILE_NAME.match(name) and entry.is_file():
+                stat = entry.stat()
+                stamps[name] = [stat.st_mtime_ns, stat.st_size]
+        return stamps
+
+    def load(self, legacy_path=None):
+        stamps = self.stamps()
+        snapshot = None
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if (isinstance(snapshot, dict) and snapshot.get("version") == SNAPSHOT_VERSION
+                and snapshot.get("schema") == sorted(DEFAULT_SETTINGS)
+                and snapshot.get("stamps") == stamps):
+            self.profiles = snapshot["profiles"]
+            self.from_snapshot = True
+        else:
+            self.profiles = {}
+            for name in stamps:
+                try:
+                    with open(self.path(name), "r") as f:
+                        self.profiles[name] = validate_settings(json.load(f), strict=False)
+                except (OSError, ValueError) as e:
+                    self.errors[name] = str(e)
+            self.snapshot_dirty = True
+        if not self.profiles:
+            # First start: adopt the settings file the app used to keep in the working directory
+            legacy = load_settings(legacy_path) if legacy_path else dict(DEFAULT_SETTINGS)
+            self.profiles[DEFAULT_PROFILE] = legacy
+            self.pending.add(DEFAULT_PROFILE)
+        active = snapshot.get("active") if isinstance(snapshot, dict) else None
+        self.active = active if active in self.profiles else sorted(self.profiles)[0]
+        if self.pending or self.snapshot_dirty:
+            self.flush()
+
+    def names(self):
+        return sorted(self.profiles)
+
+    def get(self, name=None):
+        """Validated settings of a profile (default: the active one)"""
+        name = self.active if name is None else name
+        try:
+            return dict(self.profiles[name])
+        except KeyError:
+            raise ValueError(f"Unknown profile: {name}")
+
+    def activate(self, name):
+        """Make a profile active and return its settings; nothing is parsed"""
+        settings = self.get(name)
+        with self.lock:
+            if name != self.active:
+                self.active = name
+                self.snapshot_dirty = True
+                self.schedule()
+        return settings
+
+    def save(self, settings, name=None):
+        """Validate and store a profile; the write to disk is debounced
+
+        Raises ValueError before touching anything if the settings are invalid.
+        """
+        name = check_profile_name(self.active if name is None else name)
+        settings = validate_settings(settings)
+        with self.lock:
+            if self.profiles.get(name) == settings:
+                return False
+            self.profiles[name] = settings
+            self.deleted.discard(name)
+            if name in self.pending:
+                self.coalesced += 1
+            self.pending.add(name)
+            self.schedule()
+        return True
+
+    def create(self, name, settings=None):
+        if name in self.profiles:
+            raise ValueError(f"Profile already exists: {name}")
+        self.save(settings if settings is not None else DEFAULT_SETTINGS, name)
+        return self.activate(name)
+
+    def delete(self, name):
+        """Remove a profile; the last one cannot be deleted"""
+        if name not in self.profiles:
+            raise ValueError(f"Unknown profile: {name}")
+        if len(self.profiles) == 1:
+            raise ValueError("Cannot delete the only profile")
+        with self.lock:
+            del self.profiles[name]
+            self.pending.discard(name)
+            self.deleted.add(name)
+            if self.active == name:
+                self.active = sorted(self.profiles)[0]
+            self.schedule()
+        return self.active
+
+    def schedule(self):
+        # Caller holds the lock; restarting the timer coalesces bursts of changes
+        self.snapshot_dirty = True
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = threading.Timer(self.delay, self.flush_later)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def flush_later(self):
+        try:
+            self.flush()
+            self.write_error = None
+        except OSError as e:
+            # Kept pending; retried by the next save or flush()
+            self.write_error = e
+
+    def flush(self):
+        """Write pending profiles and the snapshot now"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not (self.pending or self.deleted or self.snapshot_dirty):
+                return
+            for name in sorted(self.pending):
+                write_json_atomic(self.path(name), self.profiles[name])
+                self.writes += 1
+            for name in self.deleted:
+                try:
+                    os.unlink(self.path(name))
+                except FileNotFoundError:
+                    pass
+            self.pending.clear()
+            self.deleted.clear()
+            # Stamps are read after the writes so the next start can trust the snapshot
+            write_json_atomic(self.snapshot_path, {
+                "version": SNAPSHOT_VERSION,
+                "schema": sorted(DEFAULT_SETTINGS),
+                "active": self.active,
+                "stamps": self.stamps(),
+                "profiles": self.profiles,
+            })
+            self.snapshot_dirty = False
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,146 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Modules that must not be loaded before the GUI is interactive; each costs
+# tens of milliseconds and is only needed once a feature is used
+HEAVY_MODULES = ("numpy", "asyncio", "http.server", "sqlite3", "multiprocessing", "socket", "Xlib",
+                 "evdev", "pynput")
+STARTUP_MARKS = ("tk", "settings", "built", "interactive", "hotkeys")
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_modules(names=HEAVY_MODULES):
+    return [name for name in names if name in sys.modules]
+
+def startup_report(marks):
+    """Milliseconds from gui.main() to each startup mark (GUI side of the measurement)"""
+    base = marks["main"]
+    report = {f"{name}_ms": round((marks[name] - base) * 1000, 2)
+              for name in STARTUP_MARKS if name in marks}
+    report["heavy_modules"] = marks.get("heavy_modules", [])
+    report["modules"] = marks.get("modules", 0)
+    return report
+
+def child_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    return env
+
+def measure_import(python=sys.executable, timeout=30):
+    """Time to import the CLI and GUI modules in a fresh interpreter"""
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import clicker.cli, clicker.gui\n"
+        "print(json.dumps({'import_ms': (time.perf_counter() - started) * 1000,\n"
+        f"    'heavy_modules': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([python, "-c", code], capture_output=True, text=True,
+                            env=child_env(), timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing the GUI failed: {last_line(result.stderr)}")
+    return json.loads(result.stdout)
+
+def measure_gui(python=sys.executable, timeout=30):
+    """Launch the GUI in report mode and time it from spawn until it is interactive"""
+    started = time.perf_counter()
+    process = subprocess.Popen([python, "-m", "clicker", "gui", "--startup-report"],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, env=child_env())
+    line = process.stdout.readline()
+    reported = time.perf_counter()
+    _, errors = process.communicate(timeout=timeout)
+    if not line:
+        raise RuntimeError(f"The GUI did not start: {last_line(errors) or f'exit status {process.returncode}'}")
+    report = json.loads(line)
+    # The report is printed after the hotkey listener started, which is not part of TTI
+    listener = report.get("hotkeys_ms", 0.0) - report.get("interactive_ms", 0.0)
+    report["process_ms"] = round((reported - started) * 1000, 2)
+    report["time_to_interactive_ms"] = round(report["process_ms"] - listener, 2)
+    return report
+
+def last_line(text):
+    lines = text.strip().splitlines()
+    return lines[-1] if lines else ""
+
+def median_of(reports, key):
+    values = [report[key] for report in reports if key in report]
+    return round(statistics.median(values), 2) if values else None
+
+def measure_startup(runs=5, label="", python=sys.executable):
+    """Median import time and, where a display is available, GUI time-to-interactive"""
+    imports = [measure_import(python) for _ in range(runs)]
+    report = {
+        "label": label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "import_ms": median_of(imports, "import_ms"),
+        "heavy_modules": sorted(set().union(*(r["heavy_modules"] for r in imports))),
+        "gui": None,
+        "gui_error": None,
+    }
+    try:
+        guis = [measure_gui(python) for _ in range(runs)]
+    except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+        report["gui_error"] = str(e)
+        return report
+    gui = {key: median_of(guis, key) for key in
+           ["time_to_interactive_ms", "process_ms"] + [f"{mark}_ms" for mark in STARTUP_MARKS]}
+    gui["modules"] = median_of(guis, "modules")
+    report["gui"] = gui
+    report["heavy_modules"] = sorted(set(report["heavy_modules"]).union(
+        *(r["heavy_modules"] for r in guis)))
+    return report
+
+def check_budget(report, budget_ms=None):
+    """Regression failures: heavy imports before interactive, or TTI over budget"""
+    failures = []
+    if report["heavy_modules"]:
+        failures.append(f"loaded before interactive: {', '.join(report['heavy_modules'])}")
+    if budget_ms is not None and report["gui"] is not None:
+        tti = report["gui"]["time_to_interactive_ms"]
+        if tti > budget_ms:
+            failures.append(f"time to interactive {tti:.1f} ms exceeds the {budget_ms:g} ms budget")
+    return failures
+
+def format_report(report):
+    lines = [f"Import (cli + gui): {report['import_ms']:.1f} ms"]
+    gui = report["gui"]
+    if gui is None:
+        lines.append(f"GUI not measured: {report['gui_error']}")
+    else:
+        lines.append(f"Time to interactive: {gui['time_to_interactive_ms']:.1f} ms "
+                     f"(Tk {gui['tk_ms']:.1f} | settings {gui['settings_ms']:.1f} | "
+                     f"widgets {gui['built_ms']:.1f} | first idle {gui['interactive_ms']:.1f} ms "
+                     f"after main)")
+    return "\n".join(lines)
+
+def startup_command(args):
+    report = measure_startup(args.runs, args.label)
+    print(format_report(report), file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"import {report['import_ms'] - baseline['import_ms']:+.1f} ms", file=sys.stderr)
+        if report["gui"] and baseline.get("gui"):
+            delta = report["gui"]["time_to_interactive_ms"] - baseline["gui"]["time_to_interactive_ms"]
+            print(f"time to interactive {delta:+.1f} ms", file=sys.stderr)
+
+    failures = check_budget(report, args.budget)
+    for failure in failures:
+        print(f"error: {failure}", file=sys.stderr)
+    return 1 if failures else 0
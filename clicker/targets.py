@@ -0,0 +1,176 @@
+import random
+import re
+import time
+from array import array
+
+PATHS = ("none", "linear", "ease", "bezier")
+
+# Seconds between re-asserting an unchanged position, in case the user moved the pointer
+POSITION_REFRESH = 0.1
+
+class TargetSequence:
+    """Precomputed click coordinates and the movement paths between them
+
+    Everything is laid out in arrays when the sequence is built, so the click
+    loop only indexes: target i is (xs[i], ys[i]) and the leg leading to it
+    is path_xs/path_ys[i * path_steps:(i + 1) * path_steps]. Leg 0 comes
+    from the last target, so cycling through the sequence is seamless.
+    """
+    def __init__(self, points, path="none", path_steps=0, seed=None):
+        if not points:
+            raise ValueError("A target sequence needs at least one point")
+        if path not in PATHS:
+            raise ValueError(f"Unknown movement path: {path}")
+        if path_steps < 0:
+            raise ValueError("Path steps must not be negative")
+        self.xs = array("i", (int(x) for x, _ in points))
+        self.ys = array("i", (int(y) for _, y in points))
+        self.path = path
+        self.path_steps = path_steps if path != "none" and len(points) > 1 else 0
+        self.path_xs = array("i")
+        self.path_ys = array("i")
+        if self.path_steps:
+            self.build_paths(random.Random(seed))
+
+    @classmethod
+    def grid(cls, left, top, right, bottom, cols, rows, **kwargs):
+        """cols x rows evenly spaced points, row by row, corners included"""
+        if cols < 1 or rows < 1:
+            raise ValueError("A grid needs at least one column and one row")
+        step_x = (right - left) / (cols - 1) if cols > 1 else 0
+        step_y = (bottom - top) / (rows - 1) if rows > 1 else 0
+        points = [(round(left + c * step_x), round(top + r * step_y))
+                  for r in range(rows) for c in range(cols)]
+        return cls(points, **kwargs)
+
+    @classmethod
+    def region(cls, left, top, right, bottom, samples, seed=None, **kwargs):
+        """samples uniformly random points inside a rectangle (seeded, so replayable)"""
+        if samples < 1:
+            raise ValueError("A region needs at least one sample")
+        if right < left or bottom < top:
+            raise ValueError("Region corners must be top-left then bottom-right")
+        rng = random.Random(seed)
+        points = [(rng.randint(left, right), rng.randint(top, bottom)) for _ in range(samples)]
+        return cls(points, seed=seed, **kwargs)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def build_paths(self, rng):
+        steps = self.path_steps
+        xs, ys = self.xs, self.ys
+        for i in range(len(xs)):
+            x0, y0 = xs[i - 1], ys[i - 1]
+            x1, y1 = xs[i], ys[i]
+            if self.path == "bezier":
+                # Control points pushed off the straight line for a hand-drawn arc
+                dx, dy = x1 - x0, y1 - y0
+                bend = rng.uniform(-0.3, 0.3)
+                cx0, cy0 = x0 + dx / 3 - dy * bend, y0 + dy / 3 + dx * bend
+                cx1, cy1 = x0 + 2 * dx / 3 - dy * bend, y0 + 2 * dy / 3 + dx * bend
+            for j in range(1, steps + 1):
+                t = j / (steps + 1)
+                if self.path == "linear":
+                    px, py = x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+                elif self.path == "ease":
+                    e = t * t * (3 - 2 * t)
+                    px, py = x0 + (x1 - x0) * e, y0 + (y1 - y0) * e
+                else:
+                    u = 1 - t
+                    px = u ** 3 * x0 + 3 * u * u * t * cx0 + 3 * u * t * t * cx1 + t ** 3 * x1
+                    py = u ** 3 * y0 + 3 * u * u * t * cy0 + 3 * u * t * t * cy1 + t ** 3 * y1
+                self.path_xs.append(round(px))
+                self.path_ys.append(round(py))
+
+class TargetCursor:
+    """Fires through a backend while stepping through a TargetSequence
+
+    The pointer is only written when the next target differs from the last
+    position written (or POSITION_REFRESH has passed), so a single fixed
+    target costs one move per refresh rather than one per click.
+    """
+    def __init__(self, backend, targets):
+        self.backend = backend
+        self.targets = targets
+        self.index = 0
+        self.last_xy = None
+        self.last_move = 0.0
+
+    def place(self, index):
+        xy = (self.targets.xs[index], self.targets.ys[index])
+        now = time.perf_counter()
+        if xy != self.last_xy or now - self.last_move >= POSITION_REFRESH:
+            self.backend.move(*xy)
+            self.last_xy, self.last_move = xy, now
+
+    def fire(self, count=1):
+        n = len(self.targets)
+        if n == 1:
+            self.place(0)
+            self.backend.fire(count)
+            return
+        fire, place, index = self.backend.fire, self.place, self.index
+        for _ in range(count):
+            place(index)
+            fire(1)
+            index = index + 1 if index + 1 < n else 0
+        self.index = index
+
+    def walk(self, scheduler, stop_event):
+        """Move along the leg into the next target, spread out until the next deadline"""
+        steps = self.targets.path_steps
+        if not steps:
+            return
+        move = self.backend.move
+        path_xs, path_ys = self.targets.path_xs, self.targets.path_ys
+        start = time.perf_counter()
+        step = (scheduler.deadline - start) / (steps + 1)
+        base = self.index * steps
+        for j in range(steps):
+            scheduler.sleep_until(start + (j + 1) * step, stop_event)
+            if stop_event.is_set():
+                break
+            move(path_xs[base + j], path_ys[base + j])
+        self.last_xy = None
+
+def target_cursor(plan, backend):
+    """TargetCursor for a fixed or multi-target mouse plan, None to act in place"""
+    if plan.action != "mouse" or plan.location == "current":
+        return None
+    targets = plan.targets
+    if plan.location == "fixed":
+        targets = TargetSequence([plan.position])
+    return TargetCursor(backend, targets)
+
+SPEC_NUMBER = r"(-?\d+)"
+GRID_SPEC = re.compile(rf"grid\s+{SPEC_NUMBER},{SPEC_NUMBER}\s+{SPEC_NUMBER},{SPEC_NUMBER}\s+(\d+)x(\d+)$")
+REGION_SPEC = re.compile(rf"region\s+{SPEC_NUMBER},{SPEC_NUMBER}\s+{SPEC_NUMBER},{SPEC_NUMBER}\s+x(\d+)$")
+
+def parse_targets(spec, path="none", path_steps=0, seed=None):
+    """TargetSequence from a text spec, as typed in the GUI or on the command line
+
+        "100,200; 300,400"               explicit points
+        "grid 100,100 500,400 5x4"       5 columns x 4 rows
+        "region 100,100 500,400 x50"     50 random points in the rectangle
+    """
+    spec = spec.strip().lower()
+    kwargs = {"path": path, "path_steps": path_steps}
+    match = GRID_SPEC.match(spec)
+    if match:
+        left, top, right, bottom, cols, rows = map(int, match.groups())
+        return TargetSequence.grid(left, top, right, bottom, cols, rows, seed=seed, **kwargs)
+    match = REGION_SPEC.match(spec)
+    if match:
+        left, top, right, bottom, samples = map(int, match.groups())
+        return TargetSequence.region(left, top, right, bottom, samples, seed=seed, **kwargs)
+    points = []
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        try:
+            x, y = (int(v) for v in part.split(","))
+        except ValueError:
+            raise ValueError(f"Invalid target point: {part!r} (expected X,Y)")
+        points.append((x, y))
+    if not points:
+        raise ValueError("No targets given")
+    return TargetSequence(points, seed=seed, **kwargs)
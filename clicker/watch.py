@@ -0,0 +1,407 @@
+import ctypes
+import ctypes.util
+import threading
+import time
+
+from . import backends, jitter
+from .backends import make_backend
+from .metrics import Histogram
+from .scheduler import DeadlineScheduler
+from .targets import target_cursor
+
+# Bound to jitter's lazily imported numpy when the first source or trigger is created
+numpy = None
+
+# Frames are numpy uint8 arrays of shape (height, width, 4) in X11's native
+# 32-bit ZPixmap layout: blue, green, red, padding.
+
+def require_numpy():
+    global numpy
+    if not jitter.import_numpy():
+        raise RuntimeError("Screen watching requires numpy")
+    numpy = jitter.numpy
+
+def parse_region(value):
+    """(left, top, width, height) from "LEFT,TOP,WIDTH,HEIGHT\""""
+    try:
+        left, top, width, height = (int(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError(f"Invalid region: {value!r} (expected LEFT,TOP,WIDTH,HEIGHT)")
+    if width < 1 or height < 1:
+        raise ValueError("Region width and height must be positive")
+    return left, top, width, height
+
+def parse_color(value):
+    """(r, g, b) from "RRGGBB", "#RRGGBB" or "R,G,B\""""
+    value = value.strip().lstrip("#")
+    try:
+        if "," in value:
+            r, g, b = (int(v) for v in value.split(","))
+        else:
+            if len(value) != 6:
+                raise ValueError
+            r, g, b = (int(value[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        raise ValueError(f"Invalid colour: {value!r} (expected RRGGBB or R,G,B)")
+    if not all(0 <= c <= 255 for c in (r, g, b)):
+        raise ValueError("Colour components must be between 0 and 255")
+    return r, g, b
+
+class XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; only ever used through pointers from Xlib
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int), ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int), ("data", ctypes.c_void_p), ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int), ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int), ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int), ("bits_per_pixel", ctypes.c_int),
+    ]
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong), ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p), ("readOnly", ctypes.c_int),
+    ]
+
+class XShmSource:
+    """Captures a screen region through the MIT-SHM extension
+
+    The X server writes each capture straight into a shared memory segment
+    that grab() exposes as a numpy view, so nothing is copied or allocated
+    per frame. The returned frame is overwritten by the next grab().
+    """
+    name = "xshm"
+    ZPIXMAP = 2
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+
+    def __init__(self, region):
+        require_numpy()
+        x11_path, xext_path = ctypes.util.find_library("X11"), ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise RuntimeError("The xshm source requires libX11 and libXext")
+        self.x11 = x11 = ctypes.CDLL(x11_path)
+        self.xext = xext = ctypes.CDLL(xext_path)
+        self.libc = libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        for name in ("XDefaultScreen", "XDisplayWidth", "XDisplayHeight", "XDefaultDepth"):
+            getattr(x11, name).argtypes = [ctypes.c_void_p] + ([ctypes.c_int] if name != "XDefaultScreen" else [])
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p,
+            ctypes.POINTER(XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XImage),
+            ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        self.display = x11.XOpenDisplay(None)
+        if not self.display:
+            raise RuntimeError("Cannot connect to the X server")
+        self.image = None
+        self.shminfo = None
+        try:
+            self.attach(region)
+        except Exception:
+            self.close()
+            raise
+
+    def attach(self, region):
+        x11, xext, libc, display = self.x11, self.xext, self.libc, self.display
+        left, top, width, height = region
+        screen = x11.XDefaultScreen(display)
+        if (left < 0 or top < 0 or left + width > x11.XDisplayWidth(display, screen)
+                or top + height > x11.XDisplayHeight(display, screen)):
+            raise ValueError("Region must lie inside the screen")
+        if not xext.XShmQueryExtension(display):
+            raise RuntimeError("The X server does not support MIT-SHM")
+        self.root = x11.XRootWindow(display, screen)
+        self.left, self.top = left, top
+
+        shminfo = XShmSegmentInfo()
+        image = xext.XShmCreateImage(
+            display, x11.XDefaultVisual(display, screen), x11.XDefaultDepth(display, screen),
+            self.ZPIXMAP, None, ctypes.byref(shminfo), width, height
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage failed")
+        self.image = image
+        if image.contents.bits_per_pixel != 32:
+            raise RuntimeError("The xshm source needs a 32-bit TrueColor screen")
+        size = image.contents.bytes_per_line * height
+        shminfo.shmid = libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        shminfo.shmaddr = libc.shmat(shminfo.shmid, None, 0)
+        if shminfo.shmaddr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(shminfo.shmid, self.IPC_RMID, None)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        self.shminfo = shminfo
+        shminfo.readOnly = 0
+        image.contents.data = shminfo.shmaddr
+        xext.XShmAttach(display, ctypes.byref(shminfo))
+        x11.XSync(display, 0)
+        # Marked for removal now; the kernel frees it once both sides detach
+        libc.shmctl(shminfo.shmid, self.IPC_RMID, None)
+
+        buffer = (ctypes.c_ubyte * size).from_address(shminfo.shmaddr)
+        stride = image.contents.bytes_per_line // 4
+        self.frame = numpy.frombuffer(buffer, numpy.uint8).reshape(height, stride, 4)[:, :width]
+
+    def grab(self):
+        self.xext.XShmGetImage(self.display, self.root, self.image, self.left, self.top, 0xFFFFFFFF)
+        return self.frame
+
+    def close(self):
+        if self.display is None:
+            return
+        if self.shminfo is not None:
+            self.xext.XShmDetach(self.display, ctypes.byref(self.shminfo))
+            self.libc.shmdt(self.shminfo.shmaddr)
+            self.shminfo = None
+        if self.image:
+            # The pixel data lives in the shared segment, so only the struct is freed
+            self.image.contents.data = None
+            self.x11.XFree(self.image)
+            self.image = None
+        self.x11.XCloseDisplay(self.display)
+        self.display = None
+
+class XlibSource:
+    """Captures a screen region with a plain GetImage request (one copy per frame)"""
+    name = "xlib"
+
+    def __init__(self, region):
+        require_numpy()
+        if not backends.import_xlib():
+            raise RuntimeError("The xlib source requires python-xlib")
+        try:
+            self.display = backends.xdisplay.Display()
+        except Exception as e:
+            raise RuntimeError(f"Cannot connect to the X server: {e}")
+        self.root = self.display.screen().root
+        self.left, self.top, self.width, self.height = region
+
+    def grab(self):
+        image = self.root.get_image(self.left, self.top, self.width, self.height, backends.X.ZPixmap, 0xFFFFFFFF)
+        return numpy.frombuffer(image.data, numpy.uint8).reshape(self.height, self.width, 4)
+
+    def close(self):
+        self.display.close()
+
+class SyntheticSource:
+    """In-memory frame source for tests and benchmarks
+
+    fill() paints a rectangle, from any thread, and records when it happened
+    so a watcher's paint-to-click latency can be measured end to end. Like
+    the X sources, grab() returns a buffer that only changes on the next grab.
+    """
+    name = "synthetic"
+
+    def __init__(self, width, height, color=(0, 0, 0)):
+        require_numpy()
+        self.frame = numpy.zeros((height, width, 4), numpy.uint8)
+        self.snapshot = numpy.empty_like(self.frame)
+        self.painted_at = None
+        self.fill(color)
+
+    def fill(self, color, region=None):
+        r, g, b = color
+        left, top, width, height = region or (0, 0, self.frame.shape[1], self.frame.shape[0])
+        self.frame[top:top + height, left:left + width, :3] = (b, g, r)
+        self.painted_at = time.perf_counter()
+
+    def grab(self):
+        numpy.copyto(self.snapshot, self.frame)
+        return self.snapshot
+
+    def close(self):
+        pass
+
+SOURCES = {"xshm": XShmSource, "xlib": XlibSource}
+
+def make_source(region, spec="auto"):
+    """Frame source for a region; "auto" prefers XShm and falls back to GetImage"""
+    if not isinstance(spec, str):
+        return spec
+    if spec != "auto":
+        try:
+            return SOURCES[spec](region)
+        except KeyError:
+            raise ValueError(f"Unknown capture source: {spec}")
+    try:
+        return XShmSource(region)
+    except (OSError, RuntimeError):
+        return XlibSource(region)
+
+class ChangeTrigger:
+    """Fires when enough pixels differ from the reference frame
+
+    reference="previous" compares each frame with the one before it,
+    "first" with the first frame seen. A pixel counts as changed when any
+    channel moved by more than tolerance; the trigger needs more than
+    min_fraction of the region changed. Buffers are allocated once.
+    """
+    REFERENCES = ("previous", "first")
+
+    def __init__(self, tolerance=0, min_fraction=0.0, reference="previous"):
+        require_numpy()
+        if reference not in self.REFERENCES:
+            raise ValueError(f"Unknown reference frame: {reference}")
+        self.tolerance = tolerance
+        self.min_fraction = min_fraction
+        self.reference = reference
+        self.previous = None
+        self.diff = None
+
+    def check(self, frame):
+        pixels = frame[..., :3]
+        if self.previous is None:
+            self.previous = pixels.copy()
+            self.diff = numpy.empty(pixels.shape, numpy.int16)
+            self.threshold = int(self.min_fraction * pixels.shape[0] * pixels.shape[1])
+            return False
+        if self.tolerance == 0:
+            changed = numpy.count_nonzero((pixels != self.previous).any(axis=2))
+        else:
+            numpy.subtract(pixels, self.previous, out=self.diff, dtype=numpy.int16)
+            numpy.abs(self.diff, out=self.diff)
+            changed = numpy.count_nonzero((self.diff > self.tolerance).any(axis=2))
+        if self.reference == "previous":
+            numpy.copyto(self.previous, pixels)
+        return changed > self.threshold
+
+class ColorTrigger:
+    """Fires when at least min_fraction of the region matches a colour
+
+    A pixel matches when every channel is within tolerance of the colour;
+    the test is two vectorized bound checks on the raw uint8 frame.
+    """
+    def __init__(self, color, tolerance=0, min_fraction=0.0):
+        require_numpy()
+        r, g, b = color
+        bgr = numpy.array((b, g, r), numpy.int16)
+        self.low = numpy.clip(bgr - tolerance, 0, 255).astype(numpy.uint8)
+        self.high = numpy.clip(bgr + tolerance, 0, 255).astype(numpy.uint8)
+        self.min_fraction = min_fraction
+
+    def check(self, frame):
+        pixels = frame[..., :3]
+        matched = numpy.count_nonzero(((pixels >= self.low) & (pixels <= self.high)).all(axis=2))
+        return matched > 0 and matched >= self.min_fraction * pixels.shape[0] * pixels.shape[1]
+
+class ScreenWatcher:
+    """Polls a frame source and fires the plan's action when the trigger matches
+
+    Polls run on a deadline grid at poll_hz; a match fires immediately on the
+    polling thread, then further matches are ignored for cooldown seconds.
+    capture_time times each grab and latency each capture-to-click.
+    """
+    def __init__(self, source, trigger, plan, backend="auto", poll_hz=60.0, cooldown=0.1, once=False):
+        if not 0 < poll_hz <= 10000:
+            raise ValueError("Poll rate must be between 0 and 10,000 Hz")
+        if cooldown < 0:
+            raise ValueError("Cooldown must not be negative")
+        self.source = source
+        self.trigger = trigger
+        self.plan = plan
+        self.backend = make_backend(backend)
+        self.poll_hz = poll_hz
+        self.cooldown = cooldown
+        self.once = once
+        self.polls = 0
+        self.triggers = 0
+        self.capture_time = Histogram()
+        self.latency = Histogram()
+        self.scheduler = None
+        self.error = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def watch(self, stop_event=None):
+        """Blocking poll loop; returns the number of triggered actions"""
+        stop_event = stop_event or self.stop_event
+        stopped = stop_event.is_set
+        grab, check = self.source.grab, self.trigger.check
+        perf_counter = time.perf_counter
+        backend = self.backend
+        backend.open(self.plan)
+        cursor = target_cursor(self.plan, backend)
+        fire = cursor.fire if cursor else backend.fire
+        scheduler = DeadlineScheduler(1.0 / self.poll_hz)
+        self.scheduler = scheduler
+        quiet_until = 0.0
+
+        scheduler.start()
+        try:
+            while not stopped():
+                scheduler.wait(stop_event)
+                if stopped():
+                    break
+                captured = perf_counter()
+                frame = grab()
+                grabbed = perf_counter()
+                self.capture_time.record(grabbed - captured)
+                self.polls += 1
+                if check(frame) and grabbed >= quiet_until:
+                    fire(1)
+                    clicked = perf_counter()
+                    self.latency.record(clicked - captured)
+                    self.triggers += 1
+                    quiet_until = clicked + self.cooldown
+                    if self.once:
+                        break
+                scheduler.advance()
+        finally:
+            scheduler.stop()
+            backend.close()
+        return self.triggers
+
+    def start(self):
+        self.stop_event = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self.run_thread, daemon=True)
+        self.thread.start()
+
+    def run_thread(self):
+        try:
+            self.watch(self.stop_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.stop_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def stats(self):
+        scheduler = self.scheduler
+        return {
+            "polls": self.polls,
+            "triggers": self.triggers,
+            "missed_polls": scheduler.missed if scheduler else 0,
+            "capture": self.capture_time.summary(),
+            "capture_to_click": self.latency.summary(),
+        }
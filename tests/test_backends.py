@@ -0,0 +1,36 @@
+import unittest
+
+from clicker import backends
+from clicker.engine import RunPlan
+
+class FakeDisplay:
+    """Keyboard mapping with F6 and a on their usual keycodes"""
+    KEYCODES = {0xffc3: 72, ord("a"): 38}
+
+    def keysym_to_keycode(self, keysym):
+        return self.KEYCODES.get(keysym, 0)
+
+@unittest.skipUnless(backends.import_xlib(), "python-xlib is not installed")
+class XTestBackendTest(unittest.TestCase):
+    def backend(self):
+        backend = backends.XTestBackend.__new__(backends.XTestBackend)
+        backend.display = FakeDisplay()
+        return backend
+
+    def test_function_keys_resolve(self):
+        backend = self.backend()
+        for key in ("f6", "F6"):
+            backend.open(RunPlan(action="keyboard", key=key))
+            self.assertEqual(backend.code, 72)
+
+    def test_characters_resolve(self):
+        backend = self.backend()
+        backend.open(RunPlan(action="keyboard", key="a"))
+        self.assertEqual(backend.code, 38)
+
+    def test_unknown_key_is_an_error(self):
+        with self.assertRaises(ValueError):
+            self.backend().open(RunPlan(action="keyboard", key="f35"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from clicker.backends import NullBackend
+from clicker.control import ControlClient, ControlServer
+from clicker.engine import ClickEngine
+
+class SlowCloseBackend(NullBackend):
+    """Takes a while to release, like a child engine process exiting"""
+    def close(self):
+        time.sleep(0.5)
+
+class ControlServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "control.sock")
+        self.engine = ClickEngine("null")
+        self.server = ControlServer(self.engine, self.path).start()
+        self.client = ControlClient(self.path)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.engine.stop()
+        self.engine.join()
+        self.directory.cleanup()
+
+    def test_start_rate_stats_stop(self):
+        self.assertEqual(self.client.send("ping"), "ok")
+        self.assertIn("started_at", self.client.start(cps="500"))
+        self.assertEqual(self.client.rate(1000), {"cps": 1000})
+        time.sleep(0.1)
+        stats = self.client.stats()
+        self.assertTrue(stats["running"])
+        self.assertGreater(stats["actions"], 0)
+        self.assertEqual(self.engine.plan.cps, 1000)
+        stats = self.client.stop()
+        self.assertFalse(stats["running"])
+        self.assertFalse(self.engine.is_alive())
+        self.assertEqual(stats["actions"], self.engine.count)
+
+    def test_start_limits_end_the_run(self):
+        self.client.start(cps="1000", stop_after_actions="50")
+        self.engine.join(5)
+        stats = self.client.stats()
+        self.assertFalse(stats["running"])
+        self.assertEqual(stats["actions"], 50)
+
+    def test_error_replies(self):
+        replies = {
+            "jump": "error unknown command: jump",
+            'start {"max_duration": 0.2}': "error unknown setting: max_duration",
+            'start {"cps": "abc"}': "error ",
+            'start {"targets": [1, 2]}': "error ",
+            "start [1]": "error start takes a JSON object of settings",
+            "start {": "error ",
+            "rate fast": "error rate takes actions per second, e.g. rate 250",
+            "rate -5": "error Speed must be greater than zero",
+        }
+        for line, expected in replies.items():
+            with self.subTest(line=line):
+                self.assertTrue(self.client.send(line).startswith(expected))
+        self.assertIsNone(self.engine.plan)
+        self.assertEqual(self.client.send("ping"), "ok")
+
+    def test_stop_without_a_run(self):
+        stats = self.client.stop()
+        self.assertFalse(stats["running"])
+        self.assertEqual(stats["actions"], 0)
+
+    def test_stop_does_not_hold_up_other_clients(self):
+        self.engine.backend = SlowCloseBackend()
+        self.client.start(cps="100")
+        stopper = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stopper.settimeout(5)
+        stopper.connect(self.path)
+        with stopper, stopper.makefile("rb") as replies:
+            stopper.sendall(b"stop\nstats\n")
+            time.sleep(0.05)
+            sent = time.perf_counter()
+            self.assertEqual(self.client.send("ping"), "ok")
+            self.assertLess(time.perf_counter() - sent, 0.25)
+            # The stats reply follows the stop reply, once the run has ended
+            stopped = json.loads(replies.readline().decode().partition(" ")[2])
+            stats = json.loads(replies.readline().decode().partition(" ")[2])
+        self.assertFalse(stopped["running"])
+        self.assertFalse(stats["running"])
+        self.assertEqual(stopped["actions"], stats["actions"])
+
+    def test_shutdown_closes_the_server(self):
+        self.assertIsNone(self.client.shutdown())
+        self.assertTrue(self.server.wait(1))
+        self.server.stop()
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == "__main__":
+    unittest.main()
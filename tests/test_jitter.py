@@ -0,0 +1,61 @@
+import unittest
+
+from clicker.engine import RunPlan
+from clicker.jitter import JitterSchedule, parse_sequence
+from clicker.settings import DEFAULT_SETTINGS, validate_settings
+
+def delays(plan, count=5000):
+    schedule = plan.make_intervals(background=False)
+    try:
+        return schedule.take(count)
+    finally:
+        schedule.close()
+
+class JitterSeedTest(unittest.TestCase):
+    def test_same_seed_same_delays(self):
+        for model in ("uniform", "gaussian", "lognormal"):
+            with self.subTest(model=model):
+                settings = dict(DEFAULT_SETTINGS, randomize=True, jitter_model=model, jitter_seed="42")
+                first = delays(RunPlan.from_settings(settings))
+                self.assertEqual(first, delays(RunPlan.from_settings(settings)))
+                other = dict(settings, jitter_seed="43")
+                self.assertNotEqual(first, delays(RunPlan.from_settings(other)))
+
+    def test_seed_spans_batches(self):
+        # Batches are refilled from the same generator, so a longer run repeats too
+        plan = RunPlan(jitter=0.2, jitter_seed=7)
+        schedules = [plan.make_intervals() for _ in range(2)]
+        try:
+            self.assertEqual(*(schedule.take(10000) for schedule in schedules))
+        finally:
+            for schedule in schedules:
+                schedule.close()
+
+    def test_same_seed_without_numpy(self):
+        first, second = (JitterSchedule(0.01, seed=5, use_numpy=False, background=False).take(100)
+                         for _ in range(2))
+        self.assertEqual(first, second)
+
+class JitterSequenceTest(unittest.TestCase):
+    def test_sequence_from_settings(self):
+        settings = validate_settings(dict(DEFAULT_SETTINGS, cps="10", randomize=True,
+                                          jitter_model="sequence", jitter_sequence="0.05, 0.2"))
+        plan = RunPlan.from_settings(settings)
+        self.assertEqual(plan.jitter_sequence, (0.05, 0.2))
+        self.assertEqual(delays(plan, 4), [0.05, 0.2, 0.05, 0.2])
+
+    def test_sequence_needs_randomize(self):
+        settings = dict(DEFAULT_SETTINGS, jitter_model="sequence", jitter_sequence="0.05")
+        self.assertFalse(RunPlan.from_settings(settings).randomized)
+
+    def test_invalid_sequences(self):
+        self.assertIsNone(parse_sequence(" "))
+        for value in ("0.05, fast", "0.05, 0", "-1"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    validate_settings({"jitter_sequence": value})
+        with self.assertRaises(ValueError):
+            RunPlan.from_settings(dict(DEFAULT_SETTINGS, randomize=True, jitter_model="sequence"))
+
+if __name__ == "__main__":
+    unittest.main()
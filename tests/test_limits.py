@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from clicker.engine import ClickEngine, RunPlan
+from clicker.jobs import JobScheduler
+from clicker.limits import RunLimits
+
+class RunLimitsTest(unittest.TestCase):
+    def test_count_only_clamps_bursts(self):
+        limits = RunLimits(RunPlan(max_actions=10), time.perf_counter())
+        self.assertEqual(limits.clamp(64, 0, time.perf_counter()), 10)
+        self.assertEqual(limits.clamp(64, 7, time.perf_counter()), 3)
+        self.assertEqual(limits.clamp(64, 10, time.perf_counter()), 0)
+
+    def test_duration_clamps_bursts_to_the_end(self):
+        start = time.perf_counter()
+        limits = RunLimits(RunPlan(interval=0.003, max_duration=0.01), start)
+        self.assertEqual(limits.clamp(64, 0, start), 4)
+        self.assertEqual(limits.clamp(64, 0, start + 0.01), 0)
+
+    def test_jittered_bursts_stay_before_the_end(self):
+        # Every delay is three intervals, so a burst sized by the interval would overrun
+        plan = RunPlan(interval=0.001, jitter_model="sequence", jitter_sequence=(0.003,),
+                       max_interval=0.003, max_duration=0.01)
+        intervals = plan.make_intervals(background=False)
+        start = time.perf_counter()
+        limits = RunLimits(plan, start, intervals)
+        count = limits.clamp(64, 0, start)
+        last = start + sum(intervals.next() for _ in range(count - 1))
+        self.assertEqual(count, 4)
+        self.assertLess(last, limits.end)
+
+    def test_engine_stops_jittered_run_at_the_end_time(self):
+        plan = RunPlan(interval=0.001, jitter_model="sequence", jitter_sequence=(0.003,),
+                       max_interval=0.003, max_duration=0.03, missed_ticks="catchup")
+        engine = ClickEngine("recording")
+        stats = engine.run(plan)
+        self.assertIsNone(engine.error)
+        self.assertEqual(stats["actions"], 10)
+
+    def test_engine_stops_at_exact_count_at_full_speed(self):
+        # 10,000 CPS makes the burst controller fire several actions per wake-up
+        engine = ClickEngine("recording")
+        stats = engine.run(RunPlan(interval=1 / RunPlan.MAX_CPS, max_actions=5000))
+        self.assertIsNone(engine.error)
+        self.assertEqual(stats["actions"], 5000)
+        self.assertEqual(engine.backend.total, 5000)
+
+    def test_job_stops_at_exact_count_at_full_speed(self):
+        scheduler = JobScheduler(backend="null")
+        try:
+            scheduler.add("fast", RunPlan(interval=1 / RunPlan.MAX_CPS, max_actions=5000), start=True)
+            deadline = time.monotonic() + 10
+            while scheduler.running() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            stats = scheduler.stats()["fast"]
+        finally:
+            scheduler.close()
+        self.assertIsNone(stats["error"])
+        self.assertEqual(stats["actions"], 5000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import time
+import unittest
+
+from clicker.engine import ClickEngine, RunPlan
+from clicker.scheduler import DeadlineScheduler
+
+class AchievedRateTest(unittest.TestCase):
+    def test_counts_each_tick_once(self):
+        scheduler = DeadlineScheduler(0.01)
+        scheduler.start(time.perf_counter())
+        self.assertEqual(scheduler.achieved_rate(), 0.0)
+        for _ in range(100):
+            scheduler.advance()
+        scheduler.advance_burst(8, lambda: 0.01)
+        self.assertAlmostEqual(scheduler.achieved_rate(), 100.0)
+
+    def test_skipped_ticks_lower_the_rate(self):
+        scheduler = DeadlineScheduler(0.01)
+        start = time.perf_counter()
+        scheduler.start(start)
+        for _ in range(50):
+            scheduler.advance()
+        scheduler.catch_up(scheduler.deadline + 0.5)  # 50 ticks late
+        self.assertEqual(scheduler.missed, 50)
+        self.assertAlmostEqual(scheduler.achieved_rate(), 50.0)
+
+    def test_engine_run_reports_the_target_rate(self):
+        engine = ClickEngine("recording")
+        stats = engine.run(RunPlan(interval=1 / 500, max_actions=100, missed_ticks="catchup"))
+        self.assertEqual(stats["actions"], 100)
+        self.assertAlmostEqual(stats["achieved_rate"], 500.0, delta=1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,15 @@
+import unittest
+
+from clicker.startup import HEAVY_MODULES, measure_import
+
+class StartupImportTest(unittest.TestCase):
+    def test_cli_and_gui_import_no_heavy_modules(self):
+        # measure_import() imports clicker.cli and clicker.gui in a fresh
+        # interpreter started with child_env()
+        report = measure_import()
+        self.assertEqual(report["heavy_modules"], [])
+        for name in ("numpy", "Xlib", "evdev", "sqlite3", "pynput"):
+            self.assertIn(name, HEAVY_MODULES)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import unittest
+
+from clicker.backends import RecordingBackend
+from clicker.engine import RunPlan
+from clicker.watch import ChangeTrigger, ColorTrigger, ScreenWatcher, SyntheticSource
+
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+
+class ScriptedSource(SyntheticSource):
+    """SyntheticSource that paints the next scripted fill before each grab
+
+    Stops the watcher once the script runs out, so every run polls exactly
+    len(script) frames.
+    """
+    def __init__(self, script, stop_event):
+        super().__init__(10, 10)
+        self.script = list(script)
+        self.stop_event = stop_event
+
+    def grab(self):
+        fill = self.script.pop(0)
+        if fill is not None:
+            self.fill(*fill)
+        if not self.script:
+            self.stop_event.set()
+        return super().grab()
+
+def watch(script, trigger, **options):
+    """(triggers, recorded actions, polls) of a watcher run over a script"""
+    stop_event = threading.Event()
+    backend = RecordingBackend()
+    watcher = ScreenWatcher(ScriptedSource(script, stop_event), trigger, RunPlan(),
+                            backend=backend, poll_hz=1000, **options)
+    triggers = watcher.watch(stop_event)
+    return triggers, backend.total, watcher.polls
+
+class ColorTriggerTest(unittest.TestCase):
+    def test_tolerance(self):
+        source = SyntheticSource(4, 4, (250, 5, 0))
+        self.assertFalse(ColorTrigger(RED).check(source.grab()))
+        self.assertFalse(ColorTrigger(RED, tolerance=4).check(source.grab()))
+        self.assertTrue(ColorTrigger(RED, tolerance=5).check(source.grab()))
+
+    def test_min_fraction(self):
+        source = SyntheticSource(10, 10)
+        source.fill(RED, (0, 0, 10, 3))
+        self.assertTrue(ColorTrigger(RED, min_fraction=0.3).check(source.grab()))
+        self.assertFalse(ColorTrigger(RED, min_fraction=0.31).check(source.grab()))
+
+class ChangeTriggerTest(unittest.TestCase):
+    def test_min_fraction(self):
+        source = SyntheticSource(10, 10)
+        trigger = ChangeTrigger(min_fraction=0.2)
+        self.assertFalse(trigger.check(source.grab()))  # First frame is the reference
+        source.fill(RED, (0, 0, 10, 2))
+        self.assertFalse(trigger.check(source.grab()))  # 20% changed is not more than 20%
+        source.fill(RED, (0, 0, 10, 5))
+        self.assertTrue(trigger.check(source.grab()))
+
+    def test_tolerance(self):
+        source = SyntheticSource(4, 4)
+        trigger = ChangeTrigger(tolerance=10)
+        trigger.check(source.grab())
+        source.fill((10, 10, 10))
+        self.assertFalse(trigger.check(source.grab()))
+        source.fill((21, 10, 10))
+        self.assertTrue(trigger.check(source.grab()))
+
+    def test_first_reference(self):
+        source = SyntheticSource(4, 4)
+        trigger = ChangeTrigger(reference="first")
+        trigger.check(source.grab())
+        source.fill(RED)
+        self.assertTrue(trigger.check(source.grab()))
+        self.assertTrue(trigger.check(source.grab()))  # Still differs from the first frame
+
+class ScreenWatcherTest(unittest.TestCase):
+    def test_fires_on_every_matching_poll_without_cooldown(self):
+        script = [None, (RED,), None, (BLACK,), None, (RED,)]
+        triggers, actions, polls = watch(script, ColorTrigger(RED), cooldown=0)
+        self.assertEqual((triggers, actions, polls), (3, 3, 6))
+
+    def test_change_trigger_fires_once_per_change(self):
+        script = [None, (RED,), None, None, (BLACK, (0, 0, 1, 1)), None]
+        triggers, actions, _ = watch(script, ChangeTrigger(), cooldown=0)
+        self.assertEqual((triggers, actions), (2, 2))
+
+    def test_cooldown_ignores_further_matches(self):
+        triggers, actions, polls = watch([(RED,)] + [None] * 9, ColorTrigger(RED), cooldown=60)
+        self.assertEqual((triggers, actions, polls), (1, 1, 10))
+
+    def test_once_stops_after_the_first_action(self):
+        script = [None, None, (RED,), None, None]
+        triggers, actions, polls = watch(script, ColorTrigger(RED), cooldown=0, once=True)
+        self.assertEqual((triggers, actions, polls), (1, 1, 3))
+
+    def test_no_match_records_nothing(self):
+        triggers, actions, polls = watch([None] * 5, ColorTrigger(RED), cooldown=0)
+        self.assertEqual((triggers, actions, polls), (0, 0, 5))
+
+if __name__ == "__main__":
+    unittest.main()